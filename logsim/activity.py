@@ -0,0 +1,98 @@
+"""Accumulate switching activity statistics for every output.
+
+Used in the Logic Simulator project to estimate switching activity and power
+without storing signal traces: toggle counts, rising and falling edge counts
+and the number of cycles spent high are accumulated as the simulation runs.
+
+Classes
+-------
+Activity - accumulates switching activity statistics.
+"""
+
+
+class Activity:
+    """Accumulate switching activity statistics for every output.
+
+    At each cycle, the level of every output is compared with its level at
+    the previous cycle. RISING and HIGH signals count as high, FALLING and LOW
+    signals count as low, and BLANK signals are ignored, as are outputs which
+    have been removed since the statistics were started.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    update(self): Accumulates the statistics for the current cycle.
+
+    reset(self): Clears the statistics of every output.
+
+    get_statistics(self, device_id, output_id): Returns the statistics of the
+                                                specified output.
+    """
+
+    def __init__(self, devices, network):
+        """Initialise the statistics of every output in the network."""
+        self.devices = devices
+        self.network = network
+
+        # Map signal levels to 1 (high), 0 (low) or None (no level)
+        self.levels = {devices.LOW: 0, devices.FALLING: 0,
+                       devices.HIGH: 1, devices.RISING: 1,
+                       devices.BLANK: None}
+
+        self.nets = []  # [(device_id, output_id)...]
+        for device in devices.devices_list:
+            for output_id in device.outputs:
+                self.nets.append((device.device_id, output_id))
+        self.net_index = {net: i for i, net in enumerate(self.nets)}
+        self.reset()
+
+    def reset(self):
+        """Clear the statistics of every output."""
+        net_number = len(self.nets)
+        self.cycles = 0
+        self.previous_levels = [None] * net_number
+        self.high_cycles = [0] * net_number
+        self.rising_edges = [0] * net_number
+        self.falling_edges = [0] * net_number
+
+    def update(self):
+        """Accumulate the statistics for the current cycle."""
+        levels = self.levels
+        previous_levels = self.previous_levels
+        get_output_signal = self.network.get_output_signal
+        self.cycles += 1
+        for i, (device_id, output_id) in enumerate(self.nets):
+            # Removed outputs give None, which has no level like BLANK
+            level = levels.get(get_output_signal(device_id, output_id))
+            previous_level = previous_levels[i]
+            if level == 1:
+                self.high_cycles[i] += 1
+                if previous_level == 0:
+                    self.rising_edges[i] += 1
+            elif level == 0 and previous_level == 1:
+                self.falling_edges[i] += 1
+            if level is not None:
+                previous_levels[i] = level
+
+    def get_statistics(self, device_id, output_id):
+        """Return the statistics of the specified output.
+
+        The statistics are returned as a dictionary with the keys "toggles",
+        "rising", "falling" and "high_fraction". Return None if the output is
+        not in the network.
+        """
+        if (device_id, output_id) not in self.net_index:
+            return None
+        i = self.net_index[(device_id, output_id)]
+        if self.cycles:
+            high_fraction = self.high_cycles[i] / self.cycles
+        else:
+            high_fraction = 0
+        return {"toggles": self.rising_edges[i] + self.falling_edges[i],
+                "rising": self.rising_edges[i],
+                "falling": self.falling_edges[i],
+                "high_fraction": high_fraction}
@@ -0,0 +1,8 @@
+"""Configure pytest for the Logic Simulator tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def netlist_cache_directory(tmp_path, monkeypatch):
+    """Keep the parsed network cache of each test in a temporary directory."""
+    monkeypatch.setenv("LOGSIM_CACHE_DIR", str(tmp_path / "logsim_cache"))
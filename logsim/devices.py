@@ -62,6 +62,9 @@ class Devices:
     add_device(self, device_id, device_kind): Adds the specified device to the
                                               network.
 
+    remove_device(self, device_id): Removes the specified device from the
+                                    network.
+
     add_input(self, device_id, input_id): Adds the specified input to the
                                           specified device.
 
@@ -88,6 +91,9 @@ class Devices:
 
     make_d_type(self, device_id): Makes a D-type device.
 
+    cold_start_device(self, device): Simulates cold start-up of a single
+                                     D-type or clock.
+
     cold_startup(self): Simulates cold start-up of D-types and clocks.
 
     make_device(self, device_id, device_kind, device_property=None): Creates
@@ -99,6 +105,19 @@ class Devices:
         self.names = names
 
         self.devices_list = []
+        self.devices_dictionary = {}  # {device_id: Device} for fast lookups
+
+        # Signal name index, updated as ports are added:
+        # output_names stores {(device_id, output_id): signal_name}
+        # input_names stores {(device_id, input_id): signal_name}
+        # signal_ids stores {signal_name: [device_id, port_id]}
+        self.output_names = {}
+        self.input_names = {}
+        self.signal_ids = {}
+
+        # Incremented whenever a device or port is added or removed, so that
+        # classes can tell when information derived from the devices is stale
+        self.version = 0
 
         gate_strings = ["AND", "OR", "NAND", "NOR", "XOR", "NOT"]
         device_strings = ["CLOCK", "SWITCH", "DTYPE"]
@@ -124,10 +143,7 @@ class Devices:
 
     def get_device(self, device_id):
         """Return the Device object corresponding to device_id."""
-        for device in self.devices_list:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self.devices_dictionary.get(device_id)
 
     def find_devices(self, device_kind=None):
         """Return a list of device IDs of the specified device_kind.
@@ -148,6 +164,27 @@ class Devices:
         new_device = Device(device_id)
         new_device.device_kind = device_kind
         self.devices_list.append(new_device)
+        self.devices_dictionary[device_id] = new_device
+        self.version += 1
+
+    def remove_device(self, device_id):
+        """Remove the specified device from the network.
+
+        Connections from the device to the inputs of other devices are not
+        removed. Return True if successful.
+        """
+        device = self.devices_dictionary.pop(device_id, None)
+        if device is None:
+            return False
+        self.devices_list.remove(device)
+        for port_id in device.inputs:
+            signal_name = self.input_names.pop((device_id, port_id))
+            del self.signal_ids[signal_name]
+        for port_id in device.outputs:
+            signal_name = self.output_names.pop((device_id, port_id))
+            del self.signal_ids[signal_name]
+        self.version += 1
+        return True
 
     def add_input(self, device_id, input_id):
         """Add the specified input to the specified device.
@@ -156,6 +193,8 @@ class Devices:
         """
         device = self.get_device(device_id)
         if device is not None:
+            if input_id not in device.inputs:
+                self._index_signal(device_id, input_id, self.input_names)
             device.inputs.setdefault(input_id)
             return True
         else:
@@ -168,11 +207,25 @@ class Devices:
         """
         device = self.get_device(device_id)
         if device is not None:
+            if output_id not in device.outputs:
+                self._index_signal(device_id, output_id, self.output_names)
             device.outputs[output_id] = signal
             return True
         else:
             return False
 
+    def _index_signal(self, device_id, port_id, port_names):
+        """Add a new port to the signal name index."""
+        device_name = self.names.get_name_string(device_id)
+        if port_id is None:
+            signal_name = device_name
+        else:
+            signal_name = ".".join([device_name,
+                                    self.names.get_name_string(port_id)])
+        port_names[(device_id, port_id)] = signal_name
+        self.signal_ids[signal_name] = [device_id, port_id]
+        self.version += 1
+
     def get_signal_name(self, device_id, port_id):
         """Return the name string of the specified signal.
 
@@ -196,14 +249,15 @@ class Devices:
 
     def get_signal_ids(self, signal_name):
         """Return the device and output IDs of the specified signal."""
-        name_string_list = signal_name.split(".")
-        name_id_list = self.names.lookup(name_string_list)
-        device_id = name_id_list[0]
-        if len(name_id_list) == 2:
-            output_id = name_id_list[1]
-        else:
-            output_id = None
-
+        if signal_name in self.signal_ids:
+            return list(self.signal_ids[signal_name])
+        # Names of devices in circuit instances contain dots themselves, so
+        # only the part after the last dot can be a port
+        device_name, dot, port_name = signal_name.rpartition(".")
+        if not dot:
+            [device_id] = self.names.lookup([signal_name])
+            return [device_id, None]
+        [device_id, output_id] = self.names.lookup([device_name, port_name])
         return [device_id, output_id]
 
     def set_switch(self, device_id, signal):
@@ -245,7 +299,8 @@ class Devices:
         self.add_device(device_id, self.CLOCK)
         device = self.get_device(device_id)
         device.clock_half_period = clock_half_period
-        self.cold_startup()  # clock initialised to a random point in its cycle
+        # Clock initialised to a random point in its cycle
+        self.cold_start_device(device)
 
     def make_gate(self, device_id, device_kind, no_of_inputs):
         """Make logic gates with the specified number of inputs."""
@@ -264,7 +319,8 @@ class Devices:
             self.add_input(device_id, input_id)
         for output_id in self.dtype_output_ids:
             self.add_output(device_id, output_id)
-        self.cold_startup()  # D-type initialised to a random state
+        # D-type initialised to a random state
+        self.cold_start_device(self.get_device(device_id))
 
     def cold_startup(self):
         """Simulate cold start-up of D-types and clocks.
@@ -273,16 +329,24 @@ class Devices:
         begin from a random point in their cycles.
         """
         for device in self.devices_list:
-            if device.device_kind == self.D_TYPE:
-                device.dtype_memory = random.choice([self.LOW, self.HIGH])
-
-            elif device.device_kind == self.CLOCK:
-                clock_signal = random.choice([self.LOW, self.HIGH])
-                self.add_output(device.device_id, output_id=None,
-                                signal=clock_signal)
-                # Initialise it to a random point in its cycle.
-                device.clock_counter = \
-                    random.randrange(device.clock_half_period)
+            self.cold_start_device(device)
+
+    def cold_start_device(self, device):
+        """Simulate cold start-up of a single D-type or clock.
+
+        Other devices are left unchanged, so devices can be made one at a
+        time without restarting every device made before them.
+        """
+        if device.device_kind == self.D_TYPE:
+            device.dtype_memory = random.choice([self.LOW, self.HIGH])
+
+        elif device.device_kind == self.CLOCK:
+            clock_signal = random.choice([self.LOW, self.HIGH])
+            self.add_output(device.device_id, output_id=None,
+                            signal=clock_signal)
+            # Initialise it to a random point in its cycle.
+            device.clock_counter = \
+                random.randrange(device.clock_half_period)
 
     def make_device(self, device_id, device_kind, device_property=None):
         """Create the specified device.
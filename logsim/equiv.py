@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Check whether two definition files describe equivalent circuits.
+
+Used in the Logic Simulator project to check a circuit after it has been
+changed by hand, for example to use fewer gates, without simulating both
+versions. Switches and monitored signals are matched by name, and the
+monitored signals found in both files are compared for every switch setting
+at once: the two circuits are joined into a miter, which is HIGH when any
+pair of signals differs, and the SAT solver either proves that the miter is
+always LOW or finds switch settings where it is HIGH.
+
+Usage
+-----
+Compare two definition files: equiv.py <file path> <file path>
+
+The exit status is 0 if the files are equivalent, 1 if they are not, and 2
+if they cannot be compared.
+
+Functions
+---------
+check_equivalence - compares the monitored signals of two definition files.
+main - prints the result of comparing the files given on the command line.
+"""
+import contextlib
+import io
+import sys
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from graph import Graph
+from sat import SatSolver
+
+
+def _load_graph(path, shared=None):
+    """Return a graph of the definition file at path and a list of errors.
+
+    The graph is None if the file cannot be read or has errors.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    try:
+        scanner = Scanner(path, names)
+    except (OSError, UnicodeDecodeError) as error:
+        return None, [path + ": " + str(error)]
+
+    parser = Parser(names, devices, network, monitors, scanner)
+    with contextlib.redirect_stdout(io.StringIO()):  # errors are returned
+        no_errors = parser.parse_network()
+    if not no_errors:
+        errors = []
+        for (line, column, code, message) in parser.diagnostics:
+            if line is None:
+                errors.append(path + ": " + message)
+            else:
+                errors.append(path + ": line " + str(line) + ": " + message)
+        return None, errors
+    return Graph(names, devices, network, monitors, shared), []
+
+
+def _evaluate(graph, switches, last_node):
+    """Return the value of each expression node up to last_node.
+
+    switches is a dictionary {switch_name: 0 or 1}, and switches which are
+    not in it are LOW. Nodes are only made after their operands, so they
+    are evaluated in order.
+    """
+    values = []
+    for node in range(last_node + 1):
+        operator, operands = graph.nodes[node]
+        if operator == "VAR":
+            values.append(switches.get(operands, 0) == 1)
+        elif operator == "NOT":
+            values.append(not values[operands[0]])
+        elif operator == "AND":
+            values.append(all(values[operand] for operand in operands))
+        elif operator == "OR":
+            values.append(any(values[operand] for operand in operands))
+        else:  # XOR
+            values.append(sum(values[operand] for operand in operands) % 2
+                          == 1)
+    return values
+
+
+def check_equivalence(first_path, second_path):
+    """Compare the signals monitored in both definition files.
+
+    Return a dictionary with the keys "signals" (names of the signals
+    compared), "unmatched" (names of signals monitored in one file only),
+    "equivalent" (True or False, or None if the files cannot be compared),
+    "switches" ({switch_name: 0 or 1} for every switch in either file, where
+    a signal differs, or None), "differences" ({signal_name: (level in the
+    first file, level in the second file)}) and "errors" (list of error
+    messages).
+    """
+    result = {"signals": [], "unmatched": [], "equivalent": None,
+              "switches": None, "differences": {}, "errors": []}
+    first_graph, errors = _load_graph(first_path)
+    result["errors"].extend(errors)
+    second_graph, errors = _load_graph(second_path, first_graph)
+    result["errors"].extend(errors)
+    if result["errors"]:
+        return result
+
+    first_signals = first_graph.monitors.get_signal_names()[0]
+    second_signals = second_graph.monitors.get_signal_names()[0]
+    result["signals"] = [signal_name for signal_name in first_signals
+                         if signal_name in second_signals]
+    result["unmatched"] = (
+        [signal_name for signal_name in first_signals
+         if signal_name not in second_signals] +
+        [signal_name for signal_name in second_signals
+         if signal_name not in first_signals])
+    if not result["signals"]:
+        result["errors"].append("No signal is monitored in both files")
+        return result
+
+    # Both graphs share one DAG, so equal logic has equal nodes
+    node_pairs = []
+    for signal_name in result["signals"]:
+        pair = []
+        for path, graph in [(first_path, first_graph),
+                            (second_path, second_graph)]:
+            node = graph.build_expression(signal_name)
+            if node is None:
+                result["errors"].append(
+                    path + ": " + signal_name + " depends on a clock, "
+                    "flip-flop or loop")
+            pair.append(node)
+        node_pairs.append(pair)
+    if result["errors"]:
+        return result
+
+    miter_inputs = [first_graph.get_node("XOR", (first_node, second_node))
+                    for first_node, second_node in node_pairs
+                    if first_node != second_node]
+    if not miter_inputs:
+        result["equivalent"] = True
+        return result
+    miter = first_graph.get_node("OR", tuple(miter_inputs))
+    clauses, variable_names = first_graph.get_cnf(miter)
+    assignment = SatSolver(clauses, len(variable_names)).solve()
+    if assignment is None:
+        result["equivalent"] = True
+        return result
+
+    result["equivalent"] = False
+    switches = {}
+    for graph in [first_graph, second_graph]:
+        for device_id in graph.devices.find_devices(graph.devices.SWITCH):
+            switches[graph.names.get_name_string(device_id)] = 0
+    for variable, name in enumerate(variable_names, 1):
+        if not name.startswith("_"):  # switches, not subexpressions
+            switches[name] = int(assignment[variable])
+    result["switches"] = switches
+
+    # A miter input may be an XOR node of either file, made before the
+    # nodes of the signals, so every node is evaluated
+    values = _evaluate(first_graph, switches, len(first_graph.nodes) - 1)
+    for signal_name, (first_node, second_node) in zip(result["signals"],
+                                                      node_pairs):
+        if values[first_node] != values[second_node]:
+            result["differences"][signal_name] = (int(values[first_node]),
+                                                  int(values[second_node]))
+    return result
+
+
+def main(arg_list):
+    """Print the result of comparing the two files in arg_list.
+
+    Exit with status 1 if the files are not equivalent, and 2 if they cannot
+    be compared.
+    """
+    if len(arg_list) != 2:
+        print("Usage: equiv.py <file path> <file path>")
+        sys.exit(2)
+    [first_path, second_path] = arg_list
+    result = check_equivalence(first_path, second_path)
+    for error in result["errors"]:
+        print("Error:", error)
+    if result["equivalent"] is None:
+        sys.exit(2)
+    if result["unmatched"]:
+        print("Not compared (monitored in one file only):",
+              ", ".join(result["unmatched"]))
+    if result["equivalent"]:
+        print("Equivalent:", ", ".join(result["signals"]),
+              "match for every switch setting")
+        return
+
+    print("Not equivalent. Counterexample switch settings:")
+    print(" ".join([name + "=" + str(setting)
+                    for name, setting in result["switches"].items()]))
+    for signal_name, (first_level, second_level) in \
+            result["differences"].items():
+        print(signal_name + ": " + str(first_level), "in", first_path + ",",
+              second_level, "in", second_path)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
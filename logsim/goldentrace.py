@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Compare the monitored signals of a run against a stored reference run.
+
+Used in the Logic Simulator project for regression testing. A reference
+("golden") run of a definition file is stored, and later runs are compared
+against it to find the first cycle at which they diverge, how many cycles of
+each signal differ, and the windows of cycles in which they differ.
+
+Usage
+-----
+Record a reference run: goldentrace.py -r <reference file> -n <cycles>
+                        <definition file>
+Compare against a reference run: goldentrace.py -g <reference file>
+                                 <definition file>
+
+The comparison exits with status 1 if the runs differ.
+
+Classes
+-------
+GoldenTrace - stores a reference run and compares other runs against it.
+TraceDiff - stores the differences between two traces of one signal.
+"""
+import getopt
+import json
+import random
+import re
+import sys
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+class TraceDiff:
+    """Store the differences between two traces of one signal.
+
+    Parameters
+    ----------
+    signal_name: name of the signal.
+    first_mismatch: first cycle at which the traces differ, or None.
+    mismatch_count: number of cycles at which the traces differ.
+    windows: list of (start, stop) cycle ranges in which the traces differ.
+
+    Public methods
+    --------------
+    No public methods.
+    """
+
+    def __init__(self, signal_name, first_mismatch, mismatch_count, windows):
+        """Initialise the differences."""
+        self.signal_name = signal_name
+        self.first_mismatch = first_mismatch
+        self.mismatch_count = mismatch_count
+        self.windows = windows
+
+
+class GoldenTrace:
+    """Store a reference run and compare other runs against it.
+
+    Traces are packed into bytes objects with one byte per cycle, and
+    compared a whole trace at a time: identical traces are found with a
+    single bytes comparison, and the cycles at which two traces differ are
+    found by XORing them as integers, so no Python loop runs per cycle.
+
+    Parameters
+    ----------
+    signals: dictionary of {signal_name: packed_trace}.
+    cycles: number of cycles in the run.
+    seed: random seed used for the cold start-up of the run.
+
+    Public methods
+    --------------
+    from_monitors(cls, monitors, cycles, seed): Returns a GoldenTrace holding
+                                     the signals recorded by the monitors.
+
+    load(cls, path): Returns the GoldenTrace stored in the file at path.
+
+    save(self, path): Stores the reference run in the file at path.
+
+    pack(self, signal_list): Returns a signal trace packed into bytes.
+
+    compare_traces(self, signal_name, golden, current): Returns a TraceDiff
+                                     for two packed traces of one signal.
+
+    compare(self, other): Returns a TraceDiff for every signal in either
+                          run which differs between the two runs.
+
+    first_divergence(self, diffs): Returns the first cycle at which any
+                                   signal differs.
+
+    print_report(self, diffs): Prints the differences between two runs.
+    """
+
+    # Packed traces are stored in the reference file as strings of digits
+    _TO_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+    _FROM_DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+    def __init__(self, signals=None, cycles=0, seed=None):
+        """Initialise the reference run."""
+        if signals is None:
+            signals = {}
+        self.signals = signals
+        self.cycles = cycles
+        self.seed = seed
+
+    @classmethod
+    def from_monitors(cls, monitors, cycles, seed=None):
+        """Return a GoldenTrace holding the signals recorded by monitors."""
+        golden = cls(cycles=cycles, seed=seed)
+        for (device_id, output_id), signal_list in \
+                monitors.monitors_dictionary.items():
+            signal_name = monitors.devices.get_signal_name(device_id,
+                                                           output_id)
+            golden.signals[signal_name] = golden.pack(signal_list)
+        return golden
+
+    @classmethod
+    def load(cls, path):
+        """Return the GoldenTrace stored in the file at path."""
+        with open(path, "r") as golden_file:
+            stored = json.load(golden_file)
+        signals = {}
+        for signal_name, trace_string in stored["signals"].items():
+            signals[signal_name] = trace_string.encode("ascii").translate(
+                cls._FROM_DIGITS)
+        return cls(signals, stored["cycles"], stored["seed"])
+
+    def save(self, path):
+        """Store the reference run in the file at path."""
+        signals = {}
+        for signal_name, packed in self.signals.items():
+            signals[signal_name] = packed.translate(
+                self._TO_DIGITS).decode("ascii")
+        with open(path, "w") as golden_file:
+            json.dump({"cycles": self.cycles, "seed": self.seed,
+                       "signals": signals}, golden_file, indent=1)
+
+    def pack(self, signal_list):
+        """Return a signal trace packed into bytes, one byte per cycle."""
+        return bytes(signal_list)
+
+    def compare_traces(self, signal_name, golden, current):
+        """Return a TraceDiff for two packed traces of one signal.
+
+        Cycles present in only one of the traces count as mismatches.
+        """
+        length = min(len(golden), len(current))
+        extra = max(len(golden), len(current)) - length
+        if golden[:length] == current[:length]:
+            if not extra:
+                return TraceDiff(signal_name, None, 0, [])
+            return TraceDiff(signal_name, length, extra,
+                             [(length, length + extra)])
+
+        # Bytes are zero where the traces agree
+        xor = (int.from_bytes(golden[:length], "little") ^
+               int.from_bytes(current[:length], "little")
+               ).to_bytes(length, "little")
+        mismatch_count = length - xor.count(0) + extra
+        windows = [match.span() for match in
+                   re.finditer(b"[^\x00]+", xor)]
+        if extra:
+            if windows and windows[-1][1] == length:
+                windows[-1] = (windows[-1][0], length + extra)
+            else:
+                windows.append((length, length + extra))
+        return TraceDiff(signal_name, windows[0][0], mismatch_count, windows)
+
+    def compare(self, other):
+        """Return a TraceDiff for every signal which differs between runs.
+
+        A signal recorded in only one of the runs differs at every cycle.
+        """
+        diffs = []
+        for signal_name, golden in self.signals.items():
+            current = other.signals.get(signal_name, b"")
+            diff = self.compare_traces(signal_name, golden, current)
+            if diff.mismatch_count:
+                diffs.append(diff)
+        for signal_name, current in other.signals.items():
+            if signal_name not in self.signals:
+                diff = self.compare_traces(signal_name, b"", current)
+                if diff.mismatch_count:
+                    diffs.append(diff)
+        return diffs
+
+    def first_divergence(self, diffs):
+        """Return the first cycle at which any signal differs, or None."""
+        if not diffs:
+            return None
+        return min([diff.first_mismatch for diff in diffs])
+
+    def print_report(self, diffs):
+        """Print the differences between two runs."""
+        if not diffs:
+            print("Traces match reference.")
+            return
+        print("Traces differ from reference, first at cycle",
+              self.first_divergence(diffs))
+        for diff in diffs:
+            windows = ", ".join([str(start) + "-" + str(stop - 1)
+                                 for (start, stop) in diff.windows])
+            print(diff.signal_name + ": " + str(diff.mismatch_count) +
+                  " mismatched cycles (cycles " + windows + ")")
+
+
+def run_definition_file(path, cycles, seed):
+    """Parse the definition file and run it for the given number of cycles.
+
+    Return the monitors.Monitors() instance holding the recorded signals, or
+    None if the file is missing or has errors, or the network oscillates.
+    """
+    random.seed(seed)  # make the cold start-up of the run repeatable
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    try:
+        scanner = Scanner(path, names)
+    except FileNotFoundError:
+        print("Error: definition file not found:", path)
+        return None
+    parser = Parser(names, devices, network, monitors, scanner)
+    if not parser.parse_network():
+        return None
+    for _ in range(cycles):
+        if not network.execute_network():
+            print("Error! Network oscillating.")
+            return None
+        monitors.record_signals()
+    return monitors
+
+
+def main(arg_list):
+    """Record or compare a reference run as specified in arg_list.
+
+    Exit with status 1 if the run differs from the reference, and 2 if the
+    arguments or the definition file are invalid.
+    """
+    usage_message = ("Usage:\n"
+                     "Record a reference run: goldentrace.py -r <reference "
+                     "file> -n <cycles> <definition file>\n"
+                     "Compare against a reference run: goldentrace.py "
+                     "-g <reference file> <definition file>")
+    try:
+        options, arguments = getopt.getopt(arg_list, "hr:n:g:")
+        options = dict(options)
+        if "-n" in options:
+            options["-n"] = int(options["-n"])
+    except (getopt.GetoptError, ValueError):
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+
+    if "-h" in options:
+        print(usage_message)
+        sys.exit()
+    if len(arguments) != 1 or ("-r" in options) == ("-g" in options):
+        print(usage_message)
+        sys.exit(2)
+    [path] = arguments
+
+    if "-r" in options:
+        cycles = options.get("-n", 10)
+        seed = 0
+        monitors = run_definition_file(path, cycles, seed)
+        if monitors is None:
+            sys.exit(2)
+        GoldenTrace.from_monitors(monitors, cycles, seed).save(options["-r"])
+        print("Reference run saved:", options["-r"])
+    else:
+        golden = GoldenTrace.load(options["-g"])
+        monitors = run_definition_file(path, golden.cycles, golden.seed)
+        if monitors is None:
+            sys.exit(2)
+        current = GoldenTrace.from_monitors(monitors, golden.cycles,
+                                            golden.seed)
+        diffs = golden.compare(current)
+        golden.print_report(diffs)
+        if diffs:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,4 +1,5 @@
 """Define Graph class to help with CNF capability."""
+from sat import SatSolver
 
 
 class Graph:
@@ -15,6 +16,9 @@ class Graph:
     devices: instance of the devices.Devices() class.
     network: instance of the network.Network() class.
     monitors: instance of the monitors.Monitors() class.
+    shared: instance of the graph.Graph() class whose expression DAG is
+            added to, so that the expressions of two networks can be
+            compared, or None for a DAG of this graph's own.
 
     Public Methods:
     ---------------
@@ -22,343 +26,351 @@ class Graph:
                             expression string from the network in-use
                             at the indicated monitor.
 
-    get_sub_exp_end(self, bool_exp, i, left=True): Gets the endpoint
-                            of the current subexpression, in the
-                            direction indicated and at the bracket-
-                            level of the start point.
-
-    expand_xors(self, bool_exp): Converts all the XOR gates in the given
-                            boolean expression string to ANDs, ORs and
-                            NOTs.
-
-    distribute_ors(self, bool_exp): Distributes all the ORs over the
-                            ANDs in the boolean expression string to
-                            give an expression in conjunctive normal
-                            form.
-
-    clean_up_to_cnf(self, bool_exp): Removes all the unnecessary brackets
-                            and returns the boolean expression string in
-                            conjunctive normal form.
-
-    get_clauses(self, bool_exp): Gets all the clauses from a given
-                            boolean expression string and returns them
-                            as a list of strings.
-
-    get_literals_adc(self, clause): Gets the literals within a given
-                            clause string 'and destroys contradictions'
-                            meaning setting literals containing both a
-                            literal and its negation to '1' and removing
-                            duplicate literals within a clause.
-
-    in_clause_clean_up(self, bool_exp): Ties together the above methods
-                            to remove unnecessary brackets and
-                            redundancies on the literal level within
-                            clauses and returns the expression in
-                            string form.
-
-    out_clause_clean_up(self, bool_exp): Ties together the above methods
-                            to remove unnecessary brackets and
-                            redundancies on the clause level and returns
-                            the expression in string form.
+    get_node(self, operator, operands): Returns the ID of a node of the
+                            expression DAG, adding the node if it is
+                            new.
+
+    build_expression(self, signal_name): Builds the expression DAG of
+                            the named signal and returns its node.
+
+    get_cnf(self, node): Returns the Tseitin encoding of the expression
+                            at a node as a list of clauses of integer
+                            literals and a list of variable names.
+
+    get_cnf_string(self, clauses, variable_names): Returns a list of
+                            clauses as a boolean expression string.
+
+    get_dimacs(self, clauses, variable_names): Returns a list of clauses
+                            in DIMACS CNF format.
+
+    find_switch_settings(self, signal_name, level): Returns switch
+                            settings which drive the named signal to
+                            the given level.
+
+    add_new_line_breaks(self, bool_exp, line_length_limit=50): Adds
+                            line-breaks to a long boolean expression
+                            string.
+
+    Private Methods:
+    ----------------
+    _update_tables(self): Discards the expression tables if a device or
+                            connection has changed.
     """
 
-    def __init__(self, names, devices, network, monitors):
+    def __init__(self, names, devices, network, monitors, shared=None):
         """Initialise the graph and graph dependencies."""
         self.names = names
         self.devices = devices
         self.network = network
         self.monitors = monitors
 
+        # Expression DAG: nodes stores [(operator, operands)...] by node ID,
+        # and node_ids stores {(operator, operands): node ID}
+        self.shared = shared
+        if shared is None:
+            self.nodes = []
+            self.node_ids = {}
+        else:
+            self.nodes = shared.nodes
+            self.node_ids = shared.node_ids
+        # Name of the first gate found computing each node, {node: name},
+        # and the operands of AND, OR and XOR nodes in the input order of
+        # that gate, {node: operands}, for printing expressions
+        self.node_names = {}
+        self.node_operands = {}
+        # The (devices.version, network.version) the tables were built at
+        self.tables_version = (devices.version, network.version)
+
     def create_boolean_from_monitor(self, monitor_name):
         """Generate boolean expression for monitor.
 
-        Will return False if any circularity included (including
-        flip-flops).
+        The expression is printed from the expression DAG built by
+        build_expression. A node used more than once is written out once,
+        as a named sub-expression after the expression, such as
+        '¬(¬N1+N1+B) where N1 = (A+¬A+B)', so the expression grows linearly
+        with the network. It is named after the gate it is the output of,
+        or "_1", "_2"... if it is part of a NAND or NOR gate. Will return
+        False if any circularity included (including flip-flops).
         """
-        mon_id = self.names.query(monitor_name)
-        mon_dev = self.devices.get_device(mon_id)
-
-        dev_list = self.devices.find_devices()
-
-        # Check no flip flops / other 2-output devices
-        for dev in dev_list:
-            dev = self.devices.get_device(dev)
-            if len(dev.outputs) != 1 or len(dev.inputs) > 2:
-                return False
-
-        def dfs(dev, dfs_calls):
-            """Recursively build boolean expression from monitor position."""
-            # Make sure it doesn't get caught in a loop (circular
-            # definition)
-            dfs_calls += 1
-            if dfs_calls > 20:
-                return '@'
-
-            # Otherwise recursively build boolean expression string from
-            # device inputs
-            dev_ins = dev.inputs
-
-            # Check if device is a switch
-            if len(dev_ins) == 0:
-                return self.names.get_name_string(dev.device_id)
-
-            # Check if device is a not gate
-            if len(dev_ins) == 1:
-                [out_dev_id] = dev_ins
-                next_dev = self.devices.get_device(dev_ins[out_dev_id][0])
-                return '¬' + dfs(next_dev, dfs_calls)
-
-            # Assume gate is one of AND, OR, NAND, NOR, XOR.
-            # Get input device IDs
-            i, j = dev_ins
-
-            # Get device objects
-            i_dev = self.devices.get_device(dev_ins[i][0])
-            j_dev = self.devices.get_device(dev_ins[j][0])
-
-            # Produce string boolean expression calling dfs to build
-            # the expression below.
-            middle_char = ['.', '+', '.', '+', '*'][dev.device_kind]
-            if dev.device_kind in (2, 3):
-                return '¬(' + dfs(i_dev, dfs_calls) + middle_char + \
-                       dfs(j_dev, dfs_calls) + ')'
-            else:
-                return '(' + dfs(i_dev, dfs_calls) + middle_char + \
-                       dfs(j_dev, dfs_calls) + ')'
-
-        bool_exp = dfs(mon_dev, 0)
-        if '@' in bool_exp:
+        root = self.build_expression(monitor_name)
+        if root is None:
             return False
-        return bool_exp
 
-    def get_sub_exp_end(self, bool_exp, i, left=True):
-        """Get the end of the sub-expression."""
-        if left:
-            if bool_exp[i - 1] == ')':
-                j = 2
-                bracket_count = 1
-                while bracket_count:
-                    if bool_exp[i - j] == ')':
-                        bracket_count += 1
-                    elif bool_exp[i - j] == '(':
-                        bracket_count -= 1
-                    j += 1
-            else:
-                j = 1
-                while bool_exp[i - j] not in ('(', '.', '+', '*'):
-                    j += 1
-            return j - 1
-        else:
-            k = 1
-            while bool_exp[i + k] == '¬':
-                k += 1
-            if bool_exp[i + k] == '(':
-                k += 1
-                bracket_count = 1
-                while bracket_count:
-                    if bool_exp[i + k] == '(':
-                        bracket_count += 1
-                    elif bool_exp[i + k] == ')':
-                        bracket_count -= 1
-                    k += 1
+        # Put the nodes in an order where each comes after its operands,
+        # counting how many nodes use each node
+        uses = {}
+        order = []
+        visited = set()
+        stack = [(root, False)]
+        while stack:
+            node, operands_visited = stack.pop()
+            if operands_visited:
+                order.append(node)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append((node, True))
+            operator, operands = self.nodes[node]
+            if operator != 'VAR':
+                operands = self.node_operands.get(node, operands)
+                for operand in reversed(operands):
+                    uses[operand] = uses.get(operand, 0) + 1
+                    stack.append((operand, False))
+
+        middle_chars = {'AND': '.', 'OR': '+', 'XOR': '*'}
+        bool_exps = {}  # {node: expression or name used for it}
+        definitions = []
+        subexpression_number = 0
+        for node in order:
+            operator, operands = self.nodes[node]
+            if operator == 'VAR':
+                bool_exps[node] = operands
+                continue
+            if operator == 'NOT':
+                bool_exp = '¬' + bool_exps[operands[0]]
             else:
-                k = 1
-                while bool_exp[i + k] not in (')', '.', '+', '*'):
-                    k += 1
-            return k - 1
-
-    def expand_xors(self, bool_exp):
-        """Expand XORs in a given expression into ANDs/ORs."""
-        while '*' in bool_exp:
-            i = bool_exp.index('*')
-            j = self.get_sub_exp_end(bool_exp, i, True)
-            k = self.get_sub_exp_end(bool_exp, i, False)
-            xor_exp = '(' + bool_exp[i - j:i] + '+' + \
-                      bool_exp[i + 1:i + k + 1] + ').'
-            xor_exp += '(¬' + bool_exp[i - j:i] + '+¬' + \
-                       bool_exp[i + 1:i + k + 1] + ')'
-            bool_exp = bool_exp[:i - j] + xor_exp + bool_exp[i + k + 1:]
+                operands = self.node_operands.get(node, operands)
+                bool_exp = '(' + middle_chars[operator].join(
+                    [bool_exps[operand] for operand in operands]) + ')'
+            if uses.get(node, 0) > 1:
+                name = self.node_names.get(node)
+                if name is None:
+                    subexpression_number += 1
+                    name = '_' + str(subexpression_number)
+                definitions.append(name + ' = ' + bool_exp)
+                bool_exp = name
+            bool_exps[node] = bool_exp
+
+        bool_exp = bool_exps[root]
+        if definitions:
+            bool_exp += ' where ' + ', '.join(definitions)
         return bool_exp
 
-    def demorgan_push(self, bool_exp):
-        """Push De Morgan laws to force negations down to literal level."""
-        while '¬(' in bool_exp:
-            i = bool_exp.index('¬(')
-            j = self.get_sub_exp_end(bool_exp, i + 1, False)
-            symb = bool_exp[i+2+j]
-            if symb == '+':
-                new_symb = '.'
-            else:
-                new_symb = '+'
-            bool_exp = bool_exp[:i]+'(¬'+bool_exp[i + 2:i + 2 + j] + \
-                new_symb + '¬' + bool_exp[i + 3 + j:]
-
-            for ii in range(len(bool_exp) - 2, -1, -1):
-                if bool_exp[ii] == '¬' and bool_exp[ii+1] == '¬':
-                    bool_exp = bool_exp[:ii] + bool_exp[ii+2:]
-        return bool_exp
+    def get_node(self, operator, operands):
+        """Return the ID of the expression node, adding it if it is new.
 
-    def distribute_ors(self, bool_exp):
-        """Distribute ORs over ANDs in pursuit of conjunctive normal form."""
-        bool_exp0 = 0
-        while bool_exp0 != bool_exp:
-            bool_exp0 = bool_exp
-            i = 0
-            for n_or in range(bool_exp.count(')+')):
-                i = bool_exp[i + 1:].index(')+') + i + 2
-                j = self.get_sub_exp_end(bool_exp, i - 1, True)
-                if bool_exp[i - j - 2] == '.':
-                    jj = self.get_sub_exp_end(bool_exp, i - j - 2, True)
-                    k = self.get_sub_exp_end(bool_exp, i, False)
-                    or_exp = '(' + bool_exp[i - j - 2 - jj:i - j - 2] + \
-                             bool_exp[i:i + k + 1] + ').'
-                    or_exp += '(' + bool_exp[i - j - 1:i - 1] + \
-                              bool_exp[i:i + k + 1] + ')'
-                    bool_exp = bool_exp[:i - j - 3 - jj] + or_exp + bool_exp[
-                                                                    i + k + 1:]
-                    break
-
-            i = 0
-            for n_or in range(bool_exp.count('+(')):
-                i = bool_exp[i + 1:].index('+(') + i + 1
-                j = self.get_sub_exp_end(bool_exp, i + 1, False)
-                if bool_exp[(i + 1) + j + 1] == '.':
-                    jj = self.get_sub_exp_end(bool_exp, i + 2 + j, False)
-                    k = self.get_sub_exp_end(bool_exp, i, True)
-                    or_exp = '(' + bool_exp[i - k:i + 1] + \
-                             bool_exp[i + 2:i + j + 2] + ').'
-                    or_exp += '(' + bool_exp[i - k:i + 1] + \
-                              bool_exp[i + j + 3:i + j + 3 + jj] + ')'
-                    bool_exp = bool_exp[:i - k] + or_exp + bool_exp[
-                                                           i + j + 4 + jj:]
-                    break
-        return bool_exp
-
-    def clean_up_to_cnf(self, bool_exp):
-        """Remove unnecessary brackets.
-
-        Note that it destroys two-expression bracket syntax.
+        operator is "VAR", "NOT", "AND", "OR" or "XOR", and operands is the
+        variable name for "VAR" or a tuple of node IDs. Equal expressions
+        share a node: operands of AND, OR and XOR are sorted, repeated
+        operands of AND and OR are dropped, and double negations cancel.
         """
-        n = len(bool_exp)
-        bool_exp2 = ''
-        count = 0
-        while bool_exp2 + bool_exp[-1] != bool_exp:
-            count += 1
-            if count != 1:
-                bool_exp = bool_exp2 + bool_exp[-1]
-            bool_exp2 = bool_exp[0]
-            n = len(bool_exp)
-            for i in range(1, n - 1):
-                if bool_exp[i:i + 2] == '((':
-                    bool_exp2 += ''
-                elif bool_exp[i - 1:i + 1] == '))':
-                    bool_exp2 += ''
-                elif bool_exp[i:i + 2] == ')+':
-                    bool_exp2 += ''
-                elif bool_exp[i - 1:i + 1] == '+(':
-                    bool_exp2 += ''
-                else:
-                    bool_exp2 += bool_exp[i]
-        return bool_exp2 + bool_exp[-1]
-
-    def get_clauses(self, bool_exp):
-        """Get clauses from boolean expression string."""
-        clauses = []
-        n = len(bool_exp)
-        cl = ''
-        for i in range(n - 1):
-            if bool_exp[i] == '(':
-                cl = ''
-            elif bool_exp[i] == ')':
-                clauses.append(cl)
+        self._update_tables()
+        if operator == "NOT":
+            [operand] = operands
+            operand_operator, operand_operands = self.nodes[operand]
+            if operand_operator == "NOT":
+                return operand_operands[0]
+        elif operator == "XOR":
+            operands = tuple(sorted(operands))
+        elif operator != "VAR":
+            operands = tuple(sorted(set(operands)))
+            if len(operands) == 1:
+                return operands[0]
+        key = (operator, operands)
+        node = self.node_ids.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(key)
+            self.node_ids[key] = node
+        return node
+
+    def _update_tables(self):
+        """Discard the tables if a device or connection has changed.
+
+        The nodes of a DAG shared with another graph are kept, as they may
+        be in use by the other graph.
+        """
+        version = (self.devices.version, self.network.version)
+        if self.tables_version != version:
+            if self.shared is None:
+                self.nodes = []
+                self.node_ids = {}
+            self.node_names = {}
+            self.node_operands = {}
+            self.tables_version = version
+
+    def build_expression(self, signal_name):
+        """Return the expression node computing the named signal.
+
+        Switches are variables named after the switch. Return None if the
+        signal depends on a clock, a D-type, an unconnected input or a loop.
+        """
+        self._update_tables()
+        signal_ids = self.devices.get_signal_ids(signal_name)
+        if signal_ids is None:
+            return None
+        root = self.devices.get_device(signal_ids[0])
+        if root is None:
+            return None
+        gate_operators = {self.devices.AND: "AND", self.devices.OR: "OR",
+                          self.devices.NAND: "AND", self.devices.NOR: "OR",
+                          self.devices.XOR: "XOR", self.devices.NOT: "NOT"}
+        inverted = [self.devices.NAND, self.devices.NOR]
+
+        device_nodes = {}  # {device_id: node}
+        path = set()  # devices whose inputs are being built
+        stack = [(root, False)]
+        while stack:
+            device, inputs_built = stack.pop()
+            device_id = device.device_id
+            if inputs_built:
+                path.discard(device_id)
+                operands = tuple(device_nodes[connection[0]]
+                                 for connection in device.inputs.values())
+                operator = gate_operators[device.device_kind]
+                node = self.get_node(operator, operands)
+                if operator != "NOT" and self.nodes[node][0] == operator:
+                    # Repeated AND and OR operands are printed once
+                    self.node_operands.setdefault(
+                        node, tuple(dict.fromkeys(operands)))
+                if device.device_kind in inverted:
+                    node = self.get_node("NOT", (node,))
+                device_nodes[device_id] = node
+                self.node_names.setdefault(
+                    node, self.names.get_name_string(device_id))
+            elif device_id in device_nodes:
+                continue
+            elif device_id in path:
+                return None  # circular definition
+            elif device.device_kind == self.devices.SWITCH:
+                device_nodes[device_id] = self.get_node(
+                    "VAR", self.names.get_name_string(device_id))
+            elif device.device_kind not in gate_operators:
+                return None  # clocks and flip-flops
             else:
-                cl += bool_exp[i]
-        return clauses
+                path.add(device_id)
+                stack.append((device, True))
+                for connection in device.inputs.values():
+                    if connection is None:
+                        return None
+                    stack.append(
+                        (self.devices.get_device(connection[0]), False))
+        return device_nodes[root.device_id]
+
+    def get_cnf(self, node):
+        """Return the Tseitin encoding of the expression node as clauses.
+
+        Every AND, OR and XOR node gets a variable of its own, defined by a
+        few clauses, and a NOT node is the negated literal of its operand, so
+        the clauses grow linearly with the size of the expression. Return a
+        list of clauses, which are satisfiable exactly when the expression
+        can be true, and a list of variable names. Each clause is a tuple of
+        integer literals, i for variable i and -i for its negation, where
+        variable i is named variable_names[i - 1]. Variables for
+        subexpressions are named "_1", "_2"...
+        """
+        order = []  # nodes in the order their literals can be found
+        visited = set()
+        stack = [(node, False)]
+        while stack:
+            current, operands_visited = stack.pop()
+            if operands_visited:
+                order.append(current)
+            elif current not in visited:
+                visited.add(current)
+                stack.append((current, True))
+                operator, operands = self.nodes[current]
+                if operator != "VAR":
+                    stack.extend((operand, False) for operand in operands)
+
+        literals = {}  # {node: literal}
+        variable_names = []
+        clauses = []
+        clause_set = set()
+
+        def add_clause(clause):
+            clause = tuple(sorted(set(clause), key=abs))
+            for literal in clause:
+                if -literal in clause:
+                    return  # always true
+            if clause not in clause_set:
+                clause_set.add(clause)
+                clauses.append(clause)
+
+        subexpression_number = 0
+        for current in order:
+            operator, operands = self.nodes[current]
+            if operator == "NOT":
+                literals[current] = -literals[operands[0]]
+                continue
+            if operator == "VAR":
+                variable_names.append(operands)
+                literals[current] = len(variable_names)
+                continue
+            subexpression_number += 1
+            variable_names.append("_" + str(subexpression_number))
+            x = literals[current] = len(variable_names)
+            inputs = [literals[operand] for operand in operands]
+            if operator == "AND":  # x = a.b.c...
+                for a in inputs:
+                    add_clause((-x, a))
+                add_clause([x] + [-a for a in inputs])
+            elif operator == "OR":  # x = a+b+c...
+                for a in inputs:
+                    add_clause((x, -a))
+                add_clause([-x] + inputs)
+            elif operator == "XOR":  # x = a*b
+                [a, b] = inputs
+                add_clause((-x, a, b))
+                add_clause((-x, -a, -b))
+                add_clause((x, -a, b))
+                add_clause((x, a, -b))
+        add_clause((literals[node],))
+        return clauses, variable_names
+
+    def get_cnf_string(self, clauses, variable_names):
+        """Return the clauses as a string, such as (A+¬B).(¬A+B)."""
+        clause_strings = []
+        for clause in clauses:
+            literal_strings = []
+            for literal in clause:
+                if literal < 0:
+                    literal_strings.append('¬' + variable_names[-literal - 1])
+                else:
+                    literal_strings.append(variable_names[literal - 1])
+            clause_strings.append('(' + '+'.join(literal_strings) + ')')
+        return '.'.join(clause_strings)
 
-    def get_literals_adc(self, clause):
-        """Get clause literals and remove contradictions/redundancies.
+    def get_dimacs(self, clauses, variable_names):
+        """Return the clauses in DIMACS CNF format.
 
-        Deletes contradictions of form A+A and A+¬A.
-        """
-        lits = []
-        lits_neg = []
-        useless_lits = []
-        n = len(clause)
-        breaks = [-1]
-        n_lits = 1
-        for i in range(n):
-            if clause[i] == '+':
-                breaks.append(i)
-                n_lits += 1
-        breaks.append(n)
-        for i in range(n_lits):
-            lit = clause[breaks[i] + 1:breaks[i + 1]]
-            if lit[0] == '¬':
-                if lit[1:] in lits:
-                    lits_index = lits.index(lit[1:])
-                    if not lits_neg[lits_index]:
-                        lits_neg.pop(lits_index)
-                        lits.pop(lits_index)
-                        useless_lits.append(lit[1:])
-                elif lit[1:] not in useless_lits:
-                    lits.append(lit[1:])
-                    lits_neg.append(1)
-            else:
-                if lit in lits:
-                    lits_index = lits.index(lit)
-                    if lits_neg[lits_index]:
-                        lits_neg.pop(lits_index)
-                        lits.pop(lits_index)
-                        useless_lits.append(lit)
-                elif lit not in useless_lits:
-                    lits.append(lit)
-                    lits_neg.append(0)
-        if len(useless_lits) > 0:
-            return ['1'], [0]
-        return lits, lits_neg
-
-    def in_clause_clean_up(self, bool_exp):
-        """Clean up the expression within clauses.
-
-        Removes unnecessary brackets and contradictions/redundancy.
+        Each variable is named in a comment line, such as "c 1 A0".
         """
-        bool_exp2 = '('
-        clauses = self.get_clauses(bool_exp)
-        for clause_exp in clauses:
-            lits, lits_neg = self.get_literals_adc(clause_exp)
-            exp = ''
-            for i in range(len(lits)):
-                if lits_neg[i]:
-                    exp += '¬'
-                exp += lits[i] + '+'
-            bool_exp2 += '(' + exp[:-1] + ').'
-        return bool_exp2[:-1] + ')'
-
-    def out_clause_clean_up(self, bool_exp):
-        """Clean up the expression on the clause-to-clause level.
-
-        Removes unnecessary brackets and contradictions/redundancy.
+        lines = ['c ' + str(i) + ' ' + name
+                 for i, name in enumerate(variable_names, 1)]
+        lines.append('p cnf ' + str(len(variable_names)) + ' ' +
+                     str(len(clauses)))
+        for clause in clauses:
+            lines.append(' '.join([str(literal) for literal in clause] +
+                                  ['0']))
+        return '\n'.join(lines) + '\n'
+
+    def find_switch_settings(self, signal_name, level):
+        """Return switch settings which drive the signal to level.
+
+        level is devices.HIGH or devices.LOW. Return a dictionary
+        {switch_name: devices.HIGH or devices.LOW} of the switches the
+        signal depends on, None if no settings drive the signal to level,
+        or False if the signal depends on a clock, flip-flop or loop.
         """
-        bool_exp2 = ''
-        clauses = self.get_clauses(bool_exp)
-        clause_lit_sets = []
-        for clause_exp in clauses:
-            lits, lits_neg = self.get_literals_adc(clause_exp)
-            if lits != ['1']:
-                clause_lit_sets.append(set())
-                for i in range(len(lits)):
-                    if lits_neg[i]:
-                        clause_lit_sets[-1].add('¬' + lits[i])
-                    else:
-                        clause_lit_sets[-1].add(lits[i])
-
-        for i in range(len(clause_lit_sets)):
-            if clause_lit_sets[i] not in clause_lit_sets[:i]:
-                exp = ''
-                for j in clause_lit_sets[i]:
-                    exp += j + '+'
-                bool_exp2 += '(' + exp[:-1] + ').'
-        return '(' + bool_exp2[:-1] + ')'
+        node = self.build_expression(signal_name)
+        if node is None:
+            return False
+        if level == self.devices.LOW:
+            node = self.get_node('NOT', (node,))
+        clauses, variable_names = self.get_cnf(node)
+        assignment = SatSolver(clauses, len(variable_names)).solve()
+        if assignment is None:
+            return None
+        settings = {}
+        for variable, name in enumerate(variable_names, 1):
+            if not name.startswith('_'):  # switches, not subexpressions
+                if assignment[variable]:
+                    settings[name] = self.devices.HIGH
+                else:
+                    settings[name] = self.devices.LOW
+        return settings
 
     def add_new_line_breaks(self, bool_exp, line_length_limit=50):
         """Add line-breaks in boolean expression."""
@@ -17,9 +17,10 @@ from names import Names
 from devices import Devices
 from network import Network
 from monitors import Monitors
-from scanner import Scanner
-from parse import Parser
+from netcache import NetlistCache
+from reload import Reloader
 from graph import Graph
+from scanner import Scanner
 
 
 class MyGLCanvas(wxcanvas.GLCanvas):
@@ -59,6 +60,11 @@ class MyGLCanvas(wxcanvas.GLCanvas):
     render_help(self): Renders the help page.
 
     render_cnf(self): Renders the CNF page.
+
+    build_logic_file(self): Returns the network as a logic description
+                            file, or None if it cannot be written as one.
+
+    render_logic(self): Renders the logic description file page.
     """
 
     def __init__(self, parent, devices, monitors):
@@ -374,63 +380,49 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             )
         extra_lines += new_extra_lines
 
-        bool_exp2 = self.parent.graph.expand_xors(bool_exp)
-        bool_exp2 = self.parent.graph.demorgan_push(bool_exp2)
+        # The expression DAG of the monitor has just been built above
+        graph = self.parent.graph
+        node = graph.build_expression(mon_name)
+        clauses, variable_names = graph.get_cnf(node)
         bool_exp_show, new_extra_lines = \
-            self.parent.graph.add_new_line_breaks(bool_exp2)
-        self.render_text(bool_exp_show + '\n \t\t(expand XORs to ANDs/ORs)',
+            graph.add_new_line_breaks(
+                graph.get_cnf_string(clauses, variable_names))
+        self.render_text(bool_exp_show + _('\n \t\t(Tseitin encoding (CNF):'
+                                           ' _1, _2... are sub-expressions)'),
                          10, self.canvas_size[1] - 30 - line_gap * 2 -
                          extra_lines * 20)
         extra_lines += new_extra_lines
 
-        bool_exp3 = self.parent.graph.distribute_ors(bool_exp2)
-        bool_exp4 = self.parent.graph.clean_up_to_cnf(bool_exp3)
-        bool_exp_show, new_extra_lines = \
-            self.parent.graph.add_new_line_breaks(bool_exp4)
-        self.render_text(
-            bool_exp_show[1:-1] + '\n \t\t(distribute ORs over ANDs'
-                                  ' and cleanup brackets (CNF))',
-            10, self.canvas_size[1] - 30 - line_gap * 3 -
-            extra_lines * 20)
-        extra_lines += new_extra_lines
-
-        bool_exp5 = self.parent.graph.in_clause_clean_up(bool_exp4)
-        bool_exp_show, new_extra_lines = \
-            self.parent.graph.add_new_line_breaks(bool_exp5)
-        self.render_text(bool_exp_show[1:-1] + '\n \t\t(destroy trivial '
-                                               'in-clause redundancy)', 10,
-                         self.canvas_size[1] -
-                         30 - line_gap * 4 - extra_lines * 20)
-        extra_lines += new_extra_lines
-
-        bool_exp6 = self.parent.graph.out_clause_clean_up(bool_exp5)
-        bool_exp_show, new_extra_lines = \
-            self.parent.graph.add_new_line_breaks(bool_exp6)
-        self.render_text(bool_exp_show[1:-1] + '\n \t\t(destroy clause-level'
-                                               ' redundancy)', 10,
-                         self.canvas_size[1] -
-                         30 - line_gap * 5 - extra_lines * 20)
-        extra_lines += new_extra_lines
-
         GL.glFlush()
         self.SwapBuffers()
 
     def build_logic_file(self):
-        """Build new logic description file."""
+        """Build new logic description file.
+
+        Return None if a device name cannot be written in a definition file,
+        such as "A.S" for a device from an imported file or "R[0]" for a
+        device of a bus.
+        """
         device_ids = self.parent.devices.find_devices()
         device_print = ''
 
         for i in range(len(device_ids)):
             device = self.parent.devices.get_device(device_ids[i])
             dev_type = self.parent.names.names[device.device_kind]
+            dev_name = self.parent.names.names[device_ids[i]]
+            if not dev_name[0].isalpha() or \
+                    Scanner.NAME_CHARACTERS.match(dev_name).end() != \
+                    len(dev_name):
+                return None
             device_print += '\n' + dev_type
             if dev_type == 'SWITCH':
                 device_print += ', ' + str(int(
                     self.parent.devices.get_switch_value(device_ids[i])))
+            elif dev_type == 'CLOCK':
+                device_print += ', ' + str(device.clock_half_period)
             elif dev_type in ('AND', 'OR', 'NOR', 'NAND'):
                 device_print += ', '+str(len(device.inputs))
-            device_print += ' = ' + self.parent.names.names[device_ids[i]] + \
-                            ';'
+            device_print += ' = ' + dev_name + ';'
         device_print += '\nEND\n'
 
         out_string = 'DEVICES'
@@ -457,7 +449,11 @@ class MyGLCanvas(wxcanvas.GLCanvas):
 
         GL.glClear(GL.GL_COLOR_BUFFER_BIT)
 
-        self.render_text(self.build_logic_file(), 10, self.canvas_size[1] - 20)
+        logic_file = self.build_logic_file()
+        if logic_file is None:
+            logic_file = _('Imported devices and buses cannot be written to a '
+                           'logic description file')
+        self.render_text(logic_file, 10, self.canvas_size[1] - 20)
         GL.glFlush()
         self.SwapBuffers()
 
@@ -471,6 +467,13 @@ class Gui(wx.Frame):
     Parameters
     ----------
     title: title of the window.
+    path: path to the definition file.
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    netlist_cache: instance of the netcache.NetlistCache() class the network
+                   was built with, or None for the default cache.
 
     Public methods
     --------------
@@ -491,8 +494,14 @@ class Gui(wx.Frame):
     on_continue_button(self, event): Event handler for when the user clicks the
                                     continue button.
 
-    run_network_and_get_values(self): Executes the network for and stores the
-                                    values and signal names.
+    run_network_and_get_values(self, cycles=None): Executes the network and
+                                    stores the values and signal names.
+
+    on_reload_timer(self, event): Event handler for when the reload timer
+                                  fires, applying edits to the definition
+                                  file.
+
+    update_choices(self): Updates the switch, monitor and connection choices.
 
     on_add_monitor_button(self, event): Event handler for when the user clicks
                     the add-monitor button.
@@ -507,7 +516,8 @@ class Gui(wx.Frame):
                     decides to remove a connection.
     """
 
-    def __init__(self, title, path, names, devices, network, monitors):
+    def __init__(self, title, path, names, devices, network, monitors,
+                 netlist_cache=None):
         """Initialise widgets and layout."""
         super().__init__(parent=None, title=title, size=(800, 600))
         self.quit_id = 999
@@ -525,6 +535,7 @@ class Gui(wx.Frame):
         self.values = None
         self.trace_names = None
         self.time_steps = 8
+        self.cycles_completed = 0
 
         # Store inputs from logsim.py
         self.title = title
@@ -533,6 +544,9 @@ class Gui(wx.Frame):
         self.devices = devices
         self.network = network
         self.monitors = monitors
+        if netlist_cache is None:
+            netlist_cache = NetlistCache()
+        self.netlist_cache = netlist_cache
         self.graph = Graph(self.names, self.devices, self.network,
                            self.monitors)
 
@@ -693,9 +707,64 @@ class Gui(wx.Frame):
         self.SetSizeHints(600, 600)
         self.SetSizer(main_sizer)
 
+        # Poll the definition file and the files it imports, and apply any
+        # edits to the live network
+        self.reloader = Reloader(path, names, devices, network, monitors,
+                                 self.netlist_cache.flat_netlist,
+                                 self.netlist_cache.imported_paths)
+        self.reload_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_reload_timer, self.reload_timer)
+        self.reload_timer.Start(1000)
+
         self.run_network_and_get_values()
         self.canvas.render('')
 
+    def on_reload_timer(self, event):
+        """Handle the event when the reload timer fires."""
+        if not self.reloader.poll(self.cycles_completed):
+            return
+        self.update_choices()
+        # The simulation state kept by the reload is not reset
+        self.run_network_and_get_values(0)
+        self.canvas.render(_("Definition file reloaded"))
+
+    def update_choices(self):
+        """Update the switch, monitor and connection choices.
+
+        Used after devices, connections or monitors are changed other than
+        from the widgets, for example when the definition file is reloaded.
+        """
+        self.switch_ids = self.devices.find_devices(self.devices.SWITCH)
+        self.switch_names = [self.names.get_name_string(i) for i in
+                             self.switch_ids]
+        self.switch_values = [self.devices.get_switch_value(i) for i in
+                              self.switch_ids]
+        self.sig_mons, self.sig_n_mons = self.monitors.get_signal_names()
+
+        self.all_input_ids, self.all_input_names = \
+            self.monitors.get_input_ids_and_names()
+        self.input_connected = [(self.network.get_connected_output(device_id,
+                                                                   input_id)
+                                 is not None) for (device_id, input_id) in
+                                self.all_input_ids]
+        self.con_ids, self.con_names = \
+            self.monitors.get_connection_ids_and_names()
+        self.con_strts = self.sig_mons[:] + self.sig_n_mons[:]
+        input_number = len(self.all_input_names)
+        self.con_ends = [self.all_input_names[i] for i in range(input_number)
+                         if not self.input_connected[i]]
+
+        choices = [(self.switch_choice, self.switch_names),
+                   (self.add_monitor_choice, self.sig_n_mons),
+                   (self.remove_monitor_choice, self.sig_mons),
+                   (self.add_connection_strt_choice, self.con_strts),
+                   (self.add_connection_end_choice, self.con_ends),
+                   (self.remove_connection_choice, self.con_names)]
+        for choice, items in choices:
+            choice.SetItems(items)
+            if items:
+                choice.SetValue(items[0])
+
     def reset_screen(self):
         """Put screen back into its initial state."""
         self.canvas.pan_x = 0
@@ -727,14 +796,19 @@ class Gui(wx.Frame):
             devices = Devices(names)
             network = Network(names, devices)
             monitors = Monitors(names, devices, network)
-            scanner = Scanner(new_path, names)
-            parser = Parser(names, devices, network, monitors, scanner)
-            if parser.parse_network():
+            if self.netlist_cache.build_network(new_path, names, devices,
+                                                network, monitors):
                 gui = Gui("Logic Simulator", new_path, names, devices, network,
-                          monitors)
+                          monitors, self.netlist_cache)
                 gui.Show(True)
 
         elif event.GetId() == self.save_id:
+            logic_file = self.canvas.build_logic_file()
+            if logic_file is None:
+                wx.MessageBox(_('Imported devices and buses cannot be written '
+                                'to a logic description file'),
+                              _('Cannot save file'), wx.ICON_ERROR)
+                return
             openFileDialog = wx.FileDialog(self, _("Save txt file"), "", "",
                                            wildcard="TXT files (*.txt)|*.txt",
                                            style=wx.FD_SAVE)
@@ -746,7 +820,7 @@ class Gui(wx.Frame):
             print(_("File saved at: "), new_path)
 
             with open(new_path, 'w') as f:
-                f.write(self.canvas.build_logic_file())
+                f.write(logic_file)
 
         elif event.GetId() == self.help_id:
             self.reset_screen()
@@ -779,7 +853,7 @@ class Gui(wx.Frame):
         sw_name = self.switch_choice.GetValue()
         sw_no = self.switch_names.index(sw_name)
         self.switch_values[sw_no] = [0, 1][self.switch_set.GetValue()]
-        sw_id = self.names.query(sw_name)
+        sw_id = self.switch_ids[sw_no]
         self.devices.set_switch(sw_id, self.switch_set.GetValue())
         self.run_network_and_get_values()
         self.canvas.render('')
@@ -805,49 +879,51 @@ class Gui(wx.Frame):
         spin_cont_value = self.spin.GetValue()
 
         self.time_steps += spin_cont_value
-        self.run_network_and_get_values()
+        self.run_network_and_get_values(spin_cont_value)
 
         text = _("Continue button pressed. (time_steps=%d)") % self.time_steps
         self.canvas.render(text)
 
-    def run_network_and_get_values(self):
-        """Run the network and get the monitored signal values."""
+    def run_network_and_get_values(self, cycles=None):
+        """Run the network and get the monitored signal values.
+
+        The network is started from cold and run for time_steps cycles, or
+        if cycles is given, run on from its current state for that many
+        cycles.
+        """
         self.canvas.not_connected = not self.network.check_network()
         if self.canvas.not_connected:
             return ''
-        self.devices.cold_startup()
-        self.monitors.reset_monitors()
+        if cycles is None:
+            self.devices.cold_startup()
+            self.monitors.reset_monitors()
+            self.cycles_completed = 0
+            cycles = self.time_steps
         osc_here = False
-        for i in range(self.time_steps):
+        for i in range(cycles):
             if not self.network.execute_network():
                 self.canvas.oscillating = True
                 osc_here = True
             self.monitors.record_signals()
+        self.cycles_completed += cycles
         if not osc_here:
             self.canvas.oscillating = False
         self.values = []
 
         monitor_dict = self.monitors.monitors_dictionary
         for device_id, output_id in monitor_dict:
-            self.values.append(monitor_dict[(device_id, output_id)])
+            # Compact traces are expanded into dense lists for drawing
+            self.values.append(list(monitor_dict[(device_id, output_id)]))
         self.trace_names = self.monitors.get_signal_names()[0]
 
     def on_add_monitor_button(self, event):
         """Handle the event when user decides to add a monitor."""
         mon_choice_name = self.add_monitor_choice.GetValue()
-        if '.' in mon_choice_name:
-            dot_index = mon_choice_name.index('.')
-            output_id = self.names.query(mon_choice_name[dot_index + 1:])
-            mon_choice_name_strt = mon_choice_name[:dot_index]
-        else:
-            mon_choice_name_strt = mon_choice_name
-            output_id = None
-
         if mon_choice_name not in self.sig_n_mons:
             return ''
         self.canvas.render(_('Add: ') + str(mon_choice_name))
 
-        device_id = self.names.query(mon_choice_name_strt)
+        device_id, output_id = self.devices.get_signal_ids(mon_choice_name)
         self.monitors.make_monitor(device_id, output_id)
         self.run_network_and_get_values()
 
@@ -864,19 +940,11 @@ class Gui(wx.Frame):
     def on_remove_monitor_button(self, event):
         """Handle the event when user decides to remove a monitor."""
         mon_choice_name = self.remove_monitor_choice.GetValue()
-        if '.' in mon_choice_name:
-            dot_index = mon_choice_name.index('.')
-            output_id = self.names.query(mon_choice_name[dot_index + 1:])
-            mon_choice_name_strt = mon_choice_name[:dot_index]
-        else:
-            mon_choice_name_strt = mon_choice_name
-            output_id = None
-
         if mon_choice_name not in self.sig_mons:
             return ''
         self.canvas.render(_('Remove: ') + str(mon_choice_name))
 
-        device_id = self.names.query(mon_choice_name_strt)
+        device_id, output_id = self.devices.get_signal_ids(mon_choice_name)
         self.monitors.remove_monitor(device_id, output_id)
         self.run_network_and_get_values()
 
@@ -898,15 +966,11 @@ class Gui(wx.Frame):
         if in_name not in self.all_input_names:
             return ''
 
-        if '.' in out_name:
-            dot_index = out_name.index('.')
-            out_dev_id = self.names.query(out_name[:dot_index])
-            out_port_id = self.names.query(out_name[dot_index+1:])
-        else:
-            out_dev_id = self.names.query(out_name)
-            out_port_id = None
-        in_dev_id, in_port_id = self.all_input_ids[
-            self.all_input_names.index(in_name)]
+        if out_name not in self.con_strts:
+            return ''
+
+        out_dev_id, out_port_id = self.devices.get_signal_ids(out_name)
+        in_dev_id, in_port_id = self.devices.get_signal_ids(in_name)
         self.network.make_connection(out_dev_id, out_port_id, in_dev_id,
                                      in_port_id)
 
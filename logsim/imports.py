@@ -0,0 +1,169 @@
+"""Load the definition files imported by other definition files.
+
+Used in the Logic Simulator project to split large circuits over several
+definition files. A definition file can import another with the statement
+IMPORT "path" = namespace; and then refer to the devices of that file as
+namespace.device. Each file is parsed into its own netlist, which is cached
+by a hash of the file contents, so editing one imported file only parses
+that file again.
+
+Classes
+-------
+ImportResolver - loads imported files and links their netlists.
+"""
+import contextlib
+import hashlib
+import io
+import os
+
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from netlist import Netlist
+from scanner import Scanner
+from parse import Parser
+
+
+class ImportResolver:
+    """Load imported definition files and link their netlists.
+
+    Each file is parsed into a netlist of its own statements, which is kept
+    in memory, and in a netcache.NetlistCache() if one is given, keyed by a
+    hash of the file contents. Linking a netlist adds the statements of the
+    files it imports, with their device names in the namespace of each
+    import. An imported file is checked on its own when it is parsed, except
+    that its inputs may be left for the importing file to connect.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    netlist_cache: instance of the netcache.NetlistCache() class, or None.
+
+    Public methods
+    --------------
+    load(self, path): Returns the linked netlist of an imported file and an
+                      error code.
+
+    link(self, netlist, path=None): Returns a netlist with the statements of
+                                    its imported files added.
+
+    Private methods
+    ---------------
+    _parse(self, text, path): Returns the netlist of an imported file, or
+                              None if it has errors.
+    """
+
+    def __init__(self, names, netlist_cache=None):
+        """Initialise the caches and error codes."""
+        self.names = names
+        self.netlist_cache = netlist_cache
+
+        # {content hash: netlist of the file's own statements}
+        self.netlists = {}
+        # Content hashes of files found to have errors
+        self.failed = set()
+        # Paths of the files being loaded, to find files importing themselves
+        self.loading = set()
+        # Paths of every file imported, for example to watch them for edits
+        self.paths = set()
+
+        [self.NO_ERROR, self.FILE_ABSENT, self.IMPORT_CYCLE,
+         self.IMPORT_ERRORS] = self.names.unique_error_codes(4)
+
+    def load(self, path):
+        """Return the linked netlist of the file at path and an error code.
+
+        The netlist is None unless the error code is NO_ERROR.
+        """
+        path = os.path.abspath(path)
+        self.paths.add(path)
+        if path in self.loading:
+            return None, self.IMPORT_CYCLE
+        try:
+            with open(path, "r") as definition_file:
+                text = definition_file.read()
+        except (OSError, UnicodeDecodeError):
+            return None, self.FILE_ABSENT
+
+        key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+        if key in self.failed:
+            return None, self.IMPORT_ERRORS
+
+        self.loading.add(path)
+        try:
+            netlist = self.netlists.get(key)
+            if netlist is None and self.netlist_cache is not None:
+                netlist = self.netlist_cache.load(text, self.names)
+            if netlist is None:
+                netlist = self._parse(text, path)
+                if netlist is None:
+                    self.failed.add(key)
+                    return None, self.IMPORT_ERRORS
+                if self.netlist_cache is not None:
+                    self.netlist_cache.save(text, netlist, self.names)
+            self.netlists[key] = netlist
+
+            linked, error = self.link(netlist, path)
+            if error is not None:
+                return None, error[1]
+            return linked, self.NO_ERROR
+        finally:
+            self.loading.discard(path)
+
+    def link(self, netlist, path=None):
+        """Return a netlist with the statements of its imported files added.
+
+        path is the file the netlist was read from, if any, which import
+        paths are relative to. Return the linked netlist and None if
+        successful, or None and the row of the failed import statement and
+        the error code if not.
+        """
+        if not netlist.imports:
+            return netlist, None
+        if path is None:
+            directory = os.getcwd()
+        else:
+            path = os.path.abspath(path)
+            directory = os.path.dirname(path)
+        # The importing file is marked as loading while its imports load
+        if path is None or path in self.loading:
+            path = None  # nothing to unmark
+        else:
+            self.loading.add(path)
+
+        try:
+            linked = Netlist()
+            for row in netlist.imports:
+                path_symbol, namespace_symbol = row
+                imported, error_type = self.load(
+                    os.path.join(directory, path_symbol.id))
+                if error_type != self.NO_ERROR:
+                    return None, (row, error_type)
+                linked.add_netlist(imported, self.names, namespace_symbol.id)
+            linked.add_netlist(netlist, self.names)
+            linked.connections_complete = netlist.connections_complete
+            return linked, None
+        finally:
+            if path is not None:
+                self.loading.discard(path)
+
+    def _parse(self, text, path):
+        """Return the netlist of an imported file, or None if it has errors.
+
+        The file is built into a network of its own to check it. Any error
+        messages are printed together, headed by the path of the file.
+        """
+        devices = Devices(self.names)
+        network = Network(self.names, devices)
+        monitors = Monitors(self.names, devices, network)
+        parser = Parser(self.names, devices, network, monitors,
+                        Scanner.from_string(text, self.names, path=path),
+                        resolver=self, imported=True)
+        messages = io.StringIO()
+        with contextlib.redirect_stdout(messages):
+            no_errors = parser.parse_network()
+        if not no_errors:
+            print("Errors in imported file", path)
+            print(messages.getvalue(), end="")
+            return None
+        return parser.netlist
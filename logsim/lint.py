@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Check many definition files for errors in parallel.
+
+Used in the Logic Simulator project to check batches of definition files,
+for example in continuous integration. Files are parsed concurrently in a
+pool of processes, and the errors found are returned as structured
+diagnostics instead of being printed for a person to read.
+
+Usage
+-----
+Check definition files: lint.py <file path> [<file path>...]
+
+Each diagnostic is printed as one line of JSON with the keys "file", "line",
+"column", "code" and "message". The exit status is 1 if any errors are found.
+
+Functions
+---------
+lint_file - returns the diagnostics of one definition file.
+lint_files - returns the diagnostics of many definition files.
+main - prints the diagnostics of the files given on the command line.
+"""
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import sys
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+def lint_file(path):
+    """Return the diagnostics of the definition file at path.
+
+    Each diagnostic is a dictionary with the keys "file", "line", "column",
+    "code" and "message". Lines and columns are counted from 1, and are None
+    for errors without a location.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    try:
+        scanner = Scanner(path, names)
+    except (OSError, UnicodeDecodeError) as error:
+        return [{"file": path, "line": None, "column": None,
+                 "code": "UNREADABLE_FILE", "message": str(error)}]
+
+    parser = Parser(names, devices, network, monitors, scanner)
+    with contextlib.redirect_stdout(io.StringIO()):  # errors are returned
+        parser.parse_network()
+    return [{"file": path, "line": line, "column": column, "code": code,
+             "message": message}
+            for (line, column, code, message) in parser.diagnostics]
+
+
+def lint_files(paths, workers=None):
+    """Return a list of the diagnostics of each definition file in paths.
+
+    Files are checked in a pool of worker processes, workers in number, or
+    one per processor if workers is None.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if len(paths) < 2 or workers == 1:
+        return [lint_file(path) for path in paths]
+    # Several files are sent to a worker at a time to save on messages
+    chunk_size = max(1, len(paths) // (4 * workers))
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(lint_file, paths, chunksize=chunk_size))
+
+
+def main(arg_list):
+    """Print the diagnostics of the files in arg_list as JSON lines.
+
+    Exit with status 1 if any errors are found, and 2 if no files are given.
+    """
+    if not arg_list:
+        print("Usage: lint.py <file path> [<file path>...]")
+        sys.exit(2)
+    error_found = False
+    for diagnostics in lint_files(arg_list):
+        for diagnostic in diagnostics:
+            print(json.dumps(diagnostic))
+            error_found = True
+    if error_found:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -8,21 +8,41 @@ Usage
 -----
 Show help: logsim.py -h
 Command line user interface: logsim.py -c <file path>
+Record every signal (probe-all mode): logsim.py -p -c <file path>
+Simplify the network before simulating it: logsim.py -o -c <file path>
+Simulate only what the monitors depend on: logsim.py -r -c <file path>
+Do not read or write the parsed network cache: logsim.py --no-cache ...
+Check definition files for errors: logsim.py --check <file path>...
+Compare two definition files: logsim.py --equiv <file path> <file path>
 Graphical user interface: logsim.py <file path>
 """
 import getopt
 import sys
 
-import wx
-
 from names import Names
 from devices import Devices
 from network import Network
 from monitors import Monitors
-from scanner import Scanner
-from parse import Parser
+from netcache import NetlistCache
+from optimise import Optimiser
 from userint import UserInterface
-from gui import Gui
+import lint
+import equiv
+
+
+def build_network(netlist_cache, path, names, devices, network, monitors):
+    """Build the network in the file at path, or exit if it is missing.
+
+    The parsed network is kept in netlist_cache, so unchanged files are not
+    parsed again. Return True if the network was built without errors.
+    """
+    try:
+        return netlist_cache.build_network(path, names, devices, network,
+                                           monitors)
+    except FileNotFoundError:
+        print('File not found: please enter a valid file path.'
+              '  Use "logsim.py -h" for help.')
+        sys.exit()
 
 
 def main(arg_list):
@@ -34,43 +54,94 @@ def main(arg_list):
     usage_message = ("Usage:\n"
                      "Show help: logsim.py -h\n"
                      "Command line user interface: logsim.py -c <file path>\n"
+                     "Record every signal (probe-all mode): "
+                     "logsim.py -p -c <file path>\n"
+                     "Simplify the network before simulating it: "
+                     "logsim.py -o -c <file path>\n"
+                     "Simulate only what the monitors depend on: "
+                     "logsim.py -r -c <file path>\n"
+                     "Do not read or write the parsed network cache: "
+                     "logsim.py --no-cache ...\n"
+                     "Check definition files for errors: "
+                     "logsim.py --check <file path>...\n"
+                     "Compare two definition files: "
+                     "logsim.py --equiv <file path> <file path>\n"
                      "Graphical user interface: logsim.py <file path>")
     try:
-        options, arguments = getopt.getopt(arg_list, "hc:")
+        options, arguments = getopt.getopt(arg_list, "horpc:",
+                                           ["check", "equiv", "no-cache"])
     except getopt.GetoptError:
         print("Error: invalid command line arguments\n")
         print(usage_message)
         sys.exit()
 
+    if ("--check", "") in options:  # check files without simulating them
+        lint.main(arguments)
+        sys.exit()
+
+    if ("--equiv", "") in options:  # compare files without simulating them
+        equiv.main(arguments)
+        sys.exit()
+
     # Initialise instances of the four inner simulator classes
     names = Names()
     devices = Devices(names)
     network = Network(names, devices)
-    monitors = Monitors(names, devices, network)
+    # Only the devices the monitors depend on are simulated if asked to
+    monitors = Monitors(names, devices, network,
+                        cone_only=("-r", "") in options)
+
+    probe_all = ("-p", "") in options  # record every signal
+    # Parsed networks are cached unless asked not to
+    netlist_cache = NetlistCache(enabled=("--no-cache", "") not in options)
+    optimise = ("-o", "") in options  # simplify the network first
 
     for option, path in options:
         if option == "-h":  # print the usage message
             print(usage_message)
             sys.exit()
         elif option == "-c":  # use the command line user interface
-            scanner = Scanner(path, names)
-            parser = Parser(names, devices, network, monitors, scanner)
-            if parser.parse_network():
+            if build_network(netlist_cache, path, names, devices, network,
+                             monitors):
+                if optimise:
+                    device_number = len(devices.devices_list)
+                    for change in Optimiser(names, devices, network,
+                                            monitors).optimise():
+                        print(change)
+                    print("Optimised network:", len(devices.devices_list),
+                          "of", device_number, "devices kept")
+                if probe_all:
+                    monitors.enable_probe_all()
                 # Initialise an instance of the userint.UserInterface() class
                 userint = UserInterface(names, devices, network, monitors)
                 userint.command_interface()
 
-    if not options:  # no option given, use the graphical user interface
+    if not [option for option, path in options
+            if option not in ["-p", "-o", "-r", "--no-cache"]]:
+        # no option given, use the graphical user interface
 
         if len(arguments) != 1:  # wrong number of arguments
             print("Error: one file path required\n")
             print(usage_message)
             sys.exit()
 
+        if probe_all:  # probed traces are only shown by the command line
+            print("Error: -p needs the command line user interface (-c)\n")
+            print(usage_message)
+            sys.exit()
+
+        if optimise:  # the GUI edits the network as it was defined
+            print("Error: -o needs the command line user interface (-c)\n")
+            print(usage_message)
+            sys.exit()
+
         [path] = arguments
-        scanner = Scanner(path, names)
-        parser = Parser(names, devices, network, monitors, scanner)
-        if parser.parse_network():
+        if build_network(netlist_cache, path, names, devices, network,
+                         monitors):
+            # wx is only needed, and only imported, for the GUI
+            import wx
+            from gui import Gui
+
             # Initialise an instance of the gui.Gui() class
             app = wx.App()
             import builtins
@@ -85,7 +156,7 @@ def main(arg_list):
 
             locale.AddCatalog('gui')
             gui = Gui(_("Logic Simulator"), path, names, devices, network,
-                      monitors)
+                      monitors, netlist_cache)
             gui.Show(True)
             app.MainLoop()
 
@@ -10,6 +10,10 @@ Monitors - records and displays specified output signals.
 """
 import collections
 
+from traces import TransitionTrace
+from probes import ProbeStore
+from activity import Activity
+
 
 class Monitors:
     """Record and display output signals.
@@ -22,6 +26,11 @@ class Monitors:
     names: instance of the names.Names() class.
     devices: instance of the devices.Devices() class.
     network: instance of the network.Network() class.
+    compact: if True, signal traces are stored as traces.TransitionTrace()
+             instances, which only keep the cycles at which a signal changes.
+    cone_only: if True, the network only executes the devices which the
+               monitored outputs depend on, unless every output is recorded
+               in probe-all mode or for switching activity.
 
     Public methods
     --------------
@@ -49,24 +58,82 @@ class Monitors:
 
     reset_monitors(self): Clears the memory of all monitors.
 
+    enable_probe_all(self, memory_budget, chunk_size): Records every output
+                    in the network from now on, in a probes.ProbeStore().
+
+    disable_probe_all(self): Stops recording every output in the network.
+
+    get_probe_trace(self, device_id, output_id): Returns the signal levels
+                    recorded for the specified output in probe-all mode.
+
+    enable_activity(self): Accumulates switching activity statistics for
+                           every output from now on.
+
+    disable_activity(self): Stops accumulating switching activity statistics.
+
+    get_activity(self, device_id, output_id): Returns the switching activity
+                           statistics of the specified output.
+
+    display_activity(self): Displays the switching activity statistics of
+                            every output in the text console.
+
     get_margin(self): Returns the length of the longest monitor's name.
 
+    get_trace_string(self, signal_list): Returns a signal trace drawn as a
+                                         string of characters.
+
     display_signals(self): Displays signal trace(s) in the text console.
     """
 
-    def __init__(self, names, devices, network):
+    def __init__(self, names, devices, network, compact=False,
+                 cone_only=False):
         """Initialise the monitors dictionary and monitor errors."""
         self.names = names
         self.network = network
         self.devices = devices
+        self.compact = compact
+        self.cone_only = cone_only
 
         # monitors_dictionary stores
         # {(device_id, output_id): [signal_list]}
         self.monitors_dictionary = collections.OrderedDict()
 
+        # Probe-all mode: every output listed in probe_outputs as
+        # [(device_id, output_id)...] is recorded in probe_store
+        self.probe_store = None
+        self.probe_outputs = []
+
+        # Switching activity statistics, accumulated if not None
+        self.activity = None
+
+        # Connection ids and names from get_connection_ids_and_names, and
+        # the (devices.version, network.version) they were built at
+        self.connections_cache = None
+        self.connections_cache_version = None
+
         [self.NO_ERROR, self.NOT_OUTPUT,
          self.MONITOR_PRESENT] = self.names.unique_error_codes(3)
 
+        self._update_cone()
+
+    def _new_trace(self, signal_list):
+        """Return a new signal trace holding signal_list.
+
+        The trace is a list, or a TransitionTrace if monitors are compact.
+        """
+        if self.compact:
+            return TransitionTrace(signal_list)
+        return signal_list
+
+    def _update_cone(self):
+        """Set the outputs whose cone the network executes, if cone_only."""
+        if not self.cone_only:
+            return
+        if self.probe_store is not None or self.activity is not None:
+            self.network.set_observed_outputs(None)  # every output is needed
+        else:
+            self.network.set_observed_outputs(self.monitors_dictionary)
+
     def make_monitor(self, device_id, output_id, cycles_completed=0):
         """Add the specified signal to the monitors dictionary.
 
@@ -84,8 +151,9 @@ class Monitors:
             # monitor, then initialise the signal trace with an n-length list
             # of BLANK signals. Otherwise, initialise the trace with an empty
             # list.
-            self.monitors_dictionary[(device_id, output_id)] = [
-                self.devices.BLANK] * cycles_completed
+            self.monitors_dictionary[(device_id, output_id)] = \
+                self._new_trace([self.devices.BLANK] * cycles_completed)
+            self._update_cone()
             return self.NO_ERROR
 
     def remove_monitor(self, device_id, output_id):
@@ -97,6 +165,7 @@ class Monitors:
             return False
         else:
             del self.monitors_dictionary[(device_id, output_id)]
+            self._update_cone()
             return True
 
     def get_monitor_signal(self, device_id, output_id):
@@ -118,23 +187,27 @@ class Monitors:
             signal_level = self.get_monitor_signal(device_id, output_id)
             self.monitors_dictionary[(device_id,
                                       output_id)].append(signal_level)
+        if self.probe_store is not None:
+            # Outputs removed since probe-all mode was enabled are BLANK
+            signal_list = []
+            for device_id, output_id in self.probe_outputs:
+                signal_level = self.network.get_output_signal(device_id,
+                                                              output_id)
+                if signal_level is None:
+                    signal_level = self.devices.BLANK
+                signal_list.append(signal_level)
+            self.probe_store.record(signal_list)
+        if self.activity is not None:
+            self.activity.update()
 
     def get_signal_names(self):
         """Return two signal name lists: monitored and not monitored."""
-        non_monitored_signal_list = []
-        monitored_signal_list = []
-        for device_id, output_id in self.monitors_dictionary:
-            monitor_name = self.devices.get_signal_name(device_id, output_id)
-            monitored_signal_list.append(monitor_name)
-
-        for device_id in self.devices.find_devices():
-            device = self.devices.get_device(device_id)
-            for output_id in device.outputs:
-                if (device_id, output_id) not in self.monitors_dictionary:
-                    signal_name = self.devices.get_signal_name(device_id,
-                                                               output_id)
-                    non_monitored_signal_list.append(signal_name)
-
+        output_names = self.devices.output_names
+        monitored_signal_list = [output_names[monitor] for monitor in
+                                 self.monitors_dictionary]
+        non_monitored_signal_list = [
+            signal_name for output, signal_name in output_names.items()
+            if output not in self.monitors_dictionary]
         return [monitored_signal_list, non_monitored_signal_list]
 
     def get_input_ids_and_names(self):
@@ -142,48 +215,39 @@ class Monitors:
 
         Output of form ([(device_id, output_id)...], ["G0.I1", "G2.I3"...]
         """
-        input_id_list = []
-        input_name_list = []
-        for device in self.devices.devices_list:
-            device_id = device.device_id
-            device_name = self.names.get_name_string(device_id)
-            for input_id in device.inputs:
-                input_name = self.names.get_name_string(input_id)
-                input_id_list.append((device_id, input_id))
-                input_name_list.append(device_name + '.' + input_name)
-        return input_id_list, input_name_list
+        input_names = self.devices.input_names
+        return list(input_names.keys()), list(input_names.values())
 
     def get_connection_ids_and_names(self):
         """Return list of connection ids and list of connection names.
 
         Output of form ([((out_id, out_port_id), (in_id, in_port_id))...],
                         ["A0 - G1.I1", "FF.Q - G2.I9"...])
+        The lists are rebuilt only if devices or connections have changed.
         """
+        version = (self.devices.version, self.network.version)
+        if self.connections_cache_version == version:
+            connection_id_list, connection_name_list = self.connections_cache
+            return connection_id_list[:], connection_name_list[:]
+
         connection_id_list = []
         connection_name_list = []
-        input_id_list, input_name_list = self.get_input_ids_and_names()
-        for i in range(len(input_id_list)):
-            input_device = self.devices.get_device(input_id_list[i][0])
-            in_dev_ins = input_device.inputs[input_id_list[i][1]]
+        output_names = self.devices.output_names
+        for (device_id, input_id), input_name in \
+                self.devices.input_names.items():
+            input_device = self.devices.get_device(device_id)
+            in_dev_ins = input_device.inputs[input_id]
             if in_dev_ins is None:
                 continue
-            else:
-                out_device_id, out_device_port_id = in_dev_ins
-            out_device_name = self.names.get_name_string(out_device_id)
-            if out_device_port_id is None:
-                connection_name_list.append(out_device_name + ' - ' +
-                                            input_name_list[i])
-                connection_id_list.append(((out_device_id, out_device_port_id),
-                                           input_id_list[i]))
-            else:
-                out_device_port_name = self.names.get_name_string(
-                    out_device_port_id)
-                connection_name_list.append(out_device_name + '.' +
-                                            out_device_port_name + ' - ' +
-                                            input_name_list[i])
-                connection_id_list.append(((out_device_id, None),
-                                           input_id_list[i]))
-        return connection_id_list, connection_name_list
+            out_device_id = in_dev_ins[0]
+            connection_name_list.append(output_names[in_dev_ins] + ' - ' +
+                                        input_name)
+            connection_id_list.append(((out_device_id, None),
+                                       (device_id, input_id)))
+
+        self.connections_cache = (connection_id_list, connection_name_list)
+        self.connections_cache_version = version
+        return connection_id_list[:], connection_name_list[:]
 
     def reset_monitors(self):
         """Clear the memory of all the monitors.
@@ -191,7 +255,86 @@ class Monitors:
         The list of stored signal levels for each monitor is deleted.
         """
         for device_id, output_id in self.monitors_dictionary:
-            self.monitors_dictionary[(device_id, output_id)] = []
+            self.monitors_dictionary[(device_id, output_id)] = \
+                self._new_trace([])
+        if self.probe_store is not None:
+            self.probe_store.reset()
+        if self.activity is not None:
+            self.activity.reset()
+
+    def enable_probe_all(self, memory_budget=16 * 2 ** 20, chunk_size=4096):
+        """Record every output in the network from now on.
+
+        The outputs present when this is called are recorded at every call
+        to record_signals, in a columnar store which spills to a temporary
+        file once it takes up more than memory_budget bytes.
+        """
+        self.disable_probe_all()
+        self.probe_outputs = []
+        for device in self.devices.devices_list:
+            for output_id in device.outputs:
+                self.probe_outputs.append((device.device_id, output_id))
+        self.probe_store = ProbeStore(self.probe_outputs, chunk_size,
+                                      memory_budget)
+        self._update_cone()
+
+    def disable_probe_all(self):
+        """Stop recording every output and discard the recorded signals."""
+        if self.probe_store is not None:
+            self.probe_store.close()
+        self.probe_store = None
+        self.probe_outputs = []
+        self._update_cone()
+
+    def get_probe_trace(self, device_id, output_id):
+        """Return the signal levels recorded for the output in probe-all mode.
+
+        Return None if probe-all mode is off or the output is not recorded.
+        """
+        if self.probe_store is None:
+            return None
+        return self.probe_store.get_trace(device_id, output_id)
+
+    def enable_activity(self):
+        """Accumulate switching activity statistics from now on.
+
+        Statistics are kept for every output present when this is called, and
+        updated at every call to record_signals.
+        """
+        self.activity = Activity(self.devices, self.network)
+        self._update_cone()
+
+    def disable_activity(self):
+        """Stop accumulating switching activity statistics."""
+        self.activity = None
+        self._update_cone()
+
+    def get_activity(self, device_id, output_id):
+        """Return the switching activity statistics of the specified output.
+
+        Return None if statistics are not being accumulated for the output.
+        """
+        if self.activity is None:
+            return None
+        return self.activity.get_statistics(device_id, output_id)
+
+    def display_activity(self):
+        """Display the switching activity statistics in the text console."""
+        if self.activity is None:
+            return
+        signal_names = [self.devices.get_signal_name(device_id, output_id)
+                        for device_id, output_id in self.activity.nets]
+        margin = max([len(name) for name in signal_names] + [6])
+        print("Signal" + (margin - 6) * " " +
+              ": toggles rising falling high")
+        for signal_name, (device_id, output_id) in zip(signal_names,
+                                                       self.activity.nets):
+            statistics = self.get_activity(device_id, output_id)
+            print((signal_name + (margin - len(signal_name)) * " ") + ": " +
+                  str(statistics["toggles"]).rjust(7) +
+                  str(statistics["rising"]).rjust(7) +
+                  str(statistics["falling"]).rjust(8) +
+                  ("%.2f" % statistics["high_fraction"]).rjust(5))
 
     def get_margin(self):
         """Return the length of the longest monitor's name.
@@ -210,6 +353,13 @@ class Monitors:
         else:
             return None
 
+    def get_trace_string(self, signal_list):
+        """Return a signal trace drawn as a string of characters."""
+        characters = {self.devices.HIGH: "-", self.devices.LOW: "_",
+                      self.devices.RISING: "/", self.devices.FALLING: "\\",
+                      self.devices.BLANK: " "}
+        return "".join([characters.get(signal, "") for signal in signal_list])
+
     def display_signals(self):
         """Display the signal trace(s) in the text console."""
         margin = self.get_margin()
@@ -218,15 +368,4 @@ class Monitors:
             name_length = len(monitor_name)
             signal_list = self.monitors_dictionary[(device_id, output_id)]
             print((monitor_name + (margin - name_length) * " "), end=": ")
-            for signal in signal_list:
-                if signal == self.devices.HIGH:
-                    print("-", end="")
-                if signal == self.devices.LOW:
-                    print("_", end="")
-                if signal == self.devices.RISING:
-                    print("/", end="")
-                if signal == self.devices.FALLING:
-                    print("\\", end="")
-                if signal == self.devices.BLANK:
-                    print(" ", end="")
-            print("\n", end="")
+            print(self.get_trace_string(signal_list))
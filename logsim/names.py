@@ -40,6 +40,7 @@ class Names:
     def __init__(self):
         """Initialise names list."""
         self.names = []
+        self.name_ids = {}  # {name_string: name_id} for fast lookups
         self.error_code_count = 0  # how many error codes have been declared
 
     def unique_error_codes(self, num_error_codes):
@@ -58,10 +59,7 @@ class Names:
         """
         if not isinstance(name_string, str):
             raise TypeError('argument should be a string')
-        for i in range(len(self.names)):
-            if self.names[i] == name_string:
-                return i
-        return None
+        return self.name_ids.get(name_string)
 
     def lookup(self, name_string_list):
         """Return a list of name IDs for each name string in name_string_list.
@@ -74,16 +72,14 @@ class Names:
             if not isinstance(name_string_list[i], str):
                 raise TypeError('elements of list must be strings ')
         output = []
-        for i in range(len(name_string_list)):
-            found = False
-            for j in range(len(self.names)):
-                # NB this works even when new string in list twice
-                if self.names[j] == name_string_list[i]:
-                    output.append(j)
-                    found = True
-            if found is False:
-                self.names.append(name_string_list[i])
-                output.append(len(self.names) - 1)
+        for name_string in name_string_list:
+            # NB this works even when new string in list twice
+            name_id = self.name_ids.get(name_string)
+            if name_id is None:
+                name_id = len(self.names)
+                self.names.append(name_string)
+                self.name_ids[name_string] = name_id
+            output.append(name_id)
         return output
 
     def get_name_string(self, name_id):
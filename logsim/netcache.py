@@ -0,0 +1,194 @@
+"""Cache parsed circuit definitions to speed up later launches.
+
+Used in the Logic Simulator project to avoid scanning and parsing the same
+definition file on every launch. Once a file has been parsed and built
+without errors, its netlist is stored in a cache file named by a hash of the
+file contents and of the simulator version. Later launches with the same
+contents build the network straight from the cached netlist. Imported files
+are cached in the same way, each under the hash of its own contents.
+
+Classes
+-------
+NetlistCache - stores and retrieves the netlists of definition files.
+"""
+import hashlib
+import os
+import pickle
+
+from netlist import Netlist
+from scanner import Scanner
+from parse import Parser
+from imports import ImportResolver
+
+
+class NetlistCache:
+    """Store and retrieve the netlists of definition files.
+
+    A cached netlist is found by the SHA-256 hash of the definition text and
+    of the simulator version, so it is rebuilt whenever either changes.
+    Cache files which cannot be read or written are ignored.
+
+    The cache files are kept in ~/.cache/logsim, or in the directory named
+    by the LOGSIM_CACHE_DIR environment variable if it is set.
+
+    Parameters
+    ----------
+    cache_directory: directory holding the cache files, or None for the
+                     default directory.
+    enabled: if False, nothing is read from or written to the cache.
+
+    Public methods
+    --------------
+    get_key(self, text): Returns the cache key of a definition.
+
+    load(self, text, names): Returns the cached netlist of a definition, or
+                             None if it is not cached.
+
+    save(self, text, netlist, names): Stores the netlist of a definition.
+
+    build_network(self, path, names, devices, network, monitors): Builds the
+                                 network in a definition file, from the
+                                 cache if possible.
+
+    Private methods
+    ---------------
+    _get_path(self, text): Returns the path of the cache file of a
+                           definition.
+
+    _discard_devices(self, devices, network, monitors, device_ids): Removes
+                                 the devices made since device_ids were
+                                 present, with their monitors.
+    """
+
+    # Increased whenever the format of the cached netlists changes
+    FORMAT_VERSION = 2
+
+    # Modules whose behaviour decides the contents of a netlist
+    SIMULATOR_MODULES = ["scanner.py", "parse.py", "netlist.py",
+                         "imports.py", "devices.py", "network.py",
+                         "monitors.py"]
+
+    def __init__(self, cache_directory=None, enabled=True):
+        """Initialise the cache directory and the simulator version."""
+        if cache_directory is None:
+            cache_directory = os.environ.get("LOGSIM_CACHE_DIR")
+        if not cache_directory:
+            cache_directory = os.path.join(os.path.expanduser("~"), ".cache",
+                                           "logsim")
+        self.cache_directory = cache_directory
+        self.enabled = enabled
+
+        # The linked netlist of the network last built, and the paths of the
+        # files it imports
+        self.flat_netlist = None
+        self.imported_paths = set()
+
+        version_hash = hashlib.sha256(str(self.FORMAT_VERSION).encode())
+        module_directory = os.path.dirname(os.path.abspath(__file__))
+        for module in self.SIMULATOR_MODULES:
+            with open(os.path.join(module_directory, module), "rb") as source:
+                version_hash.update(source.read())
+        self.simulator_version = version_hash.digest()
+
+    def get_key(self, text):
+        """Return the cache key of a definition."""
+        key_hash = hashlib.sha256(self.simulator_version)
+        key_hash.update(text.encode("utf-8", "surrogatepass"))
+        return key_hash.hexdigest()
+
+    def _get_path(self, text):
+        """Return the path of the cache file of a definition."""
+        return os.path.join(self.cache_directory,
+                            self.get_key(text) + ".pickle")
+
+    def load(self, text, names):
+        """Return the cached netlist of a definition, or None."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._get_path(text), "rb") as cache_file:
+                tables = pickle.load(cache_file)
+            return Netlist.deserialise(tables, names)
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError,
+                TypeError, ValueError):
+            return None
+
+    def save(self, text, netlist, names):
+        """Store the netlist of a definition.
+
+        The file is written under a temporary name and then renamed, so other
+        launches never read a partly written cache file.
+        """
+        if not self.enabled:
+            return
+        path = self._get_path(text)
+        temporary_path = path + "." + str(os.getpid())
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            with open(temporary_path, "wb") as cache_file:
+                pickle.dump(netlist.serialise(names), cache_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except OSError:
+            pass
+
+    def build_network(self, path, names, devices, network, monitors):
+        """Build the network in the definition file at path.
+
+        The cached netlist is used if there is one and it builds without
+        errors. Otherwise the file is parsed, printing any errors, and its
+        netlist is cached if it has no errors. Return True if the network
+        was built without errors, in which case its linked netlist is kept
+        as flat_netlist. The paths of the files it imports are kept as
+        imported_paths. Raise FileNotFoundError if the file is missing.
+        """
+        with open(path, "r") as definition_file:
+            text = definition_file.read()
+
+        self.flat_netlist = None
+        resolver = ImportResolver(names, self)
+        self.imported_paths = resolver.paths
+        netlist = self.load(text, names)
+        if netlist is not None:
+            netlist = resolver.link(netlist, path)[0]
+        # Only netlists without errors are cached, but an imported file may
+        # have changed so that the netlist no longer builds, or leaves inputs
+        # unconnected. The file is then parsed again below to report the
+        # errors.
+        if netlist is not None:
+            device_ids = set(devices.devices_dictionary)
+            if (netlist.build_devices(devices) is None
+                    and netlist.build_connections(network) is None
+                    and netlist.build_monitors(monitors) is None
+                    and not (netlist.connections_complete
+                             and not network.check_network())):
+                self.flat_netlist = netlist
+                return True
+            self._discard_devices(devices, network, monitors, device_ids)
+
+        scanner = Scanner.from_string(text, names, path=path)
+        parser = Parser(names, devices, network, monitors, scanner,
+                        resolver=resolver)
+        if not parser.parse_network():
+            return False
+        self.save(text, parser.netlist, names)
+        self.flat_netlist = parser.flat_netlist
+        return True
+
+    def _discard_devices(self, devices, network, monitors, device_ids):
+        """Remove the devices which are not in device_ids.
+
+        Their monitors and the connections to them are removed as well, so a
+        network partly built from a netlist can be built again.
+        """
+        for (device_id, output_id) in list(monitors.monitors_dictionary):
+            if device_id not in device_ids:
+                monitors.remove_monitor(device_id, output_id)
+        for device in devices.devices_list:
+            for input_id, connection in device.inputs.items():
+                if connection is not None and connection[0] not in device_ids:
+                    device.inputs[input_id] = None
+        for device_id in list(devices.devices_dictionary):
+            if device_id not in device_ids:
+                devices.remove_device(device_id)
+        network.version += 1
@@ -0,0 +1,235 @@
+"""Store a parsed circuit definition before the logic network is built.
+
+Used in the Logic Simulator project as an intermediate representation of the
+definition file: the parser records every device, connection and monitor
+statement in a Netlist, which is then built into the logic network in one
+pass. The same Netlist can be reused by exporters, caches and other
+simulation engines without parsing the file again.
+
+Classes
+-------
+Netlist - stores the import, device, connection and monitor tables of a
+          circuit.
+"""
+
+from scanner import Symbol
+
+
+class Netlist:
+    """Store the import, device, connection and monitor tables of a circuit.
+
+    Imported files are not held in the tables, only the rows of the IMPORT
+    statements, so the netlist only depends on the text of its own file.
+    The statements of imported files are added by add_netlist when the
+    netlist is linked (see imports.ImportResolver).
+
+    Each row of a table holds the scanner.Symbol() instances of one
+    statement, so that errors found while building the network can be
+    reported at the right place in the definition file. Symbols which are
+    absent from a statement are empty Symbol() instances, whose id is None.
+
+    Parameters
+    ----------
+    No parameters.
+
+    Public methods
+    --------------
+    add_import(self, path_symbol, namespace_symbol): Adds an import
+                                          statement to the table.
+
+    add_device(self, name_symbol, type_symbol, parameter_symbol): Adds a
+                                          device statement to the table.
+
+    add_connection(self, output_device_symbol, output_symbol,
+                   input_device_symbol, input_symbol): Adds a connection
+                                          statement to the table.
+
+    add_monitor(self, device_symbol, output_symbol): Adds a monitor
+                                          statement to the table.
+
+    add_netlist(self, netlist, names, namespace_id=None): Adds every
+                                          statement of another netlist,
+                                          with its device names in a
+                                          namespace.
+
+    build_devices(self, devices): Makes every device in the table.
+
+    build_connections(self, network): Makes every connection in the table.
+
+    build_monitors(self, monitors): Makes every monitor in the table.
+
+    serialise(self, names): Returns the tables with names as strings.
+
+    deserialise(cls, tables, names): Returns the Netlist of tables returned
+                                     by serialise.
+    """
+
+    def __init__(self):
+        """Initialise empty tables."""
+        # [(path_symbol, namespace_symbol)...]
+        self.imports = []
+        # [(name_symbol, type_symbol, parameter_symbol)...]
+        self.devices = []
+        # [(output_device_symbol, output_symbol,
+        #   input_device_symbol, input_symbol)...]
+        self.connections = []
+        # [(device_symbol, output_symbol)...]
+        self.monitors = []
+        # True once the whole CONNECTIONS block has been recorded
+        self.connections_complete = False
+
+    def add_import(self, path_symbol, namespace_symbol):
+        """Add an import statement to the import table."""
+        self.imports.append((path_symbol, namespace_symbol))
+
+    def add_device(self, name_symbol, type_symbol, parameter_symbol):
+        """Add a device statement to the device table."""
+        self.devices.append((name_symbol, type_symbol, parameter_symbol))
+
+    def add_connection(self, output_device_symbol, output_symbol,
+                       input_device_symbol, input_symbol):
+        """Add a connection statement to the connection table."""
+        self.connections.append((output_device_symbol, output_symbol,
+                                 input_device_symbol, input_symbol))
+
+    def add_monitor(self, device_symbol, output_symbol):
+        """Add a monitor statement to the monitor table."""
+        self.monitors.append((device_symbol, output_symbol))
+
+    def add_netlist(self, netlist, names, namespace_id=None):
+        """Add every device, connection and monitor of another netlist.
+
+        If namespace_id is given, each device name is put in the namespace,
+        so device G becomes namespace.G, and the symbols lose their
+        locations as they belong to a different file. The import table of
+        the other netlist is not added.
+        """
+        if namespace_id is None:
+            self.devices.extend(netlist.devices)
+            self.connections.extend(netlist.connections)
+            self.monitors.extend(netlist.monitors)
+            return
+
+        prefix = names.get_name_string(namespace_id) + "."
+        get_name_string = names.get_name_string
+        lookup = names.lookup
+
+        def rename(symbol):
+            return Symbol(symbol.type, lookup(
+                [prefix + get_name_string(symbol.id)])[0])
+
+        def relocate(symbol):
+            return Symbol(symbol.type, symbol.id)
+
+        for name_symbol, type_symbol, parameter_symbol in netlist.devices:
+            self.devices.append((rename(name_symbol), relocate(type_symbol),
+                                 relocate(parameter_symbol)))
+        for (output_device_symbol, output_symbol, input_device_symbol,
+             input_symbol) in netlist.connections:
+            self.connections.append((rename(output_device_symbol),
+                                     relocate(output_symbol),
+                                     rename(input_device_symbol),
+                                     relocate(input_symbol)))
+        for device_symbol, output_symbol in netlist.monitors:
+            self.monitors.append((rename(device_symbol),
+                                  relocate(output_symbol)))
+
+    def build_devices(self, devices):
+        """Make every device in the device table.
+
+        Stop at the first error. Return None if successful, or the row of the
+        failed statement and the error code if not.
+        """
+        make_device = devices.make_device
+        for row in self.devices:
+            name_symbol, type_symbol, parameter_symbol = row
+            error_type = make_device(name_symbol.id, type_symbol.id,
+                                     device_property=parameter_symbol.id)
+            if error_type != devices.NO_ERROR:
+                return row, error_type
+        return None
+
+    def build_connections(self, network):
+        """Make every connection in the connection table.
+
+        Stop at the first error. Return None if successful, or the row of the
+        failed statement and the error code if not.
+        """
+        make_connection = network.make_connection
+        for row in self.connections:
+            (output_device_symbol, output_symbol,
+             input_device_symbol, input_symbol) = row
+            error_type = make_connection(output_device_symbol.id,
+                                         output_symbol.id,
+                                         input_device_symbol.id,
+                                         input_symbol.id)
+            if error_type != network.NO_ERROR:
+                return row, error_type
+        return None
+
+    def build_monitors(self, monitors):
+        """Make every monitor in the monitor table.
+
+        Stop at the first error. Return None if successful, or the row of the
+        failed statement and the error code if not.
+        """
+        make_monitor = monitors.make_monitor
+        for row in self.monitors:
+            device_symbol, output_symbol = row
+            error_type = make_monitor(device_symbol.id, output_symbol.id)
+            if error_type != monitors.NO_ERROR:
+                return row, error_type
+        return None
+
+    def serialise(self, names):
+        """Return the tables with every name ID replaced by its string.
+
+        The result only holds tuples, strings, numbers and None, so it can be
+        stored and read back into a different names.Names() instance. Symbol
+        locations are not kept.
+        """
+        get_name_string = names.get_name_string
+
+        def name(symbol):
+            if symbol.id is None:
+                return None
+            return get_name_string(symbol.id)
+
+        return {
+            "imports": tuple((path_symbol.id, name(namespace_symbol)) for
+                             path_symbol, namespace_symbol in self.imports),
+            "devices": tuple((name(name_symbol), name(type_symbol),
+                              parameter_symbol.id) for
+                             name_symbol, type_symbol, parameter_symbol in
+                             self.devices),
+            "connections": tuple(tuple(name(symbol) for symbol in row)
+                                 for row in self.connections),
+            "monitors": tuple(tuple(name(symbol) for symbol in row)
+                              for row in self.monitors),
+            "connections_complete": self.connections_complete,
+        }
+
+    @classmethod
+    def deserialise(cls, tables, names):
+        """Return the Netlist of tables returned by serialise."""
+        lookup = names.lookup  # names are added if not already present
+
+        def symbol(name_string):
+            if name_string is None:
+                return Symbol()
+            return Symbol(id=lookup([name_string])[0])
+
+        netlist = cls()
+        for path, namespace_string in tables["imports"]:
+            netlist.add_import(Symbol(id=path), symbol(namespace_string))
+        for name_string, type_string, parameter in tables["devices"]:
+            netlist.add_device(symbol(name_string), symbol(type_string),
+                               Symbol(id=parameter))
+        for row in tables["connections"]:
+            netlist.add_connection(*[symbol(name_string)
+                                     for name_string in row])
+        for row in tables["monitors"]:
+            netlist.add_monitor(*[symbol(name_string)
+                                  for name_string in row])
+        netlist.connections_complete = tables["connections_complete"]
+        return netlist
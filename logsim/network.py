@@ -6,6 +6,7 @@ Classes
 --------
 Network - builds and executes the network.
 """
+from optimise import Optimiser
 
 
 class Network:
@@ -56,8 +57,25 @@ class Network:
     update_clocks(self): If it is time to do so, sets clock signals to RISING
                          or FALLING.
 
+    set_observed_outputs(self, outputs): Executes only the devices which the
+                                         given outputs depend on.
+
+    get_cone(self): Returns the IDs of the devices which the observed
+                    outputs depend on.
+
+    specialise(self): Returns the devices to execute, and the gates with
+                      fixed outputs, for the current switch states.
+
     execute_network(self): Executes all the devices in the network for one
                            simulation cycle.
+
+    Private methods
+    ---------------
+    _specialise(self): Returns the devices to execute and the fixed gate
+                       outputs for the current switch states.
+
+    _get_fixed_signal(self, device, fixed): Returns the level a gate settles
+                                            to if its inputs decide it.
     """
 
     def __init__(self, names, devices):
@@ -77,6 +95,24 @@ class Network:
         ] = self.names.unique_error_codes(8)
         self.steady_state = True  # for checking if signals have settled
 
+        # Incremented whenever a connection is made or deleted
+        self.version = 0
+
+        # Outputs whose fan-in cone is executed, or None to execute every
+        # device, and the cone with the (devices.version, version) it was
+        # found at
+        self.observed_outputs = None
+        self.cone = None
+        self.cone_version = None
+
+        # Specialisations of the network for the most recent vectors of
+        # switch states, {switch states: (device lists, fixed outputs)},
+        # discarded whenever a device, connection or the cone changes
+        self.specialisations = {}
+        self.specialisations_version = None
+        self.max_specialisations = 16
+        self.switches = []
+
     def get_connected_output(self, device_id, input_id):
         """Return the output connected to the given input.
 
@@ -162,6 +198,8 @@ class Network:
         else:  # first_port_id not a valid input or output port
             error_type = self.PORT_ABSENT
 
+        if error_type == self.NO_ERROR:
+            self.version += 1
         return error_type
 
     def delete_connection(self, device_id, port_id):
@@ -171,6 +209,7 @@ class Network:
             error_type = self.DEVICE_ABSENT
         else:
             device.inputs[port_id] = None
+            self.version += 1
             error_type = self.NO_ERROR
         return error_type
 
@@ -373,20 +412,178 @@ class Network:
                     device.outputs[None] = self.devices.RISING
             device.clock_counter += 1
 
+    def set_observed_outputs(self, outputs):
+        """Execute only the devices which the given outputs depend on.
+
+        outputs is a list of (device_id, output_id) tuples, or None to execute
+        every device. Devices outside the cone keep their signals, and D-types
+        their memory, until they are in the cone again.
+        """
+        if outputs is None:
+            self.observed_outputs = None
+        else:
+            self.observed_outputs = list(outputs)
+        self.cone_version = None
+        self.specialisations_version = None
+
+    def get_cone(self):
+        """Return the set of IDs of the devices the observed outputs depend on.
+
+        The cone is found by following connections back from the observed
+        outputs, through gates and D-types alike, and is found again whenever
+        a device or connection changes. Return None if every device is
+        executed.
+        """
+        if self.observed_outputs is None:
+            return None
+        version = (self.devices.version, self.version)
+        if self.cone_version != version:
+            cone = set()
+            stack = [device_id for device_id, output_id
+                     in self.observed_outputs]
+            while stack:
+                device_id = stack.pop()
+                device = self.devices.get_device(device_id)
+                if device_id in cone or device is None:
+                    continue
+                cone.add(device_id)
+                for connection in device.inputs.values():
+                    if connection is not None:
+                        stack.append(connection[0])
+            self.cone = cone
+            self.cone_version = version
+        return self.cone
+
+    def specialise(self):
+        """Return the devices to execute for the current switch states.
+
+        Switch states are constant while the network runs, so they are
+        propagated through the gates, and a gate whose output they decide is
+        not executed: its output is only moved towards the fixed level. This
+        can change when an edge or glitch arrives, so gates leading to the
+        clock, set or clear inputs of D-types are always executed (see
+        optimise.Optimiser.get_timed_gates). Only devices in the cone of the
+        observed outputs are included. Return a dictionary {device_kind:
+        [device_id, ...]} of the devices to execute and a list
+        [(device.outputs, signal), ...] of the fixed gate outputs. The result
+        is cached for each vector of switch states.
+        """
+        devices = self.devices
+        version = (devices.version, self.version)
+        if self.specialisations_version != version:
+            self.specialisations = {}
+            self.specialisations_version = version
+            self.switches = [devices.get_device(device_id) for device_id
+                             in devices.find_devices(devices.SWITCH)]
+
+        switch_states = tuple(device.switch_state for device in self.switches)
+        specialisation = self.specialisations.get(switch_states)
+        if specialisation is None:
+            if len(self.specialisations) >= self.max_specialisations:
+                # Discard the oldest specialisation
+                del self.specialisations[next(iter(self.specialisations))]
+            specialisation = self._specialise()
+            self.specialisations[switch_states] = specialisation
+        return specialisation
+
+    def _specialise(self):
+        """Return the devices to execute and the fixed gate outputs."""
+        devices = self.devices
+        gate_types = set(devices.gate_types)
+        fixed = {device.device_id: device.switch_state
+                 for device in self.switches}
+        timed_gates = Optimiser(self.names, devices, self,
+                                None).get_timed_gates()
+
+        consumers = {}  # {device_id: [gate driven by the device, ...]}
+        for device in devices.devices_list:
+            if device.device_kind in gate_types:
+                for connection in device.inputs.values():
+                    if connection is not None:
+                        consumers.setdefault(connection[0], []).append(device)
+
+        stack = list(fixed)
+        while stack:
+            for device in consumers.get(stack.pop(), []):
+                if (device.device_id in fixed
+                        or device.device_id in timed_gates):
+                    continue
+                signal = self._get_fixed_signal(device, fixed)
+                if signal is not None:
+                    fixed[device.device_id] = signal
+                    stack.append(device.device_id)
+
+        cone = self.get_cone()
+        device_lists = {}
+        fixed_outputs = []
+        for device in devices.devices_list:
+            if cone is not None and device.device_id not in cone:
+                continue
+            if (device.device_kind in gate_types
+                    and device.device_id in fixed):
+                fixed_outputs.append((device.outputs,
+                                      fixed[device.device_id]))
+            else:
+                device_lists.setdefault(device.device_kind, []).append(
+                    device.device_id)
+        return device_lists, fixed_outputs
+
+    def _get_fixed_signal(self, device, fixed):
+        """Return the level the gate settles to, or None if it is not fixed.
+
+        fixed is a dictionary {device_id: signal} of the devices whose output
+        is known. A gate with an unconnected input is never fixed, so that it
+        is still executed and reported.
+        """
+        devices = self.devices
+        signals = []
+        for connection in device.inputs.values():
+            if connection is None:
+                return None
+            signals.append(fixed.get(connection[0]))
+
+        if device.device_kind == devices.XOR:
+            if None in signals:
+                return None
+            if signals[0] == signals[1]:
+                return devices.LOW
+            return devices.HIGH
+        if device.device_kind == devices.NOT:
+            if signals[0] is None:
+                return None
+            return self.invert_signal(signals[0])
+
+        # If all its inputs are x, then the output is y, else it is the
+        # inverse of y, as in execute_gate
+        x, y = {devices.AND: (devices.HIGH, devices.HIGH),
+                devices.OR: (devices.LOW, devices.LOW),
+                devices.NAND: (devices.HIGH, devices.LOW),
+                devices.NOR: (devices.LOW, devices.HIGH)}[device.device_kind]
+        for signal in signals:
+            if signal is not None and signal != x:
+                return self.invert_signal(y)
+        if None in signals:
+            return None
+        return y
+
     def execute_network(self):
         """Execute all the devices in the network for one simulation cycle.
 
-        Return True if successful and the network does not oscillate.
+        The network is specialised for the current switch states, and only
+        the devices in the cone of the observed outputs are executed, if any
+        are set. Return True if successful and the network does not
+        oscillate.
         """
-        clock_devices = self.devices.find_devices(self.devices.CLOCK)
-        switch_devices = self.devices.find_devices(self.devices.SWITCH)
-        d_type_devices = self.devices.find_devices(self.devices.D_TYPE)
-        and_devices = self.devices.find_devices(self.devices.AND)
-        or_devices = self.devices.find_devices(self.devices.OR)
-        nand_devices = self.devices.find_devices(self.devices.NAND)
-        nor_devices = self.devices.find_devices(self.devices.NOR)
-        xor_devices = self.devices.find_devices(self.devices.XOR)
-        not_devices = self.devices.find_devices(self.devices.NOT)
+        device_lists, fixed_outputs = self.specialise()
+        clock_devices = device_lists.get(self.devices.CLOCK, [])
+        switch_devices = device_lists.get(self.devices.SWITCH, [])
+        d_type_devices = device_lists.get(self.devices.D_TYPE, [])
+        and_devices = device_lists.get(self.devices.AND, [])
+        or_devices = device_lists.get(self.devices.OR, [])
+        nand_devices = device_lists.get(self.devices.NAND, [])
+        nor_devices = device_lists.get(self.devices.NOR, [])
+        xor_devices = device_lists.get(self.devices.XOR, [])
+        not_devices = device_lists.get(self.devices.NOT, [])
 
         # This sets clock signals to RISING or FALLING, where necessary
         self.update_clocks()
@@ -411,6 +608,11 @@ class Network:
             for device_id in clock_devices:  # complete clock executions
                 if not self.execute_clock(device_id):
                     return False
+            for outputs, signal in fixed_outputs:  # update fixed gates
+                updated_signal = self.update_signal(outputs[None], signal)
+                if updated_signal is None:
+                    return False
+                outputs[None] = updated_signal
             for device_id in and_devices:  # execute AND gate devices
                 if not self.execute_gate(
                     device_id, self.devices.HIGH, self.devices.HIGH
@@ -0,0 +1,301 @@
+"""Simplify a logic network before it is simulated.
+
+Used in the Logic Simulator project to make large circuits quicker to
+simulate. Gates which compute the same signal as another gate are merged,
+double inversions and gates which only pass on a signal are bypassed, and
+gates which then drive no monitor or D-type are removed, so that fewer
+devices are executed in each simulation cycle.
+
+Classes
+-------
+Optimiser - simplifies the gates of a logic network.
+"""
+
+
+class Optimiser:
+    """Simplify the gates of a built logic network in place.
+
+    Switches, clocks, D-types and monitored gates are always kept, and the
+    settled value of every signal which is kept is unchanged. Moving the
+    inputs connected to a gate onto another output can make a signal change
+    an iteration earlier or later within a cycle, so this is never done for
+    gates which lead to the clock, set or clear input of a D-type, or to the
+    data input of a D-type clocked by another gate, or which are on, before
+    or after a feedback loop, as the time at which an edge or glitch arrives
+    matters there.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class, or None if only
+              get_timed_gates is used.
+
+    Public methods
+    --------------
+    optimise(self): Simplifies the network and returns a description of each
+                    change made.
+
+    get_timed_gates(self): Returns the IDs of the gates which must keep
+                           their timing.
+
+    Private methods
+    ---------------
+    _get_consumers(self): Returns the inputs connected to each output.
+
+    _get_key(self, device): Returns the gate kind and the outputs which
+                            determine the signal of a gate.
+
+    _reconnect(self, inputs, output): Connects the given inputs to another
+                                      output.
+
+    _merge_gates(self, changes, timed_gates): Merges gates which compute the
+                                              same signal.
+
+    _bypass_gates(self, changes, timed_gates): Bypasses double inversions
+                                         and gates which pass on a signal.
+
+    _remove_dead_gates(self, changes): Removes gates which drive no monitor
+                                       or D-type.
+    """
+
+    def __init__(self, names, devices, network, monitors):
+        """Initialise the network to be simplified."""
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+        self.gate_types = set(devices.gate_types)
+
+    def optimise(self):
+        """Simplify the network and return a list of the changes made.
+
+        Each change is described by a string naming the gate concerned.
+        """
+        changes = []
+        timed_gates = self.get_timed_gates()
+        # Merging or bypassing a gate can make the gates it drives equal
+        changed = True
+        while changed:
+            changed = self._merge_gates(changes, timed_gates)
+            if self._bypass_gates(changes, timed_gates):
+                changed = True
+        self._remove_dead_gates(changes)
+        return changes
+
+    def _get_consumers(self):
+        """Return the inputs connected to each output.
+
+        Return a dictionary {(device_id, output_id): [(device_id, input_id),
+        ...]}.
+        """
+        consumers = {}
+        for device in self.devices.devices_list:
+            for input_id, connection in device.inputs.items():
+                if connection is not None:
+                    consumers.setdefault(connection, []).append(
+                        (device.device_id, input_id))
+        return consumers
+
+    def _get_key(self, device):
+        """Return the gate kind and the outputs which determine its signal.
+
+        Gates with equal keys settle to the same signal. AND, OR, NAND and
+        NOR gates give the same signal whichever way round, and however many
+        times, an output is connected to them, so a NAND or NOR gate of one
+        signal has the key of a NOT gate, and an AND or OR gate of one signal
+        has the kind None, as it passes the signal on. Return None if the
+        gate has an unconnected input.
+        """
+        connections = list(device.inputs.values())
+        if None in connections:
+            return None
+        kind = device.device_kind
+        if kind == self.devices.XOR:
+            return (kind, tuple(sorted(connections)))
+        if kind == self.devices.NOT:
+            return (kind, tuple(connections))
+        connections = tuple(sorted(set(connections)))
+        if len(connections) == 1:
+            if kind in [self.devices.AND, self.devices.OR]:
+                return (None, connections)
+            return (self.devices.NOT, connections)
+        return (kind, connections)
+
+    def get_timed_gates(self):
+        """Return the set of IDs of the gates which must keep their timing."""
+        devices = self.devices
+        gates = {device.device_id: device for device in devices.devices_list
+                 if device.device_kind in self.gate_types}
+        consumers = self._get_consumers()
+
+        # Gates on or after a feedback loop are those left over when gates
+        # are taken in turn once all the gates driving them have been taken
+        pending = {}
+        for device_id, device in gates.items():
+            pending[device_id] = len(
+                [connection for connection in device.inputs.values()
+                 if connection is not None and connection[0] in gates])
+        ready = [device_id for device_id, count in pending.items()
+                 if count == 0]
+        while ready:
+            device_id = ready.pop()
+            for consumer_id, input_id in consumers.get((device_id, None), []):
+                if consumer_id in gates:
+                    pending[consumer_id] -= 1
+                    if pending[consumer_id] == 0:
+                        ready.append(consumer_id)
+        looped_gates = [device_id for device_id, count in pending.items()
+                        if count > 0]
+
+        # Every gate leading to a looped gate or a timed D-type input
+        stack = list(looped_gates)
+        clock_kinds = [devices.CLOCK, devices.SWITCH]
+        for device in devices.devices_list:
+            if device.device_kind != devices.D_TYPE:
+                continue
+            clock = device.inputs.get(devices.CLK_ID)
+            clocked_directly = (
+                clock is not None
+                and devices.get_device(clock[0]).device_kind in clock_kinds)
+            for input_id, connection in device.inputs.items():
+                if connection is None:
+                    continue
+                if input_id == devices.DATA_ID and clocked_directly:
+                    continue  # only sampled once the data has settled
+                stack.append(connection[0])
+
+        timed_gates = set()
+        while stack:
+            device_id = stack.pop()
+            if device_id in timed_gates or device_id not in gates:
+                continue
+            timed_gates.add(device_id)
+            for connection in gates[device_id].inputs.values():
+                if connection is not None:
+                    stack.append(connection[0])
+        return timed_gates
+
+    def _reconnect(self, inputs, output):
+        """Connect each of the inputs [(device_id, input_id), ...] to output.
+
+        output is a (device_id, output_id) tuple.
+        """
+        for device_id, input_id in inputs:
+            self.network.delete_connection(device_id, input_id)
+            self.network.make_connection(device_id, input_id, *output)
+
+    def _merge_gates(self, changes, timed_gates):
+        """Merge gates which compute the same signal as an earlier gate.
+
+        The inputs connected to a merged gate are connected to the gate it
+        is merged into instead. Monitored and timed gates are kept in
+        preference. Return True if any inputs were moved.
+        """
+        monitored = {device_id for (device_id, output_id)
+                     in self.monitors.monitors_dictionary}
+
+        def kept(device):
+            return (device.device_id in monitored
+                    or device.device_id in timed_gates)
+
+        consumers = self._get_consumers()
+        representatives = {}  # {key: device}
+        merged = False
+        for device in self.devices.devices_list:
+            if device.device_kind not in self.gate_types:
+                continue
+            key = self._get_key(device)
+            if key is None or key[0] is None:
+                continue
+            representative = representatives.setdefault(key, device)
+            if representative is device:
+                continue
+            if kept(device) and not kept(representative):
+                representatives[key] = device
+                device, representative = representative, device
+            if device.device_id in timed_gates:
+                continue
+            inputs = consumers.pop((device.device_id, None), [])
+            if not inputs:
+                continue
+            output = (representative.device_id, None)
+            self._reconnect(inputs, output)
+            consumers.setdefault(output, []).extend(inputs)
+            changes.append(
+                "Merged " + self.names.get_name_string(device.device_id)
+                + " into "
+                + self.names.get_name_string(representative.device_id)
+                + " (same inputs)")
+            merged = True
+        return merged
+
+    def _bypass_gates(self, changes, timed_gates):
+        """Bypass double inversions and gates which pass on a signal.
+
+        The inputs connected to a bypassed gate are connected to the signal
+        it settles to instead. Return True if any inputs were moved.
+        """
+        consumers = self._get_consumers()
+        bypassed = False
+        for device in self.devices.devices_list:
+            if (device.device_kind not in self.gate_types
+                    or device.device_id in timed_gates):
+                continue
+            key = self._get_key(device)
+            if key is None:
+                continue
+            kind, connections = key
+            if kind is None:
+                output = connections[0]
+                reason = "passes on "
+            elif kind == self.devices.NOT:
+                inverted = self.devices.get_device(connections[0][0])
+                if inverted.device_kind not in self.gate_types:
+                    continue
+                inverted_key = self._get_key(inverted)
+                if inverted_key is None or inverted_key[0] != kind:
+                    continue
+                output = inverted_key[1][0]
+                reason = "double inversion of "
+            else:
+                continue
+
+            inputs = consumers.pop((device.device_id, None), [])
+            if not inputs:
+                continue
+            self._reconnect(inputs, output)
+            consumers.setdefault(output, []).extend(inputs)
+            changes.append(
+                "Bypassed " + self.names.get_name_string(device.device_id)
+                + " (" + reason + self.devices.get_signal_name(*output) + ")")
+            bypassed = True
+        return bypassed
+
+    def _remove_dead_gates(self, changes):
+        """Remove the gates which lead to no monitor or D-type."""
+        devices = self.devices
+        stack = [device_id for (device_id, output_id)
+                 in self.monitors.monitors_dictionary]
+        stack.extend(device.device_id for device in devices.devices_list
+                     if device.device_kind not in self.gate_types)
+        live = set()
+        while stack:
+            device_id = stack.pop()
+            if device_id in live:
+                continue
+            live.add(device_id)
+            for connection in devices.get_device(device_id).inputs.values():
+                if connection is not None:
+                    stack.append(connection[0])
+
+        dead_ids = [device.device_id for device in devices.devices_list
+                    if device.device_id not in live]
+        for device_id in dead_ids:
+            devices.remove_device(device_id)
+            changes.append("Removed " + self.names.get_name_string(device_id)
+                           + " (drives no monitor or D-type)")
+        if dead_ids:
+            self.network.version += 1
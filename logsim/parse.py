@@ -10,6 +10,10 @@ Parser - parses the definition file and builds the logic network.
 """
 
 from scanner import Symbol
+from netlist import Netlist
+from devices import Devices
+from network import Network
+from monitors import Monitors
 
 
 class Parser:
@@ -17,9 +21,14 @@ class Parser:
 
     The parser deals with error handling. It analyses the syntactic and
     semantic correctness of the symbols it receives from the scanner, and
-    then builds the logic network. If there are errors in the definition file,
-    the parser detects this and tries to recover from it, giving helpful
-    error messages.
+    then builds the logic network. Statements are first recorded in a
+    netlist.Netlist(), available as the netlist attribute, which is built
+    into the network in one pass once the whole file has been parsed. The
+    netlist is linked with those of the files named in IMPORT statements
+    first, and the linked netlist is available as the flat_netlist
+    attribute. If
+    there are errors in the definition file, the parser detects this and
+    tries to recover from it, giving helpful error messages.
 
     Parameters
     ----------
@@ -28,6 +37,11 @@ class Parser:
     network: instance of the network.Network() class.
     monitors: instance of the monitors.Monitors() class.
     scanner: instance of the scanner.Scanner() class.
+    test: True to only check the syntax of the definition file.
+    resolver: instance of the imports.ImportResolver() class used to load
+              imported files, or None to use a new one.
+    imported: True if the file is imported by another file, so its inputs
+              may be left unconnected.
 
     Public methods
     --------------
@@ -35,15 +49,16 @@ class Parser:
 
     Private methods
     --------------
-    _copy_symbol(self): Returns a copy Symbol class instance of the
-                       current symbol.
-
     _inline_error_message(self, symbol = None): Calls to the scanner
                         to print an error message at the appropriate
                         location by providing the error symbol.
 
-    _display_syntax_error(self,error_id): Prints an error message for
-                                    syntax and parser errors.
+    _print_error(self, error_code, message, symbol=None, located=True):
+                        Prints an error message and records it in the
+                        diagnostics list.
+
+    _display_syntax_error(self,error_id, symbol=None): Prints an error
+                                    message for syntax and parser errors.
 
     _display_devices_error(self,error_id, device_name_symbol,
                         device_type_symbol, device_parameter_symbol):
@@ -57,17 +72,65 @@ class Parser:
                     monitor_output_symbol): Prints an error message
                                             for 'monitors' errors.
 
+    _display_import_error(self, error_id, path_symbol): Prints an error
+                                            message for import errors.
+
     _next_symbol(self): Gets next symbol from scanner.
 
     _next_scan_start(self, in_block = True): Reaches a safe symbol to
                             resume parsing after an error occurs.
 
+    _parse_import_statement(self): Parses one 'IMPORT' statement.
+
+    _parse_bus_range(self): Returns the indices in a bus range.
+
+    _parse_device_names(self): Returns the symbols of a device name, which
+                               may be in an imported namespace, or of a
+                               range of bus elements.
+
+    _get_bus_symbols(self, device_symbol, indices): Returns a symbol for
+                               each given element of a bus.
+
+    _parse_port(self): Returns the signal names of one port in a circuit's
+                       port list.
+
+    _parse_circuit(self): Parses a 'CIRCUIT' template and checks it once.
+
+    _check_circuit(self, netlist, ports): Checks a circuit template by
+                                          building it into a separate
+                                          network.
+
+    _parse_device_statement(self): Parses one statement of the 'DEVICES'
+                                   block.
+
+    _add_devices(self, device_name_symbols, device_type_symbol,
+                 device_parameter_symbol): Records the devices of one
+                                           device statement.
+
     _parse_devices(self): Parses the 'DEVICES' block of definition file.
 
+    _parse_connection_statement(self): Parses one statement of the
+                                       'CONNECTIONS' block.
+
+    _add_connections(self, output_device_symbols, output_symbol,
+                     input_device_symbols, input_symbol): Records the
+                            connections of one connection statement.
+
+    _is_port(self, device_symbol, port_symbol): Returns True if the signal
+                                   may be connected from outside its
+                                   circuit instance.
+
     _parse_connections(self): Parses the 'CONNECTIONS' block of
                              definition file.
 
+    _parse_monitor_statement(self): Parses one statement of the 'MONITORS'
+                                    block.
+
     _parse_monitor(self): Parses the 'MONITORS' block of definition file.
+
+    _get_resolver(self): Returns the resolver of imported files.
+
+    _build_network(self): Builds the logic network from the netlist.
     """
 
     def __init__(
@@ -77,7 +140,9 @@ class Parser:
         network,
         monitors,
         scanner,
-        test=False
+        test=False,
+        resolver=None,
+        imported=False
     ):
         """Initialise parser errors and constants."""
         self.names = names
@@ -86,8 +151,18 @@ class Parser:
         self.monitors = monitors
         self.scanner = scanner
         self.test = test
+        self.resolver = resolver
+        self.imported = imported
 
         self.current_symbol = None
+        # Statements are recorded here and built into the network at the end
+        self.netlist = Netlist()
+        self.flat_netlist = self.netlist  # with imported statements added
+        # {name ID: set of port strings, or None if any signal may be
+        #  connected} of imported namespaces and circuit instances
+        self.namespaces = {}
+        # {name ID: (netlist, ports, namespaces)} of circuit templates
+        self.circuits = {}
         self.parse_completion = [False, False, False]
 
         self.ERROR_ID = [
@@ -110,113 +185,212 @@ class Parser:
             self.NO_MAIN_END,
             self.INVALID_INPUTLABEL,
             self.INCOMPLETE_NETWORK,
-            self.UNTERMINATED_COMMENT
-        ] = self.names.unique_error_codes(20)
+            self.UNTERMINATED_COMMENT,
+            self.NO_PATH,
+            self.INVALID_NAMESPACE,
+            self.NAMESPACE_PRESENT,
+            self.NO_BRACKET,
+            self.BAD_WIDTH,
+            self.WIDTH_MISMATCH,
+            self.INVALID_CIRCUITNAME,
+            self.NO_PAREN,
+            self.CIRCUIT_QUALIFIER,
+            self.CIRCUIT_PORT,
+            self.NOT_A_PORT
+        ] = self.names.unique_error_codes(31)
 
         self.error_count = 0
-
-    def _copy_symbol(self):
-        """Return a copy Symbol class instance of the current symbol."""
-        symbol = Symbol()
-        symbol.type = int(self.current_symbol.type)
-        symbol.id = int(self.current_symbol.id)
-        symbol.line = int(self.current_symbol.line)
-        symbol.position_in_line = int(self.current_symbol.position_in_line)
-        return symbol
+        # [(line, column, error_code, message)...] of every error found, with
+        # lines and columns counted from 1, or None if the error has no
+        # location
+        self.diagnostics = []
 
     def _inline_error_message(self, symbol=None):
         """Call scanner to print an error message at the right location."""
         if not symbol:
-            self.scanner.print_location(self.current_symbol)
-        else:
+            symbol = self.current_symbol
+        if symbol.line is not None:  # imported symbols have no location
             self.scanner.print_location(symbol)
 
-    def _display_syntax_error(self, error_id):
-        """Return error messages for syntax and parser errors."""
+    def _print_error(self, error_code, message, symbol=None, located=True):
+        """Print an error message and record it as a diagnostic.
+
+        symbol is where the error is, the current symbol if not given, and
+        located is False for errors without a location.
+        """
+        print(message)
+        line = None
+        column = None
+        if located:
+            if symbol is None:
+                symbol = self.current_symbol
+            if symbol is not None and symbol.line is not None:
+                line = symbol.line + 1
+                # Positions are counted from 1 on the first line only
+                column = symbol.position_in_line
+                if symbol.line != 0:
+                    column += 1
+        self.diagnostics.append((line, column, error_code,
+                                 message.split(":", 1)[1].strip()))
+
+    def _display_syntax_error(self, error_id, symbol=None):
+        """Return error messages for syntax and parser errors.
+
+        symbol is where the error is, if not at the current symbol.
+        """
         self.error_count += 1
         print("Errors found so far :", self.error_count)
         advance = False  # True if _next_symbol needs to be called
         restart = True   # True if _next_scan_start needs to be called
         in_block = True  # Parameter for _next_scan_start
         if error_id == self.EXTRA_SEMICOLON:
-            print("ERROR: Extra semicolons added")
+            self._print_error("EXTRA_SEMICOLON",
+                              "ERROR: Extra semicolons added")
             restart = False
 
         elif error_id == self.EXTRA_DEVICES:
-            print("ERROR : DEVICES already called")
+            self._print_error("EXTRA_DEVICES",
+                              "ERROR : DEVICES already called")
             advance = True
             in_block = False
 
         elif error_id == self.EXTRA_CONNECT:
-            print("ERROR : CONNECTIONS already Called")
+            self._print_error("EXTRA_CONNECT",
+                              "ERROR : CONNECTIONS already Called")
             advance = True
             in_block = False
 
         elif error_id == self.EXTRA_MONITOR:
-            print("ERROR : MONITOR already called")
+            self._print_error("EXTRA_MONITOR",
+                              "ERROR : MONITOR already called")
             advance = True
             in_block = False
 
         elif error_id == self.NO_NUMBER:
-            print("ERROR : Not a number")
+            self._print_error("NO_NUMBER", "ERROR : Not a number")
 
         elif error_id == self.NO_SEMICOLON:
-            print("ERROR : Expected a semicolon here")
+            self._print_error("NO_SEMICOLON",
+                              "ERROR : Expected a semicolon here")
 
         elif error_id == self.INVALID_DEVICENAME:
-            print("ERROR : Not a valid device name")
+            self._print_error("INVALID_DEVICENAME",
+                              "ERROR : Not a valid device name")
 
         elif error_id == self.NO_EQUALS:
-            print("ERROR : Expected an equals sign here")
+            self._print_error("NO_EQUALS",
+                              "ERROR : Expected an equals sign here")
 
         elif error_id == self.NO_END:
-            print("ERROR : Expected an 'END' statement")
+            self._print_error("NO_END", "ERROR : Expected an 'END' statement")
             restart = False
 
         elif error_id == self.INVALID_DEVICETYPE:
-            print("ERROR : Not a valid supported device type")
+            self._print_error("INVALID_DEVICETYPE",
+                              "ERROR : Not a valid supported device type")
 
         elif error_id == self.INVALID_OUTPUTLABEL:
-            print("ERROR : Not a valid type of output label")
+            self._print_error("INVALID_OUTPUTLABEL",
+                              "ERROR : Not a valid type of output label")
 
         elif error_id == self.NO_DOT:
-            print("ERROR : Expected a dot here")
+            self._print_error("NO_DOT", "ERROR : Expected a dot here")
 
         elif error_id == self.NO_DASH:
-            print("ERROR : Expected a dash here")
+            self._print_error("NO_DASH", "ERROR : Expected a dash here")
 
         elif error_id == self.EXPECT_DEVICES:
-            print("ERROR : Expected a 'DEVICES' statement here")
+            self._print_error("EXPECT_DEVICES",
+                              "ERROR : Expected a 'DEVICES' statement here")
             in_block = False
 
         elif error_id == self.EXPECT_CONNECT:
-            print("ERROR : Expected a 'CONNECTIONS' statement here")
+            self._print_error("EXPECT_CONNECT",
+                              "ERROR : Expected a 'CONNECTIONS' "
+                              "statement here")
             in_block = False
 
         elif error_id == self.EXPECT_MONITOR:
-            print("ERROR : Expected a 'MONITOR' statement here")
+            self._print_error("EXPECT_MONITOR",
+                              "ERROR : Expected a 'MONITOR' statement here")
             in_block = False
 
         elif error_id == self.NO_MAIN_END:
-            print("ERROR : Expected a 'MAIN_END' statement here")
+            self._print_error("NO_MAIN_END",
+                              "ERROR : Expected a 'MAIN_END' statement here")
             in_block = False
 
         elif error_id == self.INVALID_INPUTLABEL:
-            print("ERROR : Invalid input label")
+            self._print_error("INVALID_INPUTLABEL",
+                              "ERROR : Invalid input label")
 
         elif error_id == self.UNTERMINATED_COMMENT:
-            print("ERROR : Unterminated Comment present")
+            self._print_error("UNTERMINATED_COMMENT",
+                              "ERROR : Unterminated Comment present")
+            restart = False
+
+        elif error_id == self.NO_PATH:
+            self._print_error("NO_PATH", "ERROR : Expected a file path in "
+                              "double quotes here")
+
+        elif error_id == self.INVALID_NAMESPACE:
+            self._print_error("INVALID_NAMESPACE",
+                              "ERROR : Not a valid namespace name")
+
+        elif error_id == self.NAMESPACE_PRESENT:
+            self._print_error("NAMESPACE_PRESENT",
+                              "ERROR : Namespace already imported")
+
+        elif error_id == self.NO_BRACKET:
+            self._print_error("NO_BRACKET",
+                              "ERROR : Expected a closing bracket here")
+
+        elif error_id == self.BAD_WIDTH:
+            self._print_error("BAD_WIDTH",
+                              "ERROR : Bus width must be at least 1")
+
+        elif error_id == self.WIDTH_MISMATCH:
+            self._print_error("WIDTH_MISMATCH",
+                              "ERROR : Bus widths do not match", symbol)
+
+        elif error_id == self.INVALID_CIRCUITNAME:
+            self._print_error("INVALID_CIRCUITNAME",
+                              "ERROR : Not a valid circuit name", symbol)
+            restart = False
+
+        elif error_id == self.NO_PAREN:
+            self._print_error("NO_PAREN",
+                              "ERROR : Expected a list of ports in brackets "
+                              "here")
+            restart = False
+
+        elif error_id == self.CIRCUIT_QUALIFIER:
+            self._print_error("CIRCUIT_QUALIFIER",
+                              "ERROR : Circuits do not take a qualifier",
+                              symbol)
+
+        elif error_id == self.CIRCUIT_PORT:
+            self._print_error("CIRCUIT_PORT",
+                              "ERROR : Port is not a signal of the circuit",
+                              symbol)
             restart = False
 
+        elif error_id == self.NOT_A_PORT:
+            self._print_error("NOT_A_PORT",
+                              "ERROR : Signal is not a port of the circuit",
+                              symbol)
+
         elif error_id == self.INCOMPLETE_NETWORK:
-            print("ERROR : Not all inputs are connected")
+            self._print_error("INCOMPLETE_NETWORK",
+                              "ERROR : Not all inputs are connected",
+                              located=False)
             return  # No inline error message for incomplete network
 
         else:
             print('Unregistered error id in parser code', error_id)
 
         if not self.test:
-            self._inline_error_message()
+            self._inline_error_message(symbol)
         if advance:
             self._next_symbol()
         if restart:
@@ -233,23 +407,35 @@ class Parser:
         self.error_count += 1
         print("Errors found so far :", self.error_count)
         if error_id == self.devices.DEVICE_PRESENT:
-            print("ERROR : Device by this name already exists")
+            self._print_error("DEVICE_PRESENT",
+                              "ERROR : Device by this name already exists",
+                              device_name_symbol)
             self._inline_error_message(device_name_symbol)
 
         elif error_id == self.devices.NO_QUALIFIER:
-            print("ERROR : No qualifier given and device type requires one")
+            self._print_error("NO_QUALIFIER",
+                              "ERROR : No qualifier given and device type "
+                              "requires one",
+                              device_type_symbol)
             self._inline_error_message(device_type_symbol)
 
         elif error_id == self.devices.INVALID_QUALIFIER:
-            print("ERROR : Qualifier is invalid for device type")
+            self._print_error("INVALID_QUALIFIER",
+                              "ERROR : Qualifier is invalid for device type",
+                              device_parameter_symbol)
             self._inline_error_message(device_parameter_symbol)
 
         elif error_id == self.devices.QUALIFIER_PRESENT:
-            print("ERROR : Qualifier not valid with device type")
+            self._print_error("QUALIFIER_PRESENT",
+                              "ERROR : Qualifier not valid with device type",
+                              device_parameter_symbol)
             self._inline_error_message(device_parameter_symbol)
 
         elif error_id == self.devices.BAD_DEVICE:
-            print("ERROR : Device Type given is not a valid device type")
+            self._print_error("BAD_DEVICE",
+                              "ERROR : Device Type given is not a valid "
+                              "device type",
+                              device_type_symbol)
             self._inline_error_message(device_type_symbol)
 
         else:
@@ -267,27 +453,39 @@ class Parser:
         self.error_count += 1
         print("Errors found so far :", self.error_count)
         if error_id == self.network.DEVICE_ABSENT_ONE:
-            print("ERROR : Device name does not exist")
+            self._print_error("DEVICE_ABSENT_ONE",
+                              "ERROR : Device name does not exist",
+                              output_device_symbol)
             self._inline_error_message(output_device_symbol)
 
         elif error_id == self.network.DEVICE_ABSENT_TWO:
-            print("ERROR : Device name does not exist")
+            self._print_error("DEVICE_ABSENT_TWO",
+                              "ERROR : Device name does not exist",
+                              input_device_symbol)
             self._inline_error_message(input_device_symbol)
 
         elif error_id == self.network.INPUT_CONNECTED:
-            print("ERROR : Input is already connected")
+            self._print_error("INPUT_CONNECTED",
+                              "ERROR : Input is already connected",
+                              input_symbol)
             self._inline_error_message(input_symbol)
 
         elif error_id == self.network.INPUT_TO_INPUT:
-            print("ERROR : Cannot connect an input to an input")
+            self._print_error("INPUT_TO_INPUT",
+                              "ERROR : Cannot connect an input to an input",
+                              output_symbol)
             self._inline_error_message(output_symbol)
 
         elif error_id == self.network.PORT_ABSENT:
-            print("ERROR : Port does not exist")
+            self._print_error("PORT_ABSENT",
+                              "ERROR : Port does not exist",
+                              output_device_symbol)
             self._inline_error_message(output_device_symbol)
 
         elif error_id == self.network.OUTPUT_TO_OUTPUT:
-            print("ERROR : Cannot Connect output to output")
+            self._print_error("OUTPUT_TO_OUTPUT",
+                              "ERROR : Cannot Connect output to output",
+                              input_device_symbol)
             self._inline_error_message(input_device_symbol)
 
         else:
@@ -303,21 +501,47 @@ class Parser:
         self.error_count += 1
         print("Errors found so far :", self.error_count)
         if error_id == self.monitors.NOT_OUTPUT:
-            print("ERROR : Can only monitor outputs")
+            self._print_error("NOT_OUTPUT",
+                              "ERROR : Can only monitor outputs",
+                              monitor_symbol)
             self._inline_error_message(monitor_symbol)
 
         elif error_id == self.monitors.MONITOR_PRESENT:
-            print("ERROR : Output already being monitored")
+            self._print_error("MONITOR_PRESENT",
+                              "ERROR : Output already being monitored",
+                              monitor_symbol)
             self._inline_error_message(monitor_symbol)
 
         elif error_id == self.monitors.network.DEVICE_ABSENT:
-            print("ERROR : Device does not exist")
+            self._print_error("DEVICE_ABSENT",
+                              "ERROR : Device does not exist", monitor_symbol)
             self._inline_error_message(monitor_symbol)
 
         else:
             print("Unregistered error id in parser code", error_id)
             print(self.monitors.MONITOR_PRESENT)
 
+    def _display_import_error(self, error_id, path_symbol):
+        """Return error messages for import errors."""
+        self.error_count += 1
+        print("Errors found so far :", self.error_count)
+        resolver = self._get_resolver()
+        if error_id == resolver.FILE_ABSENT:
+            self._print_error("IMPORT_ABSENT",
+                              "ERROR : Imported file not found", path_symbol)
+
+        elif error_id == resolver.IMPORT_CYCLE:
+            self._print_error("IMPORT_CYCLE",
+                              "ERROR : File imports itself", path_symbol)
+
+        elif error_id == resolver.IMPORT_ERRORS:
+            self._print_error("IMPORT_ERRORS",
+                              "ERROR : Errors in imported file", path_symbol)
+
+        else:
+            print("ERROR : Unregistered error id in parser code", error_id)
+        self._inline_error_message(path_symbol)
+
     def _next_symbol(self):
         """Change current symbol to next symbol from scanner."""
         self.current_symbol = self.scanner.get_symbol()
@@ -380,228 +604,625 @@ class Parser:
 
             self._next_symbol()
 
-    def _parse_devices(self):
-        """Parse the 'DEVICES' block of definition file."""
-        self.parse_completion[0] = True
-        while self.current_symbol.type == self.scanner.NAME:
-            device_type_symbol = self._copy_symbol()
-            device_parameter_symbol = Symbol()
+    def _parse_import_statement(self):
+        """Parse one 'IMPORT' statement."""
+        self._next_symbol()
+        if self.current_symbol.type != self.scanner.STRING:
+            self._display_syntax_error(self.NO_PATH)
+            return
+        path_symbol = self.current_symbol
+        self._next_symbol()
+        if self.current_symbol.type != self.scanner.EQUALS:
+            self._display_syntax_error(self.NO_EQUALS)
+            return
+        self._next_symbol()
+        if self.current_symbol.type != self.scanner.NAME:
+            self._display_syntax_error(self.INVALID_NAMESPACE)
+            return
+        namespace_symbol = self.current_symbol
+        if namespace_symbol.id in self.namespaces:
+            self._display_syntax_error(self.NAMESPACE_PRESENT)
+            return
+        self.namespaces[namespace_symbol.id] = None
+        self._next_symbol()
+        if self.current_symbol.type == self.scanner.SEMICOLON:
             self._next_symbol()
+            if self.error_count == 0 and not self.test:
+                self.netlist.add_import(path_symbol, namespace_symbol)
+        else:
+            self._display_syntax_error(self.NO_SEMICOLON)
 
-            expect_equals = True
-            if self.current_symbol.type == self.scanner.COMMA:
-                expect_equals = False
-                self._next_symbol()
-                if self.current_symbol.type == self.scanner.NUMBER:
-                    device_parameter_symbol = self._copy_symbol()
-                    self._next_symbol()
-                    expect_equals = True
-                else:
-                    self._display_syntax_error(self.NO_NUMBER)
+    def _parse_bus_range(self):
+        """Return the indices in a bus range such as [3] or [0:63].
 
-            if (
-                self.current_symbol.type == self.scanner.EQUALS
-                and expect_equals
+        The current symbol is the opening bracket. Ranges may count down as
+        well as up. Return None if the range has errors.
+        """
+        self._next_symbol()
+        if self.current_symbol.type != self.scanner.NUMBER:
+            self._display_syntax_error(self.NO_NUMBER)
+            return None
+        first = last = self.current_symbol.id
+        self._next_symbol()
+        if self.current_symbol.type == self.scanner.COLON:
+            self._next_symbol()
+            if self.current_symbol.type != self.scanner.NUMBER:
+                self._display_syntax_error(self.NO_NUMBER)
+                return None
+            last = self.current_symbol.id
+            self._next_symbol()
+        if self.current_symbol.type != self.scanner.CLOSE_BRACKET:
+            self._display_syntax_error(self.NO_BRACKET)
+            return None
+        self._next_symbol()
+        if first <= last:
+            return range(first, last + 1)
+        return range(first, last - 1, -1)
+
+    def _parse_device_names(self):
+        """Return the symbols of the device names at the current symbol.
+
+        Element i of a bus is named name[i], and a device in an imported
+        namespace or circuit instance is named namespace.name, which may be
+        nested. A range of elements such as name[0:63] gives one symbol per
+        element. Every symbol is at the location of the first name. Return
+        None if there are errors.
+        """
+        device_symbol = self.current_symbol
+        name_strings = [self.names.get_name_string(device_symbol.id)]
+        self._next_symbol()
+        while True:
+            if self.current_symbol.type == self.scanner.OPEN_BRACKET:
+                indices = self._parse_bus_range()
+                if indices is None:
+                    return None
+                name_strings = [
+                    "".join([name_string, "[", str(index), "]"])
+                    for name_string in name_strings for index in indices]
+            elif (
+                self.current_symbol.type == self.scanner.DOT
+                and self.scanner.peek_token().type == self.scanner.NAME
+                and all(self.names.query(name_string) in self.namespaces
+                        for name_string in name_strings)
             ):
                 self._next_symbol()
-                if self.current_symbol.type == self.scanner.NAME:
-                    device_name_symbol = self._copy_symbol()
-                    self._next_symbol()
-                    if self.current_symbol.type == self.scanner.SEMICOLON:
-                        self._next_symbol()
-                        if self.error_count == 0 and not self.test:
-                            error_type = self.devices.make_device(
-                                    device_name_symbol.id,
-                                    device_type_symbol.id,
-                                    device_property=device_parameter_symbol.id
-                            )
-                            if error_type == self.devices.NO_ERROR:
-                                pass
-                            else:
-                                self._display_devices_error(
-                                                error_type,
-                                                device_name_symbol,
-                                                device_type_symbol,
-                                                device_parameter_symbol
-                                )
-                    else:
-                        self._display_syntax_error(self.NO_SEMICOLON)
-                else:
-                    self._display_syntax_error(self.INVALID_DEVICENAME)
-            elif not expect_equals:
-                pass
+                suffix = "." + self.names.get_name_string(
+                    self.current_symbol.id)
+                name_strings = [name_string + suffix
+                                for name_string in name_strings]
+                self._next_symbol()
             else:
-                self._display_syntax_error(self.NO_EQUALS)
+                break
 
-        if self.current_symbol.type == self.scanner.KEYWORD:
-            if self.current_symbol.id == self.scanner.END_ID:
+        # Elements looked up together are given consecutive name IDs
+        return [device_symbol._replace(id=device_id)
+                for device_id in self.names.lookup(name_strings)]
+
+    def _get_bus_symbols(self, device_symbol, indices):
+        """Return a symbol for each of the given elements of a bus.
+
+        Elements looked up together are given consecutive name IDs.
+        """
+        name_string = self.names.get_name_string(device_symbol.id)
+        device_ids = self.names.lookup([
+            "".join([name_string, "[", str(index), "]"])
+            for index in indices])
+        return [device_symbol._replace(id=device_id)
+                for device_id in device_ids]
+
+    def _parse_port(self):
+        """Return the signal names of one port in a circuit's port list.
+
+        A port is a signal in the circuit, such as G1, R.Q or A.G.I1, and may
+        be a range of bus elements, such as R[0:7].Q. Return None if there
+        are errors.
+        """
+        if self.current_symbol.type != self.scanner.NAME:
+            self._display_syntax_error(self.INVALID_DEVICENAME)
+            return None
+        name_strings = [self.names.get_name_string(self.current_symbol.id)]
+        self._next_symbol()
+        while True:
+            if self.current_symbol.type == self.scanner.OPEN_BRACKET:
+                indices = self._parse_bus_range()
+                if indices is None:
+                    return None
+                name_strings = [
+                    "".join([name_string, "[", str(index), "]"])
+                    for name_string in name_strings for index in indices]
+            elif self.current_symbol.type == self.scanner.DOT:
+                self._next_symbol()
+                if self.current_symbol.type != self.scanner.NAME:
+                    self._display_syntax_error(self.INVALID_OUTPUTLABEL)
+                    return None
+                suffix = "." + self.names.get_name_string(
+                    self.current_symbol.id)
+                name_strings = [name_string + suffix
+                                for name_string in name_strings]
                 self._next_symbol()
-                return
             else:
-                self._display_syntax_error(self.NO_END)
-                return
+                return name_strings
 
-        elif self.current_symbol.type == self.scanner.EOF:
-            self._display_syntax_error(self.NO_END)
-            return
+    def _parse_circuit(self):
+        """Parse a 'CIRCUIT' template and check it once.
 
-        elif self.current_symbol.type == self.scanner.SEMICOLON:
-            while self.current_symbol.type == self.scanner.SEMICOLON:
-                self._display_syntax_error(self.EXTRA_SEMICOLON)
-                self._next_symbol()
-            self._parse_devices()
+        A template holds a 'DEVICES' block and an optional 'CONNECTIONS'
+        block, and ends with 'END'. Devices of the template whose type is
+        the circuit name are instances of it, copied from the template.
+        """
+        self._next_symbol()
+        circuit_symbol = self.current_symbol
+        valid_name = (
+            circuit_symbol.type == self.scanner.NAME
+            and circuit_symbol.id not in self.circuits
+            and circuit_symbol.id not in self.devices.gate_types
+            and circuit_symbol.id not in self.devices.device_types
+        )
+        if circuit_symbol.type == self.scanner.NAME:
+            self._next_symbol()
+        if not valid_name:
+            self._display_syntax_error(self.INVALID_CIRCUITNAME,
+                                       circuit_symbol)
 
+        # {port string: symbol of the port}
+        ports = {}
+        if self.current_symbol.type == self.scanner.OPEN_PAREN:
+            self._next_symbol()
+            while self.current_symbol.type != self.scanner.CLOSE_PAREN:
+                port_symbol = self.current_symbol
+                port_strings = self._parse_port()
+                if port_strings is None:
+                    break
+                for port_string in port_strings:
+                    ports[port_string] = port_symbol
+                if self.current_symbol.type == self.scanner.COMMA:
+                    self._next_symbol()
+                elif self.current_symbol.type != self.scanner.CLOSE_PAREN:
+                    self._display_syntax_error(self.NO_PAREN)
+                    break
+            if self.current_symbol.type == self.scanner.CLOSE_PAREN:
+                self._next_symbol()
         else:
-            self._display_syntax_error(self.INVALID_DEVICETYPE)
+            self._display_syntax_error(self.NO_PAREN)
+
+        # The template is parsed into a netlist and namespaces of its own
+        outer_state = (self.netlist, self.namespaces, self.parse_completion)
+        self.netlist = Netlist()
+        self.namespaces = {}
+        self.parse_completion = [False, False, False]
+
+        if (
+            self.current_symbol.type == self.scanner.KEYWORD
+            and self.current_symbol.id == self.scanner.DEVICES_ID
+        ):
+            self._next_symbol()
             self._parse_devices()
+        else:
+            self._display_syntax_error(self.EXPECT_DEVICES)
+        if (
+            self.current_symbol.type == self.scanner.KEYWORD
+            and self.current_symbol.id == self.scanner.CONNECT_ID
+        ):
+            self._next_symbol()
+            self._parse_connections()
+        if (
+            self.current_symbol.type == self.scanner.KEYWORD
+            and self.current_symbol.id == self.scanner.END_ID
+        ):
+            self._next_symbol()
+        else:
+            self._display_syntax_error(self.NO_END)
 
-    def _parse_connections(self):
-        """Parse the 'CONNECTIONS' block of definition file."""
-        self.parse_completion[1] = True
-        while self.current_symbol.type == self.scanner.NAME:
-            output_device_symbol = self._copy_symbol()
-            output_symbol = Symbol()
+        netlist = self.netlist
+        namespaces = {self.names.get_name_string(namespace_id):
+                      namespace_ports for namespace_id, namespace_ports in
+                      self.namespaces.items()}
+        self.netlist, self.namespaces, self.parse_completion = outer_state
+
+        # Statements are only recorded while there are no errors
+        if self.error_count == 0 and not self.test:
+            self._check_circuit(netlist, ports)
+        if valid_name:
+            # Instances are parsed even if the template has errors, so that
+            # no further errors are reported for them
+            self.circuits[circuit_symbol.id] = (netlist, set(ports),
+                                                namespaces)
+
+    def _check_circuit(self, netlist, ports):
+        """Check a circuit template by building it into a separate network.
+
+        Inputs of the circuit may be left for its instances to connect.
+        ports is {port string: symbol}, and each port must be a signal of
+        the circuit.
+        """
+        devices = Devices(self.names)
+        network = Network(self.names, devices)
+        monitors = Monitors(self.names, devices, network)
+        checker = Parser(self.names, devices, network, monitors,
+                         self.scanner, resolver=self.resolver, imported=True)
+        checker.netlist = netlist
+        checker.error_count = self.error_count
+        checker._build_network()
+        self.error_count = checker.error_count
+        self.diagnostics.extend(checker.diagnostics)
+        if checker.diagnostics:
+            return
+
+        for port_string, port_symbol in ports.items():
+            if port_string not in devices.signal_ids:
+                self._display_syntax_error(self.CIRCUIT_PORT, port_symbol)
+                return
+
+    def _parse_device_statement(self):
+        """Parse one device statement of the 'DEVICES' block."""
+        device_type_symbol = self.current_symbol
+        device_parameter_symbol = Symbol()
+        width = None  # number of devices in a bus
+        self._next_symbol()
+
+        if self.current_symbol.type == self.scanner.OPEN_BRACKET:
+            self._next_symbol()
+            if self.current_symbol.type != self.scanner.NUMBER:
+                self._display_syntax_error(self.NO_NUMBER)
+                return
+            if self.current_symbol.id < 1:
+                self._display_syntax_error(self.BAD_WIDTH)
+                return
+            width = self.current_symbol.id
+            self._next_symbol()
+            if self.current_symbol.type != self.scanner.CLOSE_BRACKET:
+                self._display_syntax_error(self.NO_BRACKET)
+                return
+            self._next_symbol()
+
+        expect_equals = True
+        if self.current_symbol.type == self.scanner.COMMA:
+            expect_equals = False
             self._next_symbol()
+            if self.current_symbol.type == self.scanner.NUMBER:
+                device_parameter_symbol = self.current_symbol
+                self._next_symbol()
+                expect_equals = True
+            else:
+                self._display_syntax_error(self.NO_NUMBER)
 
-            expect_dash = True
-            if self.current_symbol.type == self.scanner.DOT:
-                expect_dash = False
+        if (
+            self.current_symbol.type == self.scanner.EQUALS
+            and expect_equals
+        ):
+            self._next_symbol()
+            if (
+                self.current_symbol.type == self.scanner.NAME
+                and self.current_symbol.id not in self.namespaces
+            ):
+                device_name_symbol = self.current_symbol
                 self._next_symbol()
-                if self.current_symbol.type == self.scanner.NAME:
-                    output_symbol = self._copy_symbol()
+                if self.current_symbol.type == self.scanner.SEMICOLON:
+                    if width is None:
+                        device_name_symbols = [device_name_symbol]
+                    else:
+                        device_name_symbols = self._get_bus_symbols(
+                            device_name_symbol, range(width))
+                    self._add_devices(device_name_symbols,
+                                      device_type_symbol,
+                                      device_parameter_symbol)
+                else:
+                    self._display_syntax_error(self.NO_SEMICOLON)
+            else:
+                self._display_syntax_error(self.INVALID_DEVICENAME)
+        elif not expect_equals:
+            pass
+        else:
+            self._display_syntax_error(self.NO_EQUALS)
+
+    def _add_devices(self, device_name_symbols, device_type_symbol,
+                     device_parameter_symbol):
+        """Record the devices of one device statement.
+
+        A device whose type is a circuit template is an instance of the
+        circuit, whose devices are copied from the template into the
+        instance's namespace. The current symbol is the semicolon ending
+        the statement.
+        """
+        circuit = self.circuits.get(device_type_symbol.id)
+        if circuit is not None:
+            if device_parameter_symbol.id is not None:
+                self._display_syntax_error(self.CIRCUIT_QUALIFIER,
+                                           device_parameter_symbol)
+                return
+            netlist, ports, namespaces = circuit
+            for device_name_symbol in device_name_symbols:
+                instance_string = self.names.get_name_string(
+                    device_name_symbol.id)
+                self.namespaces[device_name_symbol.id] = ports
+                # Instances within the circuit are nested in this one
+                for namespace_string, namespace_ports in namespaces.items():
+                    [namespace_id] = self.names.lookup(
+                        [instance_string + "." + namespace_string])
+                    self.namespaces[namespace_id] = namespace_ports
+        self._next_symbol()
+
+        if self.error_count == 0 and not self.test:
+            for device_name_symbol in device_name_symbols:
+                if circuit is None:
+                    self.netlist.add_device(device_name_symbol,
+                                            device_type_symbol,
+                                            device_parameter_symbol)
+                else:
+                    self.netlist.add_netlist(circuit[0], self.names,
+                                             device_name_symbol.id)
+
+    def _parse_devices(self):
+        """Parse the 'DEVICES' block of definition file."""
+        self.parse_completion[0] = True
+        # Recover from errors by looping rather than recursing, so the
+        # stack does not grow with the number of errors in the block
+        while True:
+            while self.current_symbol.type == self.scanner.NAME:
+                self._parse_device_statement()
+
+            if self.current_symbol.type == self.scanner.KEYWORD:
+                if self.current_symbol.id == self.scanner.END_ID:
                     self._next_symbol()
-                    expect_dash = True
+                    return
                 else:
-                    self._display_syntax_error(self.INVALID_OUTPUTLABEL)
+                    self._display_syntax_error(self.NO_END)
+                    return
 
-            if self.current_symbol.type == self.scanner.DASH and expect_dash:
+            elif self.current_symbol.type == self.scanner.EOF:
+                self._display_syntax_error(self.NO_END)
+                return
+
+            elif self.current_symbol.type == self.scanner.SEMICOLON:
+                while self.current_symbol.type == self.scanner.SEMICOLON:
+                    self._display_syntax_error(self.EXTRA_SEMICOLON)
+                    self._next_symbol()
+
+            else:
+                self._display_syntax_error(self.INVALID_DEVICETYPE)
+
+    def _parse_connection_statement(self):
+        """Parse one connection statement of the 'CONNECTIONS' block."""
+        output_symbol = Symbol()
+        output_device_symbols = self._parse_device_names()
+        if output_device_symbols is None:
+            return
+
+        expect_dash = True
+        if self.current_symbol.type == self.scanner.DOT:
+            expect_dash = False
+            self._next_symbol()
+            if self.current_symbol.type == self.scanner.NAME:
+                output_symbol = self.current_symbol
                 self._next_symbol()
-                if self.current_symbol.type == self.scanner.NAME:
-                    input_device_symbol = self._copy_symbol()
+                expect_dash = True
+            else:
+                self._display_syntax_error(self.INVALID_OUTPUTLABEL)
+
+        if self.current_symbol.type == self.scanner.DASH and expect_dash:
+            self._next_symbol()
+            if self.current_symbol.type == self.scanner.NAME:
+                input_device_symbols = self._parse_device_names()
+                if input_device_symbols is None:
+                    return
+                if self.current_symbol.type == self.scanner.DOT:
                     self._next_symbol()
-                    if self.current_symbol.type == self.scanner.DOT:
+                    if self.current_symbol.type == self.scanner.NAME:
+                        input_symbol = self.current_symbol
                         self._next_symbol()
-                        if self.current_symbol.type == self.scanner.NAME:
-                            input_symbol = self._copy_symbol()
-                            self._next_symbol()
-                            if self.current_symbol.type == self.scanner.SEMICOLON:
-                                self._next_symbol()
-                                if self.error_count == 0 and not self.test:
-                                    error_type = self.network.make_connection(
-                                                    output_device_symbol.id,
-                                                    output_symbol.id,
-                                                    input_device_symbol.id,
-                                                    input_symbol.id
-                                    )
-                                    if error_type == self.network.NO_ERROR:
-                                        pass
-                                    else:
-                                        self._display_connect_error(
-                                                    error_type,
-                                                    output_device_symbol,
-                                                    output_symbol,
-                                                    input_device_symbol,
-                                                    input_symbol
-                                        )
-                            else:
-                                self._display_syntax_error(self.NO_SEMICOLON)
+                        if self.current_symbol.type == self.scanner.SEMICOLON:
+                            self._add_connections(output_device_symbols,
+                                                  output_symbol,
+                                                  input_device_symbols,
+                                                  input_symbol)
                         else:
-                            self._display_syntax_error(self.INVALID_INPUTLABEL)
+                            self._display_syntax_error(self.NO_SEMICOLON)
                     else:
-                        self._display_syntax_error(self.NO_DOT)
+                        self._display_syntax_error(self.INVALID_INPUTLABEL)
                 else:
-                    self._display_syntax_error(self.INVALID_DEVICENAME)
-            elif not expect_dash:
-                pass
+                    self._display_syntax_error(self.NO_DOT)
             else:
-                self._display_syntax_error(self.NO_DASH)
+                self._display_syntax_error(self.INVALID_DEVICENAME)
+        elif not expect_dash:
+            pass
+        else:
+            self._display_syntax_error(self.NO_DASH)
 
-        if self.current_symbol.type == self.scanner.KEYWORD:
-            if self.current_symbol.id == self.scanner.END_ID:
-                # Checking if all inputs are connected
-                if self.error_count == 0 and not self.network.check_network():
-                    self._display_syntax_error(self.INCOMPLETE_NETWORK)
-                self._next_symbol()
+    def _add_connections(self, output_device_symbols, output_symbol,
+                         input_device_symbols, input_symbol):
+        """Record the connections of one connection statement.
+
+        Element i of the output bus is connected to element i of the input
+        bus, or a single output is connected to every input. The current
+        symbol is the semicolon ending the statement.
+        """
+        if len(output_device_symbols) == 1:
+            output_device_symbols = (output_device_symbols
+                                     * len(input_device_symbols))
+        elif len(output_device_symbols) != len(input_device_symbols):
+            self._display_syntax_error(self.WIDTH_MISMATCH,
+                                       input_device_symbols[0])
+            return
+        for device_symbol, port_symbol in [
+                (output_device_symbols[0], output_symbol),
+                (input_device_symbols[0], input_symbol)]:
+            if not self._is_port(device_symbol, port_symbol):
+                self._display_syntax_error(self.NOT_A_PORT, device_symbol)
                 return
-            else:
+        self._next_symbol()
+        if self.error_count == 0 and not self.test:
+            for output_device_symbol, input_device_symbol in zip(
+                    output_device_symbols, input_device_symbols):
+                self.netlist.add_connection(output_device_symbol,
+                                            output_symbol,
+                                            input_device_symbol,
+                                            input_symbol)
+
+    def _is_port(self, device_symbol, port_symbol):
+        """Return True if the signal may be connected from outside.
+
+        Signals of a circuit instance may only be connected if they are
+        ports of the circuit. Every signal of an imported file or of this
+        file may be connected.
+        """
+        name_string = self.names.get_name_string(device_symbol.id)
+        instance_string, dot, signal_string = name_string.partition(".")
+        if not dot:
+            return True
+        ports = self.namespaces.get(self.names.query(instance_string))
+        if ports is None:
+            return True
+        if port_symbol.id is not None:
+            signal_string = ".".join([
+                signal_string, self.names.get_name_string(port_symbol.id)])
+        return signal_string in ports
+
+    def _parse_connections(self):
+        """Parse the 'CONNECTIONS' block of definition file."""
+        self.parse_completion[1] = True
+        # Recover from errors by looping rather than recursing, so the
+        # stack does not grow with the number of errors in the block
+        while True:
+            while self.current_symbol.type == self.scanner.NAME:
+                self._parse_connection_statement()
+
+            if self.current_symbol.type == self.scanner.KEYWORD:
+                if self.current_symbol.id == self.scanner.END_ID:
+                    # All inputs are checked to be connected once the
+                    # network is built
+                    if self.error_count == 0:
+                        self.netlist.connections_complete = True
+                    self._next_symbol()
+                    return
+                else:
+                    self._display_syntax_error(self.NO_END)
+                    return
+
+            elif self.current_symbol.type == self.scanner.EOF:
                 self._display_syntax_error(self.NO_END)
                 return
 
-        elif self.current_symbol.type == self.scanner.EOF:
-            self._display_syntax_error(self.NO_END)
+            elif self.current_symbol.type == self.scanner.SEMICOLON:
+                while self.current_symbol.type == self.scanner.SEMICOLON:
+                    self._next_symbol()
+                self._display_syntax_error(self.EXTRA_SEMICOLON)
+
+            else:
+                self._display_syntax_error(self.INVALID_DEVICENAME)
+
+    def _parse_monitor_statement(self):
+        """Parse one monitor statement of the 'MONITORS' block."""
+        monitor_output_symbol = Symbol()
+        monitor_symbols = self._parse_device_names()
+        if monitor_symbols is None:
             return
 
-        elif self.current_symbol.type == self.scanner.SEMICOLON:
-            while self.current_symbol.type == self.scanner.SEMICOLON:
+        expect_semicolon = True
+        if self.current_symbol.type == self.scanner.DOT:
+            expect_semicolon = False
+            self._next_symbol()
+            if self.current_symbol.type == self.scanner.NAME:
+                monitor_output_symbol = self.current_symbol
                 self._next_symbol()
-            self._display_syntax_error(self.EXTRA_SEMICOLON)
-            self._parse_devices()
+                expect_semicolon = True
+            else:
+                self._display_syntax_error(self.INVALID_OUTPUTLABEL)
 
+        if (
+            self.current_symbol.type == self.scanner.SEMICOLON
+            and expect_semicolon
+        ):
+            self._next_symbol()
+            if self.error_count == 0 and not self.test:
+                for monitor_symbol in monitor_symbols:
+                    self.netlist.add_monitor(monitor_symbol,
+                                             monitor_output_symbol)
+        elif not expect_semicolon:
+            pass
         else:
-            self._display_syntax_error(self.INVALID_DEVICENAME)
-            self._parse_connections()
+            self._display_syntax_error(self.NO_SEMICOLON)
 
     def _parse_monitor(self):
         """Parse the 'MONITORS' block of definition file."""
         self.parse_completion[2] = True
-        while self.current_symbol.type == self.scanner.NAME:
-            monitor_symbol = self._copy_symbol()
-            monitor_output_symbol = Symbol()
-            self._next_symbol()
+        # Recover from errors by looping rather than recursing, so the
+        # stack does not grow with the number of errors in the block
+        while True:
+            while self.current_symbol.type == self.scanner.NAME:
+                self._parse_monitor_statement()
 
-            expect_semicolon = True
-            if self.current_symbol.type == self.scanner.DOT:
-                expect_semicolon = False
-                self._next_symbol()
-                if self.current_symbol.type == self.scanner.NAME:
-                    monitor_output_symbol = self._copy_symbol()
+            if self.current_symbol.type == self.scanner.KEYWORD:
+                if self.current_symbol.id == self.scanner.END_ID:
                     self._next_symbol()
-                    expect_semicolon = True
+                    return
                 else:
-                    self._display_syntax_error(self.INVALID_OUTPUTLABEL)
-
-            if (
-                self.current_symbol.type == self.scanner.SEMICOLON
-                and expect_semicolon
-            ):
-                self._next_symbol()
-                if self.error_count == 0 and not self.test:
-                    error_type = self.monitors.make_monitor(
-                                                monitor_symbol.id,
-                                                monitor_output_symbol.id
-                    )
-                    if error_type == self.monitors.NO_ERROR:
-                        pass
-                    else:
-                        self._display_monitors_error(error_type,
-                                                     monitor_symbol,
-                                                     monitor_output_symbol)
-            elif not expect_semicolon:
-                pass
-            else:
-                self._display_syntax_error(self.NO_SEMICOLON)
+                    self._display_syntax_error(self.NO_END)
+                    return
 
-        if self.current_symbol.type == self.scanner.KEYWORD:
-            if self.current_symbol.id == self.scanner.END_ID:
-                self._next_symbol()
-                return
-            else:
+            elif self.current_symbol.type == self.scanner.EOF:
                 self._display_syntax_error(self.NO_END)
                 return
 
-        elif self.current_symbol.type == self.scanner.EOF:
-            self._display_syntax_error(self.NO_END)
+            elif self.current_symbol.type == self.scanner.SEMICOLON:
+                while self.current_symbol.type == self.scanner.SEMICOLON:
+                    self._next_symbol()
+                self._display_syntax_error(self.EXTRA_SEMICOLON)
+
+            else:
+                self._display_syntax_error(self.INVALID_DEVICENAME)
+
+    def _get_resolver(self):
+        """Return the resolver of imported files, making it if needed."""
+        if self.resolver is None:
+            # Imported here as the imports module itself imports this one
+            from imports import ImportResolver
+            self.resolver = ImportResolver(self.names)
+        return self.resolver
+
+    def _build_network(self):
+        """Build the logic network from the netlist.
+
+        The netlist is linked with those of any imported files first.
+        Building stops at the first semantic error.
+        """
+        netlist = self.netlist
+        if netlist.imports:
+            netlist, error = self._get_resolver().link(netlist,
+                                                       self.scanner.path)
+            if error is not None:
+                (path_symbol, namespace_symbol), error_type = error
+                self._display_import_error(error_type, path_symbol)
+                return
+        self.flat_netlist = netlist
+
+        error = netlist.build_devices(self.devices)
+        if error is not None:
+            (device_name_symbol, device_type_symbol,
+             device_parameter_symbol), error_type = error
+            self._display_devices_error(error_type, device_name_symbol,
+                                        device_type_symbol,
+                                        device_parameter_symbol)
             return
 
-        elif self.current_symbol.type == self.scanner.SEMICOLON:
-            while self.current_symbol.type == self.scanner.SEMICOLON:
-                self._next_symbol()
-            self._display_syntax_error(self.EXTRA_SEMICOLON)
-            self._parse_devices()
+        error = netlist.build_connections(self.network)
+        if error is not None:
+            (output_device_symbol, output_symbol, input_device_symbol,
+             input_symbol), error_type = error
+            self._display_connect_error(error_type, output_device_symbol,
+                                        output_symbol, input_device_symbol,
+                                        input_symbol)
+            return
+        # Inputs of an imported file may be connected by the importing file
+        if (netlist.connections_complete and not self.imported
+                and not self.network.check_network()):
+            self._display_syntax_error(self.INCOMPLETE_NETWORK)
+            return
 
-        else:
-            self._display_syntax_error(self.INVALID_DEVICENAME)
-            self._parse_monitor()
+        error = netlist.build_monitors(self.monitors)
+        if error is not None:
+            (monitor_symbol, monitor_output_symbol), error_type = error
+            self._display_monitors_error(error_type, monitor_symbol,
+                                         monitor_output_symbol)
 
     def parse_network(self):
         """Parse the circuit definition file.
@@ -609,6 +1230,14 @@ class Parser:
         Returns True if no errors found.
         """
         self._next_symbol()
+        while self.current_symbol.type == self.scanner.KEYWORD:
+            if self.current_symbol.id == self.names.query("IMPORT"):
+                self._parse_import_statement()
+            elif self.current_symbol.id == self.names.query("CIRCUIT"):
+                self._parse_circuit()
+            else:
+                break
+
         if(
             self.current_symbol.type == self.scanner.KEYWORD
             and self.current_symbol.id == self.scanner.DEVICES_ID
@@ -662,6 +1291,9 @@ class Parser:
         else:
             self._display_syntax_error(self.NO_MAIN_END)
 
+        if not self.test:
+            self._build_network()
+
         if self.error_count > 0:
             return False
         else:
@@ -0,0 +1,155 @@
+"""Record every output in the network in a columnar trace store.
+
+Used in the Logic Simulator project for probe-all mode, where the signal
+level of every device output is recorded at every simulation cycle, so that
+any signal can be read back after a run without re-simulating.
+
+Classes
+-------
+ProbeStore - records signal levels column by column, spilling old chunks to
+             a memory-mapped temporary file.
+"""
+import mmap
+import tempfile
+
+
+class ProbeStore:
+    """Record signal levels column by column.
+
+    Each net (an output given by its device and port IDs) has its own column
+    of signal levels, packed one byte per cycle. Columns are filled in chunks
+    of chunk_size cycles. Once the completed chunks held in memory take up
+    more than memory_budget bytes, they are written to a temporary file,
+    which is memory-mapped when they are read back.
+
+    Parameters
+    ----------
+    nets: list of (device_id, output_id) tuples to record.
+    chunk_size: number of cycles in each chunk of a column.
+    memory_budget: number of bytes of completed chunks to keep in memory.
+
+    Public methods
+    --------------
+    record(self, signal_list): Records one cycle of signal levels, given in
+                               the same order as nets.
+
+    get_trace(self, device_id, output_id, start=0, stop=None): Returns the
+                            recorded signal levels of the specified net.
+
+    reset(self): Removes all recorded signal levels.
+
+    close(self): Releases the temporary file.
+    """
+
+    def __init__(self, nets, chunk_size=4096, memory_budget=16 * 2 ** 20):
+        """Initialise the columns and the spill file variables."""
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be positive')
+        self.nets = list(nets)
+        self.net_index = {net: i for i, net in enumerate(self.nets)}
+        self.chunk_size = chunk_size
+        self.memory_budget = memory_budget
+
+        self.length = 0  # number of cycles recorded
+        self.memory_used = 0  # bytes of completed chunks held in memory
+
+        # The chunk currently being filled for each net
+        self.columns = [bytearray() for _ in self.nets]
+
+        # Completed chunks for each net. A chunk is either a bytes object
+        # held in memory or an (offset, length) pair in the spill file.
+        self.chunks = [[] for _ in self.nets]
+
+        self.spill_file = None
+        self.spill_size = 0
+        self.spill_map = None
+
+    def record(self, signal_list):
+        """Record one cycle of signal levels, in the same order as nets."""
+        for column, signal in zip(self.columns, signal_list):
+            column.append(signal)
+        self.length += 1
+        if self.length % self.chunk_size == 0:
+            self._complete_chunks()
+
+    def _complete_chunks(self):
+        """Move the current chunk of every column to its completed chunks."""
+        for i, column in enumerate(self.columns):
+            self.chunks[i].append(bytes(column))
+            self.memory_used += len(column)
+        self.columns = [bytearray() for _ in self.nets]
+        if self.memory_used > self.memory_budget:
+            self._spill()
+
+    def _spill(self):
+        """Write all completed chunks held in memory to the spill file."""
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile()
+        self.spill_file.seek(self.spill_size)
+        for net_chunks in self.chunks:
+            for j, chunk in enumerate(net_chunks):
+                if isinstance(chunk, bytes):
+                    self.spill_file.write(chunk)
+                    net_chunks[j] = (self.spill_size, len(chunk))
+                    self.spill_size += len(chunk)
+        self.spill_file.flush()
+        self.memory_used = 0
+        if self.spill_map is not None:  # the file has grown, so map it again
+            self.spill_map.close()
+            self.spill_map = None
+
+    def _read_chunk(self, chunk):
+        """Return the contents of a completed chunk."""
+        if isinstance(chunk, bytes):
+            return chunk
+        if self.spill_map is None:
+            self.spill_map = mmap.mmap(self.spill_file.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+        offset, length = chunk
+        return self.spill_map[offset:offset + length]
+
+    def get_trace(self, device_id, output_id, start=0, stop=None):
+        """Return the recorded signal levels of the specified net.
+
+        Only cycles start to stop - 1 are returned if these are given. Return
+        None if the net is not being recorded.
+        """
+        if (device_id, output_id) not in self.net_index:
+            return None
+        i = self.net_index[(device_id, output_id)]
+        if stop is None or stop > self.length:
+            stop = self.length
+        start = max(start, 0)
+
+        signal_list = []
+        if start >= stop:
+            return signal_list
+        first_chunk = start // self.chunk_size
+        last_chunk = (stop - 1) // self.chunk_size
+        for chunk_number in range(first_chunk, last_chunk + 1):
+            if chunk_number < len(self.chunks[i]):
+                data = self._read_chunk(self.chunks[i][chunk_number])
+            else:
+                data = self.columns[i]
+            chunk_start = chunk_number * self.chunk_size
+            signal_list.extend(data[max(start - chunk_start, 0):
+                                    stop - chunk_start])
+        return signal_list
+
+    def reset(self):
+        """Remove all recorded signal levels."""
+        self.close()
+        self.length = 0
+        self.memory_used = 0
+        self.columns = [bytearray() for _ in self.nets]
+        self.chunks = [[] for _ in self.nets]
+
+    def close(self):
+        """Release the spill file and its memory map."""
+        if self.spill_map is not None:
+            self.spill_map.close()
+            self.spill_map = None
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+        self.spill_size = 0
@@ -0,0 +1,272 @@
+"""Apply changes in a definition file to a live logic network.
+
+Used in the Logic Simulator project to reload a definition file after it has
+been edited, without building a new network. The statements of the new file
+are compared with those of the previous version, and only the devices,
+connections and monitors which were added or removed are applied to the live
+network, so the simulation state of unchanged devices and the traces of
+unchanged monitors are kept. The files it imports are watched as well.
+
+Classes
+-------
+Reloader - watches a definition file and applies its changes to a network.
+"""
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+class Reloader:
+    """Watch a definition file and apply its changes to a live network.
+
+    The new version of the file is parsed into a separate network first, so a
+    version with errors is reported and leaves the live network unchanged.
+    A device whose type or qualifier has changed is removed and made again.
+    The file is reloaded when it or any file it imports is edited.
+
+    Parameters
+    ----------
+    path: path to the definition file the live network was built from.
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    netlist: linked netlist the live network was just built from, or None
+             to parse the file again.
+    imported_paths: paths of the files imported when netlist was built.
+
+    Public methods
+    --------------
+    poll(self, cycles_completed=0): Applies the changes in the file if it
+                                    has changed since the last call.
+
+    reload(self, text, cycles_completed=0): Applies the changes in the
+                                            given definition text.
+
+    Private methods
+    ---------------
+    _get_file_state(self): Returns the modification time and size of the
+                           file and of each file it imports.
+
+    _describe(self, text): Returns the statements in text as strings and
+                           the paths of the files it imports.
+
+    _describe_network(self, names, devices, network, monitors, netlist):
+                   Returns the statements of a built network as strings.
+
+    _remove(self, device_names, input_names, signal_names): Removes devices,
+                                   connections and monitors from the network.
+
+    _add(self, device_table, device_names, connections, signal_names,
+         cycles_completed): Adds devices, connections and monitors to the
+                            network.
+    """
+
+    def __init__(self, path, names, devices, network, monitors,
+                 netlist=None, imported_paths=()):
+        """Read the current version of the definition file."""
+        self.path = path
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+        with open(path, "r") as definition_file:
+            self.text = definition_file.read()
+        if netlist is None:
+            self.description, self.imported_paths = self._describe(self.text)
+        else:  # the live network has just been built from netlist
+            self.description = self._describe_network(
+                names, devices, network, monitors, netlist)
+            self.imported_paths = set(imported_paths)
+        self.file_state = self._get_file_state()
+
+    def _get_file_state(self):
+        """Return the modification time and size of each watched file.
+
+        Return a dictionary {path: (modification time, size)}, where the
+        value is None for files which cannot be found.
+        """
+        file_state = {}
+        for path in [self.path] + sorted(self.imported_paths):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                file_state[path] = None
+                continue
+            file_state[path] = (stat.st_mtime_ns, stat.st_size)
+        return file_state
+
+    def _describe(self, text):
+        """Parse text and return the statements it holds as strings.
+
+        Return the description returned by _describe_network, or None if the
+        text has errors, and the set of paths of the files it imports.
+        """
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        parser = Parser(names, devices, network, monitors,
+                        Scanner.from_string(text, names, path=self.path))
+        no_errors = parser.parse_network()
+        imported_paths = set()
+        if parser.resolver is not None:
+            imported_paths = set(parser.resolver.paths)
+        if not no_errors:
+            return None, imported_paths
+        return (self._describe_network(names, devices, network, monitors,
+                                       parser.flat_netlist),
+                imported_paths)
+
+    def _describe_network(self, names, devices, network, monitors, netlist):
+        """Return the statements of a network built from netlist as strings.
+
+        Return a dictionary with the keys "devices" ({device_name:
+        (type_name, qualifier)}), "connections" ({input_name: output_name})
+        and "monitors" (set of signal names).
+        """
+        tables = netlist.serialise(names)
+        device_table = {}
+        for device_name, type_name, qualifier in tables["devices"]:
+            device_table[device_name] = (type_name, qualifier)
+
+        # Connections are taken from the built network, so that they are
+        # found by input whichever way round they were written
+        connections = {}
+        for (device_id, input_id), input_name in devices.input_names.items():
+            connection = network.get_connected_output(device_id, input_id)
+            if connection is not None:
+                connections[input_name] = devices.get_signal_name(*connection)
+
+        return {"devices": device_table,
+                "connections": connections,
+                "monitors": set(monitors.get_signal_names()[0])}
+
+    def poll(self, cycles_completed=0):
+        """Apply the changes in the file if it has changed since last call.
+
+        cycles_completed is the number of cycles already simulated, used to
+        align the traces of new monitors. Return True if the live network
+        was changed.
+        """
+        file_state = self._get_file_state()
+        if file_state[self.path] is None or file_state == self.file_state:
+            return False
+        self.file_state = file_state
+        with open(self.path, "r") as definition_file:
+            text = definition_file.read()
+        return self.reload(text, cycles_completed)
+
+    def reload(self, text, cycles_completed=0):
+        """Apply the changes in the definition text to the live network.
+
+        The files it imports are read again as well, so text may be the
+        same as before. Return True if the live network was changed.
+        """
+        new, imported_paths = self._describe(text)
+        if imported_paths != self.imported_paths:
+            self.imported_paths = imported_paths
+            self.file_state = self._get_file_state()
+        if new is None:
+            print("Errors in the definition file: network not reloaded")
+            return False
+        old = self.description
+        self.text = text
+        self.description = new
+        if old is None:  # previous version had errors, nothing to compare
+            old = {"devices": {}, "connections": {}, "monitors": set()}
+
+        removed_devices = {name for name, spec in old["devices"].items()
+                           if new["devices"].get(name) != spec}
+        added_devices = {name for name, spec in new["devices"].items()
+                         if old["devices"].get(name) != spec}
+
+        def changed(signal_name, device_names):
+            # Device names may contain dots if they are imported
+            return (signal_name in device_names
+                    or signal_name.rsplit(".", 1)[0] in device_names)
+
+        removed_connections = [
+            input_name for input_name, output_name in
+            old["connections"].items()
+            if new["connections"].get(input_name) != output_name
+            or changed(input_name, removed_devices)
+            or changed(output_name, removed_devices)]
+        added_connections = [
+            (input_name, output_name) for input_name, output_name in
+            new["connections"].items()
+            if old["connections"].get(input_name) != output_name
+            or changed(input_name, added_devices)
+            or changed(output_name, added_devices)]
+        removed_monitors = [signal_name for signal_name in old["monitors"]
+                            if signal_name not in new["monitors"]
+                            or changed(signal_name, removed_devices)]
+        added_monitors = [signal_name for signal_name in new["monitors"]
+                          if signal_name not in old["monitors"]
+                          or changed(signal_name, added_devices)]
+
+        if not (removed_devices or added_devices or removed_connections
+                or added_connections or removed_monitors or added_monitors):
+            return False
+
+        self._remove(removed_devices, removed_connections, removed_monitors)
+        self._add(new["devices"], added_devices, added_connections,
+                  added_monitors, cycles_completed)
+        return True
+
+    def _remove(self, device_names, input_names, signal_names):
+        """Remove monitors, connections and devices from the live network."""
+        devices = self.devices
+        for signal_name in signal_names:
+            if signal_name in devices.signal_ids:
+                self.monitors.remove_monitor(
+                    *devices.get_signal_ids(signal_name))
+        for input_name in input_names:
+            if input_name in devices.signal_ids:
+                self.network.delete_connection(
+                    *devices.get_signal_ids(input_name))
+
+        device_ids = {self.names.query(device_name)
+                      for device_name in device_names}
+        device_ids.discard(None)
+        if not device_ids:
+            return
+        # Inputs connected to removed devices, for example from the GUI, are
+        # disconnected so that no connection refers to a missing device
+        for device in devices.devices_list:
+            for input_id, connection in device.inputs.items():
+                if connection is not None and connection[0] in device_ids:
+                    device.inputs[input_id] = None
+        for (device_id, output_id) in list(self.monitors.monitors_dictionary):
+            if device_id in device_ids:
+                self.monitors.remove_monitor(device_id, output_id)
+        for device_id in device_ids:
+            devices.remove_device(device_id)
+        self.network.version += 1
+
+    def _add(self, device_table, device_names, connections, signal_names,
+             cycles_completed):
+        """Add devices, connections and monitors to the live network."""
+        devices = self.devices
+        for device_name, (type_name, qualifier) in device_table.items():
+            if device_name not in device_names:
+                continue
+            [device_id, device_kind] = self.names.lookup([device_name,
+                                                          type_name])
+            devices.make_device(device_id, device_kind, qualifier)
+        for input_name, output_name in connections:
+            output_ids = devices.get_signal_ids(output_name)
+            input_ids = devices.get_signal_ids(input_name)
+            if input_ids[0] in devices.devices_dictionary:
+                # Inputs connected from the GUI are replaced
+                self.network.delete_connection(*input_ids)
+            self.network.make_connection(*output_ids, *input_ids)
+        for signal_name in signal_names:
+            self.monitors.make_monitor(*devices.get_signal_ids(signal_name),
+                                       cycles_completed=cycles_completed)
@@ -0,0 +1,385 @@
+"""Solve boolean satisfiability problems in conjunctive normal form.
+
+Used in the Logic Simulator project to find switch settings which drive a
+signal HIGH or LOW, from the conjunctive normal form of the network made by
+graph.Graph(). Problems can also be read in the DIMACS CNF format.
+
+Classes
+-------
+SatSolver - finds a satisfying assignment of a set of clauses.
+"""
+import heapq
+
+
+class SatSolver:
+    """Find a satisfying assignment of a set of clauses.
+
+    This is a conflict-driven clause learning solver. Unit propagation uses
+    two watched literals per clause, branching picks the unassigned variable
+    with the highest activity, which is raised for the variables in recent
+    conflicts (VSIDS), and each conflict is analysed to learn a clause at its
+    first unique implication point and jump back to the level where that
+    clause propagates. The search restarts after a number of conflicts which
+    follows the Luby sequence, keeping the last value of each variable.
+
+    Literals are integers as in the DIMACS format: i for variable i and -i
+    for its negation, with variables numbered from 1.
+
+    Parameters
+    ----------
+    clauses: list of clauses, each an iterable of integer literals.
+    variable_number: number of variables, or None to take the largest
+                     variable in the clauses.
+
+    Public methods
+    --------------
+    from_dimacs(cls, text): Returns a solver for a problem in DIMACS CNF
+                            format.
+
+    solve(self): Returns a satisfying assignment, or None if there is none.
+
+    Private methods
+    ---------------
+    _add_clause(self, literals): Adds a clause of internal literals.
+
+    _assign(self, literal, reason): Makes a literal true.
+
+    _propagate(self): Assigns the literals implied by unit clauses.
+
+    _analyse(self, conflict): Returns the clause learnt from a conflict and
+                              the level to jump back to.
+
+    _backtrack(self, level): Undoes the assignments above a decision level.
+
+    _bump(self, variable): Raises the activity of a variable.
+
+    _rebuild_heap(self): Makes a heap of the unassigned variables by
+                         activity.
+
+    _pick_branch_literal(self): Returns the next literal to decide on.
+
+    _luby(self, i): Returns the ith term of the Luby sequence.
+    """
+
+    # Assignment values of internal literals
+    UNASSIGNED, TRUE, FALSE = 0, 1, -1
+
+    def __init__(self, clauses, variable_number=None):
+        """Initialise the solver state and add the clauses."""
+        clauses = [list(clause) for clause in clauses]
+        if variable_number is None:
+            variable_number = max([abs(literal) for clause in clauses
+                                   for literal in clause] + [0])
+        self.variable_number = variable_number
+
+        # Variable v has the internal literals 2v (true) and 2v + 1 (false),
+        # so the negation of literal p is p ^ 1 and its variable is p >> 1
+        literal_number = 2 * (variable_number + 1)
+        self.values = [self.UNASSIGNED] * literal_number
+        self.watches = [[] for _ in range(literal_number)]
+        self.levels = [0] * (variable_number + 1)
+        self.reasons = [None] * (variable_number + 1)
+        self.phases = [self.FALSE] * (variable_number + 1)
+
+        self.trail = []  # assigned literals in order
+        self.trail_limits = []  # trail length at each decision
+        self.queue_head = 0  # next trail literal to propagate
+
+        self.activities = [0.0] * (variable_number + 1)
+        self.activity_increment = 1.0
+        self.activity_decay = 0.95
+        self.heap = [(0.0, variable)
+                     for variable in range(1, variable_number + 1)]
+
+        self.learnt_clauses = []
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+        self.unsatisfiable = False
+        for clause in clauses:
+            literals = []
+            for literal in clause:
+                if literal == 0 or abs(literal) > variable_number:
+                    raise ValueError("invalid literal " + str(literal))
+                literals.append(2 * abs(literal) + (literal < 0))
+            self._add_clause(literals)
+
+    @classmethod
+    def from_dimacs(cls, text):
+        """Return a solver for the problem in DIMACS CNF format in text.
+
+        Comment lines start with "c", the problem line is
+        "p cnf <variables> <clauses>", and each clause is a list of literals
+        ended by 0.
+        """
+        variable_number = None
+        clauses = []
+        clause = []
+        for line in text.splitlines():
+            words = line.split()
+            if not words or words[0] in ["c", "%"]:
+                continue
+            if words[0] == "p":
+                if len(words) != 4 or words[1] != "cnf":
+                    raise ValueError("invalid problem line: " + line)
+                variable_number = int(words[2])
+                continue
+            for word in words:
+                literal = int(word)
+                if literal == 0:
+                    clauses.append(clause)
+                    clause = []
+                else:
+                    clause.append(literal)
+        if clause:
+            clauses.append(clause)
+        return cls(clauses, variable_number)
+
+    def _add_clause(self, literals):
+        """Add a clause of internal literals before solving."""
+        if self.unsatisfiable:
+            return
+        clause = []
+        for literal in literals:
+            if literal ^ 1 in clause:
+                return  # always true
+            if literal not in clause:
+                clause.append(literal)
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            value = self.values[clause[0]]
+            if value == self.FALSE:
+                self.unsatisfiable = True
+            elif value == self.UNASSIGNED:
+                self._assign(clause[0], None)
+        else:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+    def _assign(self, literal, reason):
+        """Make the literal true at the current decision level."""
+        values = self.values
+        values[literal] = self.TRUE
+        values[literal ^ 1] = self.FALSE
+        variable = literal >> 1
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """Assign every literal implied by a unit clause.
+
+        Return the clause with every literal false if there is a conflict,
+        otherwise None.
+        """
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        TRUE, FALSE = self.TRUE, self.FALSE
+        while self.queue_head < len(trail):
+            false_literal = trail[self.queue_head] ^ 1
+            self.queue_head += 1
+            self.propagations += 1
+            watching = watches[false_literal]
+            i = j = 0
+            watch_number = len(watching)
+            while i < watch_number:
+                clause = watching[i]
+                i += 1
+                # Keep the false literal second
+                if clause[0] == false_literal:
+                    clause[0] = clause[1]
+                    clause[1] = false_literal
+                first = clause[0]
+                if values[first] == TRUE:
+                    watching[j] = clause
+                    j += 1
+                    continue
+                # Look for a literal which is not false to watch instead
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if values[literal] != FALSE:
+                        clause[1] = literal
+                        clause[k] = false_literal
+                        watches[literal].append(clause)
+                        break
+                else:
+                    watching[j] = clause
+                    j += 1
+                    if values[first] == FALSE:  # every literal is false
+                        while i < watch_number:
+                            watching[j] = watching[i]
+                            i += 1
+                            j += 1
+                        del watching[j:]
+                        return clause
+                    self._assign(first, clause)
+            del watching[j:]
+        return None
+
+    def _analyse(self, conflict):
+        """Return the clause learnt from the conflict and the level to jump to.
+
+        Resolution with the reasons of the literals assigned at the current
+        level continues until one of them is left, the first unique
+        implication point. The learnt clause has the negation of that
+        literal first, and a literal from the level to jump back to second.
+        """
+        levels = self.levels
+        trail = self.trail
+        current_level = len(self.trail_limits)
+        seen = set()
+        learnt = [None]
+        pending = 0  # literals at the current level still to resolve
+        literal = None
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            for other in clause:
+                if other == literal:
+                    continue
+                variable = other >> 1
+                if variable not in seen and levels[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if levels[variable] == current_level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+            # Find the latest assigned literal taking part in the conflict
+            while trail[index] >> 1 not in seen:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            seen.discard(literal >> 1)
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[literal >> 1]
+        learnt[0] = literal ^ 1
+
+        if len(learnt) == 1:
+            return learnt, 0
+        highest = max(range(1, len(learnt)),
+                      key=lambda i: levels[learnt[i] >> 1])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        return learnt, levels[learnt[1] >> 1]
+
+    def _backtrack(self, level):
+        """Undo the assignments made above the given decision level."""
+        if len(self.trail_limits) <= level:
+            return
+        values = self.values
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            variable = literal >> 1
+            values[literal] = values[literal ^ 1] = self.UNASSIGNED
+            self.reasons[variable] = None
+            self.phases[variable] = self.FALSE if literal & 1 else self.TRUE
+            heapq.heappush(self.heap,
+                           (-self.activities[variable], variable))
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.queue_head = len(self.trail)
+
+    def _bump(self, variable):
+        """Raise the activity of the variable."""
+        activities = self.activities
+        activities[variable] += self.activity_increment
+        if activities[variable] > 1e100:
+            for i in range(len(activities)):
+                activities[i] *= 1e-100
+            self.activity_increment *= 1e-100
+            self._rebuild_heap()
+        elif len(self.heap) > 4 * self.variable_number + 100:
+            self._rebuild_heap()  # drop the out of date entries
+        elif self.values[2 * variable] == self.UNASSIGNED:
+            heapq.heappush(self.heap, (-activities[variable], variable))
+
+    def _rebuild_heap(self):
+        """Make a heap of the unassigned variables by activity."""
+        self.heap = [(-self.activities[variable], variable)
+                     for variable in range(1, self.variable_number + 1)
+                     if self.values[2 * variable] == self.UNASSIGNED]
+        heapq.heapify(self.heap)
+
+    def _pick_branch_literal(self):
+        """Return the literal to decide on next, or None if all are set.
+
+        Every unassigned variable has an entry in the heap with its current
+        activity. Entries of assigned variables, or with an old activity,
+        are dropped as they come up.
+        """
+        heap = self.heap
+        values = self.values
+        activities = self.activities
+        while heap:
+            negative_activity, variable = heapq.heappop(heap)
+            if (values[2 * variable] == self.UNASSIGNED
+                    and -negative_activity == activities[variable]):
+                if self.phases[variable] == self.TRUE:
+                    return 2 * variable
+                return 2 * variable + 1
+        return None
+
+    def _luby(self, i):
+        """Return the ith term of the Luby sequence 1, 1, 2, 1, 1, 2, 4..."""
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        while i != (1 << k) - 1:
+            i -= (1 << (k - 1)) - 1
+            k = 1
+            while (1 << k) - 1 < i:
+                k += 1
+        return 1 << (k - 1)
+
+    def solve(self):
+        """Return a satisfying assignment, or None if there is none.
+
+        The assignment is a dictionary {variable: True or False} of every
+        variable.
+        """
+        if self.unsatisfiable or self._propagate() is not None:
+            self.unsatisfiable = True
+            return None
+
+        restart = 1
+        conflict_limit = 100 * self._luby(restart)
+        conflicts_since_restart = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts_since_restart += 1
+                if not self.trail_limits:  # conflict at level 0
+                    self.unsatisfiable = True
+                    return None
+                learnt, level = self._analyse(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self.learnt_clauses.append(learnt)
+                    self._assign(learnt[0], learnt)
+                self.activity_increment /= self.activity_decay
+                continue
+
+            if conflicts_since_restart >= conflict_limit:
+                restart += 1
+                conflict_limit = 100 * self._luby(restart)
+                conflicts_since_restart = 0
+                self._backtrack(0)
+                continue
+
+            literal = self._pick_branch_literal()
+            if literal is None:
+                return {variable: self.values[2 * variable] == self.TRUE
+                        for variable in range(1, self.variable_number + 1)}
+            self.decisions += 1
+            self.trail_limits.append(len(self.trail))
+            self._assign(literal, None)
@@ -9,47 +9,75 @@ Scanner - reads definition file and translates characters into symbols.
 Symbol - encapsulates a symbol and stores its properties.
 """
 
-import sys
+import collections
+import io
+import re
 
 
-class Symbol:
+class Symbol(collections.namedtuple(
+        "Symbol", ["type", "id", "line", "position_in_line"],
+        defaults=[None, None, None, None])):
     """Encapsulate a symbol and store its properties.
 
+    Symbols are immutable, slotted tuples, so they are cheap to create and
+    can be kept by reference without being copied.
+
     Parameters
     ----------
-    No parameters.
+    type: symbol type, one of Scanner.symbol_type_list or None.
+    id: name ID of a name or keyword, value of a number, text of a string,
+        or None.
+    line: line of the symbol in the file, counted from 0.
+    position_in_line: position of the symbol in its line.
 
     Public methods
     --------------
     No public methods.
     """
 
-    def __init__(self):
-        """Initialise symbol properties."""
-        self.type = None
-        self.id = None
-        self.line = None
-        self.position_in_line = None
+    __slots__ = ()
+
+
+Token = Symbol  # name used by the token stream API
 
 
 class Scanner:
     """Read circuit definition file and translate the characters into symbols.
 
-    Once supplied with the path to a valid definition file, the scanner
-    translates the sequence of characters in the definition file into symbols
-    that the parser can use. It also skips over comments and irrelevant
+    Once supplied with a valid definition file, the scanner translates the
+    sequence of characters in the definition file into symbols that the
+    parser can use. It also skips over comments and irrelevant
     formatting characters, such as spaces and line breaks.
 
+    The whole file is read into memory once, and symbols are found by index
+    scanning with compiled regular expressions rather than by reading one
+    character at a time.
+
     Parameters
     ----------
-    path: path to the circuit definition file.
+    source: path to the circuit definition file, or the definition itself as
+            bytes or as a readable text stream.
     names: instance of the names.Names() class.
 
+    The path of the definition file is kept in the path attribute, or None
+    if the definition was not read from a file, so that files named in it
+    can be found.
+
     Public methods
     -------------
+    from_string(cls, text, names, path=None): Returns a Scanner for a
+                                   definition held in a string.
+
     get_symbol(self): Translates the next sequence of characters into a symbol
                       and returns the symbol.
 
+    get_token(self): Returns the next symbol as a Token.
+
+    peek_token(self, offset=0): Returns an upcoming Token without consuming it.
+
+    tokens(self, batch_size=None): Yields the remaining Tokens in the file,
+                                   singly or in lists of batch_size.
+
     print_location(self, symbol): Prints where on the line a given symbol
                                   is with a caret.
 
@@ -57,22 +85,41 @@ class Scanner:
     -------------
     _skip_spaces_and_comments(self): Skips white spaces and comments.
 
-    _get_name(self): Returns the next name in the file as a string.
+    _scan_token(self): Translates the next sequence of characters into a
+                       Token.
 
-    _get_number(self): Returns the next number in the file as an integer.
+    _move_to(self, index): Moves the current character to the given index in
+                           the file, keeping track of the line.
 
-    _advance(self): Reads the next character in the file.
+    _record_hash(self): Stores the location of the current hash character.
+
+    _get_line_starts(self): Returns the index in the file at which each line
+                            starts.
+
+    _get_line(self, line): Returns the text of the given line.
     """
 
-    def __init__(self, path, names):
-        """Open specified file and initialise reserved words and IDs."""
-        try:
-            self.file = open(path, "r")
-            self.file.seek(0, 0)
-        except FileNotFoundError:
-            print('File not found: please enter a valid file path.'
-                  '  Use "logsim.py -h" for help.')
-            sys.exit()
+    # str.isspace() and str.isalnum() characters, as used by the parser
+    SPACES = re.compile(r"\s*")
+    NAME_CHARACTERS = re.compile(r"\w*")
+    DIGITS = re.compile(r"\d*")
+
+    def __init__(self, source, names):
+        """Read specified source and initialise reserved words and IDs.
+
+        Raise FileNotFoundError if source is a path to a missing file.
+        """
+        if isinstance(source, (bytes, bytearray)):
+            source = io.TextIOWrapper(io.BytesIO(source))
+        if hasattr(source, "read"):
+            self.path = None
+            self.text = source.read()
+            if "\r" in self.text:  # translate newlines as open() does
+                self.text = io.StringIO(self.text, newline=None).read()
+        else:
+            self.path = source
+            with open(source, "r") as definition_file:
+                self.text = definition_file.read()
 
         self.names = names
 
@@ -86,138 +133,238 @@ class Scanner:
             self.NAME,
             self.DOT,
             self.UNTERMINATED_COMMENT,
-            self.EOF
-        ] = range(10)
+            self.EOF,
+            self.STRING,
+            self.OPEN_BRACKET,
+            self.CLOSE_BRACKET,
+            self.COLON,
+            self.OPEN_PAREN,
+            self.CLOSE_PAREN
+        ] = range(16)
+
+        self.punctuation = {",": self.COMMA, ";": self.SEMICOLON,
+                            "=": self.EQUALS, "-": self.DASH, ".": self.DOT,
+                            "[": self.OPEN_BRACKET, "]": self.CLOSE_BRACKET,
+                            ":": self.COLON, "(": self.OPEN_PAREN,
+                            ")": self.CLOSE_PAREN}
 
         self.keywords_list = [
             "DEVICES",
             "CONNECTIONS",
             "MONITOR",
             "MAIN_END",
-            "END"
+            "END",
+            "IMPORT",
+            "CIRCUIT"
             ]
 
+        # The name IDs of IMPORT and CIRCUIT are only looked up once the
+        # keywords are used, so that other files are given the same name IDs
+        # as before
         [
             self.DEVICES_ID,
             self.CONNECT_ID,
             self.MONITOR_ID,
             self.MAIN_END_ID,
             self.END_ID,
-        ] = self.names.lookup(self.keywords_list)
+        ] = self.names.lookup(self.keywords_list[:5])
 
-        self.current_character = " "
-        self.position = 0
+        # The current character is self.text[self.index], or the end of the
+        # file if the index is past the end. Before the first character is
+        # read, the current character is a space just before the file.
+        self.index = -1
         self.line = 0
-        self.position_in_line = 0
+        # Index of the line break which starts the current line. Characters
+        # on the first line are counted from 1, so it starts at -2.
+        self.line_start = -2
         self.last_hash_line = 0
         self.last_hash_position_in_line = 0
+        self.line_starts = None  # built by _get_line_starts when needed
+        self.lookahead = collections.deque()  # tokens read by peek_token
+
+    @classmethod
+    def from_string(cls, text, names, path=None):
+        """Return a Scanner for a definition held in a string.
+
+        path is the file the definition was read from, if any.
+        """
+        scanner = cls(io.StringIO(text), names)
+        scanner.path = path
+        return scanner
+
+    def _move_to(self, index):
+        """Move the current character to index, keeping track of the line."""
+        line_breaks = self.text.count("\n", self.index + 1, index + 1)
+        if line_breaks:
+            self.line += line_breaks
+            self.line_start = self.text.rfind("\n", self.index + 1,
+                                              index + 1)
+        self.index = index
+
+    def _record_hash(self):
+        """Store the location of the hash character at the current index."""
+        self.last_hash_line = self.line
+        self.last_hash_position_in_line = self.index - self.line_start - 1
 
     def _skip_spaces_and_comments(self):
-        """Skip white spaces and comments."""
-        no_of_hashtags = 0
-        while (
-            (self.current_character.isspace()
-                or no_of_hashtags % 2 != 0
-                or self.current_character == "#")
-                and self.current_character != ''
-        ):
-            if self.current_character == "#":
-                no_of_hashtags += 1
-                self.last_hash_line = self.line
-                self.last_hash_position_in_line = self.position_in_line
-
-            self._advance()
-        if self.current_character == '' and no_of_hashtags % 2 != 0:
-            return False
+        """Skip white spaces and comments.
+
+        Return False if the file ends inside a comment.
+        """
+        text = self.text
+        if self.index < 0:
+            self._move_to(0)
+        while self.index < len(text):
+            self._move_to(self.SPACES.match(text, self.index).end())
+            if self.index >= len(text) or text[self.index] != "#":
+                break
+            self._record_hash()
+            closing_hash = text.find("#", self.index + 1)
+            if closing_hash == -1:
+                self._move_to(len(text))
+                return False
+            self._move_to(closing_hash)
+            self._record_hash()
+            self._move_to(closing_hash + 1)
         return True
 
-    def _get_name(self):
-        """Return the next name in the file as a string."""
-        name = ""
-        while (self.current_character.isalnum() or
-                self.current_character == "_"):
-            name = name + self.current_character
-            self._advance()
-        return name
-
-    def _get_number(self):
-        """Return the next number in the file."""
-        number = ""
-        while self.current_character.isdigit():
-            number = number + self.current_character
-            self._advance()
-        return int(number)
-
-    def _advance(self):
-        """Read another character in the file."""
-        self.current_character = self.file.read(1)
-        self.position_in_line += 1
-        if self.current_character == "\n":
-            self.line += 1
-            self.position_in_line = -1
-
-    def get_symbol(self):
-        """Translate the next sequence of characters into a symbol."""
-        symbol = Symbol()
+    def _scan_token(self):
+        """Translate the next sequence of characters into a token."""
         if self._skip_spaces_and_comments() is False:
-            symbol.type = self.UNTERMINATED_COMMENT
-            symbol.position_in_line = self.last_hash_position_in_line
-            symbol.line = self.last_hash_line
-            self._advance()
-            return symbol
-        symbol.position_in_line = self.position_in_line
-        symbol.line = self.line
-        if self.current_character.isalpha():
-            name_string = self._get_name()
+            token = Symbol(self.UNTERMINATED_COMMENT, None,
+                           self.last_hash_line,
+                           self.last_hash_position_in_line)
+            self._move_to(self.index + 1)
+            return token
+        line = self.line
+        position_in_line = self.index - self.line_start - 1
+
+        text = self.text
+        if self.index < len(text):
+            character = text[self.index]
+        else:
+            character = ""  # end of file
+
+        symbol_type = None
+        symbol_id = None
+        if character.isalpha():
+            end = self.NAME_CHARACTERS.match(text, self.index).end()
+            name_string = text[self.index:end]
+            self._move_to(end)
             if name_string in self.keywords_list:
-                symbol.type = self.KEYWORD
+                symbol_type = self.KEYWORD
             else:
-                symbol.type = self.NAME
-            [symbol.id] = self.names.lookup([name_string])
-        elif self.current_character.isdigit():
-            symbol.id = self._get_number()
-            symbol.type = self.NUMBER
-        elif self.current_character == "=":
-            symbol.type = self.EQUALS
-            self._advance()
-        elif self.current_character == ",":
-            symbol.type = self.COMMA
-            self._advance()
-        elif self.current_character == ";":
-            symbol.type = self.SEMICOLON
-            self._advance()
-        elif self.current_character == "-":
-            symbol.type = self.DASH
-            self._advance()
-        elif self.current_character == ".":
-            symbol.type = self.DOT
-            self._advance()
-        elif self.current_character == "":  # end of file
-            symbol.type = self.EOF
+                symbol_type = self.NAME
+            symbol_id = self.names.lookup([name_string])[0]
+        elif character.isdigit():
+            end = self.DIGITS.match(text, self.index).end()
+            symbol_id = int(text[self.index:end])
+            symbol_type = self.NUMBER
+            self._move_to(end)
+        elif character in self.punctuation:
+            symbol_type = self.punctuation[character]
+            self._move_to(self.index + 1)
+        elif character == '"':
+            # A string ends with a double quote on the same line
+            end = text.find('"', self.index + 1)
+            line_end = text.find("\n", self.index + 1)
+            if end == -1 or line_end != -1 and line_end < end:
+                self._move_to(self.index + 1)  # not a valid string
+            else:
+                symbol_id = text[self.index + 1:end]
+                symbol_type = self.STRING
+                self._move_to(end + 1)
+        elif character == "":  # end of file
+            symbol_type = self.EOF
         else:  # not a valid character
-            self._advance()
-        return symbol
+            self._move_to(self.index + 1)
+        return Symbol(symbol_type, symbol_id, line, position_in_line)
+
+    def get_token(self):
+        """Return the next token, taking it from the lookahead buffer first."""
+        if self.lookahead:
+            return self.lookahead.popleft()
+        return self._scan_token()
+
+    def peek_token(self, offset=0):
+        """Return a token after the next one without consuming it.
+
+        peek_token(0) returns the token the next get_token() call returns,
+        peek_token(1) the one after it, and so on. Peeked tokens are kept in
+        the lookahead buffer until they are consumed.
+        """
+        while len(self.lookahead) <= offset:
+            self.lookahead.append(self._scan_token())
+        return self.lookahead[offset]
+
+    def tokens(self, batch_size=None):
+        """Yield the remaining tokens in the file, up to and including EOF.
+
+        If batch_size is given, lists of up to batch_size tokens are yielded
+        instead of single tokens.
+        """
+        if batch_size is None:
+            while True:
+                token = self.get_token()
+                yield token
+                if token.type == self.EOF:
+                    return
+        batch = []
+        while True:
+            token = self.get_token()
+            batch.append(token)
+            if token.type == self.EOF:
+                yield batch
+                return
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+    def get_symbol(self):
+        """Translate the next sequence of characters into a symbol."""
+        return self.get_token()
+
+    def _get_line_starts(self):
+        """Return the index in the file at which each line starts.
+
+        The table is built the first time a location is printed.
+        """
+        if self.line_starts is None:
+            self.line_starts = [0] + [line_break.end() for line_break in
+                                      re.finditer("\n", self.text)]
+            if self.line_starts[-1] == len(self.text):
+                self.line_starts.pop()  # no characters after the last break
+        return self.line_starts
+
+    def _get_line(self, line):
+        """Return the text of the given line, including its line break."""
+        line_starts = self._get_line_starts()
+        if line + 1 < len(line_starts):
+            return self.text[line_starts[line]:line_starts[line + 1]]
+        return self.text[line_starts[line]:]
 
     def print_location(self, symbol):
         """Print where the line a symbol is on with a caret."""
         line = symbol.line
         position_in_line = symbol.position_in_line
-        self.position = self.file.tell()
-        self.file.seek(0, 0)
-        lines = self.file.readlines()
-        if len(lines) != 0:
+        if len(self._get_line_starts()) != 0:
             if symbol.type == self.EOF:
                 position_in_line -= 1
-                while position_in_line >= len(lines[line]) and line != 0:
+                if line >= len(self._get_line_starts()):
+                    # File ends with a line break: point after the last line
+                    line = len(self._get_line_starts()) - 1
+                    position_in_line = len(self._get_line(line)) - 1
+                while (position_in_line >= len(self._get_line(line))
+                       and line != 0):
                     line -= 1
-                    position_in_line = len(lines[line])-1
+                    position_in_line = len(self._get_line(line))-1
                 if line == 0:
                     line = None
                     position_in_line = None
 
             if line is not None:
                 print("Error on line " + str(line + 1))
-                line_to_print = lines[line]
+                line_to_print = self._get_line(line)
                 print(line_to_print, end="")
                 if line_to_print[-1] != "\n":
                     print("")
@@ -226,4 +373,3 @@ class Scanner:
                     string = string + " "
                 string = string + "^"
                 print(string)
-        self.file.seek(self.position)
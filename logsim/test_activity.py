@@ -0,0 +1,85 @@
+"""Test the activity module."""
+import pytest
+
+from names import Names
+from network import Network
+from devices import Devices
+from monitors import Monitors
+
+
+@pytest.fixture
+def monitors_with_activity():
+    """Return a Monitors instance accumulating activity for a NOT gate."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [SW1_ID, NOT1_ID, I1] = names.lookup(["Sw1", "Not1", "I1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(NOT1_ID, devices.NOT)
+    network.make_connection(SW1_ID, None, NOT1_ID, I1)
+    monitors.make_monitor(SW1_ID, None)
+    monitors.enable_activity()
+    return monitors
+
+
+def run_with_switch(monitors, switch_levels):
+    """Run one cycle for each switch level in switch_levels."""
+    names = monitors.names
+    [SW1_ID] = names.lookup(["Sw1"])
+    for level in switch_levels:
+        monitors.devices.set_switch(SW1_ID, level)
+        monitors.network.execute_network()
+        monitors.record_signals()
+
+
+def test_activity_statistics(monitors_with_activity):
+    """Test if toggles, edges and time high are counted for every output."""
+    monitors = monitors_with_activity
+    [SW1_ID, NOT1_ID] = monitors.names.lookup(["Sw1", "Not1"])
+    run_with_switch(monitors, [0, 1, 1, 0, 1, 1, 1, 0])
+
+    assert monitors.get_activity(SW1_ID, None) == {
+        "toggles": 4, "rising": 2, "falling": 2, "high_fraction": 5 / 8}
+
+    # The NOT gate is not monitored but its statistics are still kept
+    assert monitors.get_activity(NOT1_ID, None) == {
+        "toggles": 4, "rising": 2, "falling": 2, "high_fraction": 3 / 8}
+
+
+def test_activity_removed_device(monitors_with_activity):
+    """Test if an output removed from the network is no longer sampled."""
+    monitors = monitors_with_activity
+    [SW1_ID, NOT1_ID] = monitors.names.lookup(["Sw1", "Not1"])
+    run_with_switch(monitors, [0, 1])
+    monitors.devices.remove_device(NOT1_ID)
+    run_with_switch(monitors, [0, 1, 0])
+
+    assert monitors.get_activity(SW1_ID, None)["toggles"] == 4
+    assert monitors.get_activity(NOT1_ID, None)["toggles"] == 1
+
+
+def test_activity_reset_and_disable(monitors_with_activity):
+    """Test if activity is cleared on reset and absent when disabled."""
+    monitors = monitors_with_activity
+    [SW1_ID] = monitors.names.lookup(["Sw1"])
+    run_with_switch(monitors, [0, 1])
+    monitors.reset_monitors()
+    assert monitors.get_activity(SW1_ID, None)["toggles"] == 0
+    assert monitors.activity.cycles == 0
+
+    monitors.disable_activity()
+    run_with_switch(monitors, [0, 1])
+    assert monitors.get_activity(SW1_ID, None) is None
+
+
+def test_display_activity(capsys, monitors_with_activity):
+    """Test if the activity table is displayed in the console."""
+    monitors = monitors_with_activity
+    run_with_switch(monitors, [1, 1, 0, 0])
+    monitors.display_activity()
+    out, _ = capsys.readouterr()
+    lines = out.split("\n")
+    assert lines[0] == "Signal: toggles rising falling high"
+    assert "Sw1   :       1      0       1 0.50" in lines
@@ -133,6 +133,26 @@ def test_get_signal_ids(devices_with_items):
 
     assert devices.get_signal_ids("And1.I1") == [AND1, I1]
     assert devices.get_signal_ids("And1") == [AND1, None]
+    # Hierarchical device names contain dots themselves
+    [ALU3_G7, Q] = names.lookup(["alu3.g7", "Q"])
+    assert devices.get_signal_ids("alu3.g7.Q") == [ALU3_G7, Q]
+
+
+def test_signal_name_index(devices_with_items):
+    """Test if the signal name index is updated as devices are made."""
+    devices = devices_with_items
+    names = devices.names
+    [AND1, SW1, D1, I1, I2] = names.lookup(["And1", "Sw1", "D1", "I1", "I2"])
+
+    assert devices.output_names[(SW1, None)] == "Sw1"
+    assert devices.input_names[(AND1, I2)] == "And1.I2"
+    assert devices.signal_ids["And1.I1"] == [AND1, I1]
+
+    version = devices.version
+    devices.make_device(D1, devices.D_TYPE)
+    assert devices.version > version
+    assert devices.get_signal_ids("D1.QBAR") == [D1, devices.QBAR_ID]
+    assert list(devices.output_names.values())[-2:] == ["D1.Q", "D1.QBAR"]
 
 
 def test_set_switch(new_devices):
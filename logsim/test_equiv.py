@@ -0,0 +1,167 @@
+"""Test the equiv module."""
+import pytest
+
+from equiv import check_equivalence, main
+
+XOR_GATE = """
+DEVICES
+SWITCH, 0 = A;
+SWITCH, 0 = B;
+XOR = G1;
+AND, 2 = G2;
+END
+CONNECTIONS
+A - G1.I1; B - G1.I2;
+A - G2.I1; B - G2.I2;
+END
+MONITOR
+G1; G2;
+END
+MAIN_END
+"""
+
+NAND_XOR = """
+DEVICES
+SWITCH, 0 = A;
+SWITCH, 0 = B;
+NAND, 2 = N1;
+NAND, 2 = N2;
+NAND, 2 = N3;
+{kind}, 2 = G1;
+NOT = G2;
+END
+CONNECTIONS
+A - N1.I1; B - N1.I2;
+A - N2.I1; N1 - N2.I2;
+B - N3.I1; N1 - N3.I2;
+N2 - G1.I1; N3 - G1.I2;
+N1 - G2.I1;
+END
+MONITOR
+G1; G2; N1;
+END
+MAIN_END
+"""
+
+CLOCKED_GATE = """
+DEVICES
+SWITCH, 0 = A;
+CLOCK, 1 = CL;
+DTYPE = D;
+XOR = G1;
+END
+CONNECTIONS
+CL - D.CLK; A - D.DATA; A - D.SET; A - D.CLEAR;
+D.Q - G1.I1; A - G1.I2;
+END
+MONITOR
+{monitors}
+END
+MAIN_END
+"""
+
+
+SHARED_XOR = """
+DEVICES
+SWITCH, 0 = A;
+SWITCH, 0 = B;
+XOR = G0;
+AND, 2 = G1;
+NAND, 2 = G2;
+END
+CONNECTIONS
+A - G0.I1; B - G0.I2;
+{input} - G1.I1; {input} - G1.I2;
+A - G2.I1; B - G2.I2;
+END
+MONITOR
+G0; G1; G2;
+END
+MAIN_END
+"""
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    """Return a function which writes a definition file and its path."""
+    def write(name, text):
+        path = tmp_path / name
+        path.write_text(text)
+        return str(path)
+    return write
+
+
+def test_equivalent_files(write_file):
+    """Test if circuits computing the same signals are equivalent."""
+    first = write_file("first.txt", XOR_GATE)
+    second = write_file("second.txt", NAND_XOR.format(kind="NAND"))
+    result = check_equivalence(first, second)
+    assert result["errors"] == []
+    assert result["equivalent"] is True
+    assert result["signals"] == ["G1", "G2"]
+    assert result["unmatched"] == ["N1"]
+    assert result["switches"] is None
+
+
+def test_counterexample(write_file):
+    """Test if a switch setting where a signal differs is found."""
+    first = write_file("first.txt", XOR_GATE)
+    second = write_file("second.txt", NAND_XOR.format(kind="NOR"))
+    result = check_equivalence(first, second)
+    assert result["equivalent"] is False
+    switches = result["switches"]
+    assert sorted(switches) == ["A", "B"]
+    # G1 is always LOW in the second file, so it differs only when A != B
+    assert switches["A"] != switches["B"]
+    assert result["differences"] == {"G1": (1, 0)}
+
+
+def test_counterexample_shared_xor(write_file):
+    """Test a miter made of an XOR node of one of the files."""
+    # G1 is A in one file and B in the other, so the miter is G0
+    first = write_file("first.txt", SHARED_XOR.format(input="A"))
+    second = write_file("second.txt", SHARED_XOR.format(input="B"))
+    result = check_equivalence(first, second)
+    assert result["errors"] == []
+    assert result["equivalent"] is False
+    switches = result["switches"]
+    assert result["differences"] == {"G1": (switches["A"], switches["B"])}
+    assert switches["A"] != switches["B"]
+
+
+def test_files_not_compared(write_file):
+    """Test if errors are given for files which cannot be compared."""
+    first = write_file("first.txt", XOR_GATE)
+    clocked_path = write_file("clocked.txt",
+                              CLOCKED_GATE.format(monitors="D.Q;"))
+    result = check_equivalence(first, clocked_path)
+    assert result["equivalent"] is None
+    assert result["errors"] == ["No signal is monitored in both files"]
+
+    clocked_path = write_file("clocked.txt",
+                              CLOCKED_GATE.format(monitors="G1;"))
+    result = check_equivalence(first, clocked_path)
+    assert result["equivalent"] is None
+    assert result["errors"] == [
+        clocked_path + ": G1 depends on a clock, flip-flop or loop"]
+
+    result = check_equivalence(first, "missing_file.txt")
+    assert result["equivalent"] is None
+    assert result["errors"][0].startswith("missing_file.txt: ")
+
+
+def test_main(capsys, write_file):
+    """Test if the result is printed with an exit status."""
+    first = write_file("first.txt", XOR_GATE)
+    main([first, write_file("second.txt", NAND_XOR.format(kind="NAND"))])
+    assert capsys.readouterr().out.splitlines()[-1] == \
+        "Equivalent: G1, G2 match for every switch setting"
+
+    with pytest.raises(SystemExit) as error:
+        main([first, write_file("third.txt", NAND_XOR.format(kind="NOR"))])
+    assert error.value.code == 1
+    assert "Not equivalent" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as error:
+        main([first])
+    assert error.value.code == 2
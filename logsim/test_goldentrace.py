@@ -0,0 +1,81 @@
+"""Test the goldentrace module."""
+import pytest
+
+from goldentrace import GoldenTrace, run_definition_file, main
+
+
+@pytest.fixture
+def golden():
+    """Return a GoldenTrace holding two signals."""
+    return GoldenTrace({"A": bytes([0, 1, 1, 0, 0, 1]),
+                        "G.Q": bytes([1, 1, 1, 1, 1, 1])}, 6, 0)
+
+
+def test_compare_traces(golden):
+    """Test if compare_traces finds mismatch counts and windows."""
+    diff = golden.compare_traces("A", bytes([0, 1, 1, 0, 0, 1]),
+                                 bytes([0, 0, 0, 0, 1, 1]))
+    assert diff.first_mismatch == 1
+    assert diff.mismatch_count == 3
+    assert diff.windows == [(1, 3), (4, 5)]
+
+    diff = golden.compare_traces("A", bytes([0, 1]), bytes([0, 1, 1, 1]))
+    assert (diff.first_mismatch, diff.mismatch_count) == (2, 2)
+    assert diff.windows == [(2, 4)]
+
+    diff = golden.compare_traces("A", bytes([0, 1, 1]), bytes([0, 0]))
+    assert diff.windows == [(1, 3)]
+
+
+def test_compare(golden):
+    """Test if compare only reports the signals which differ."""
+    current = GoldenTrace({"A": bytes([0, 1, 1, 0, 0, 1]),
+                           "G.Q": bytes([1, 1, 1, 0, 1, 1]),
+                           "G.QBAR": bytes([0, 0])}, 6, 0)
+    diffs = golden.compare(current)
+    assert [diff.signal_name for diff in diffs] == ["G.Q", "G.QBAR"]
+    assert golden.first_divergence(diffs) == 0
+    assert golden.compare(golden) == []
+    assert golden.first_divergence([]) is None
+
+    # A signal with an empty trace in the current run only does not differ
+    current.signals["G.QBAR"] = b""
+    diffs = golden.compare(current)
+    assert [diff.signal_name for diff in diffs] == ["G.Q"]
+    assert golden.first_divergence(diffs) == 3
+
+
+def test_compare_long_traces():
+    """Test if million-cycle traces are compared correctly."""
+    trace = bytes([0, 1] * 500000)
+    changed = bytearray(trace)
+    changed[654321] = 3
+    golden = GoldenTrace({"A": trace}, len(trace))
+    diffs = golden.compare(GoldenTrace({"A": bytes(changed)}, len(trace)))
+    assert len(diffs) == 1
+    assert diffs[0].first_mismatch == 654321
+    assert diffs[0].windows == [(654321, 654322)]
+
+
+def test_save_and_load(tmp_path, golden):
+    """Test if a reference run is stored and read back unchanged."""
+    path = str(tmp_path / "golden.json")
+    golden.save(path)
+    loaded = GoldenTrace.load(path)
+    assert loaded.signals == golden.signals
+    assert (loaded.cycles, loaded.seed) == (6, 0)
+
+
+def test_main_exit_status(tmp_path):
+    """Test if the command line entry point fails on a mismatch."""
+    path = str(tmp_path / "golden.json")
+    main(["-r", path, "-n", "20", "demo_files/counter.txt"])
+    main(["-g", path, "demo_files/counter.txt"])  # no exit on a match
+
+    monitors = run_definition_file("demo_files/counter.txt", 20, 0)
+    golden = GoldenTrace.from_monitors(monitors, 20, 0)
+    golden.signals["D3.Q"] = bytes(20)
+    golden.save(path)
+    with pytest.raises(SystemExit) as error:
+        main(["-g", path, "demo_files/counter.txt"])
+    assert error.value.code == 1
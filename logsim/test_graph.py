@@ -1,4 +1,5 @@
 """Test Graph module."""
+import itertools
 
 from graph import Graph
 
@@ -44,9 +45,10 @@ def test_create_boolean_from_monitor():
     parser = Parser(names, devices, network, monitors, scanner)
     parser.parse_network()
 
-    # Test file including DTYPE, should return False
-    bool_exp = graph.create_boolean_from_monitor('A0')
+    # Test signal depending on a DTYPE, should return False
+    bool_exp = graph.create_boolean_from_monitor('G3')
     assert not bool_exp
+    assert graph.create_boolean_from_monitor('A0') == 'A0'
 
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
@@ -60,99 +62,187 @@ def test_create_boolean_from_monitor():
     assert not bool_exp
 
 
-def test_get_sub_exp_end():
-    """Check get_sub_exp_end(...) runs correctly."""
+def test_create_boolean_from_deep_monitor():
+    """Check create_boolean_from_monitor(...) names shared gates."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
-
-    assert graph.get_sub_exp_end('((A*B)+(B.A))', 5, True) == 1
-    assert graph.get_sub_exp_end('(((A+B).(¬A+¬B))+(B.A))', 19, True) == 1
-    assert graph.get_sub_exp_end(
-        '((((A+B)+B).((A+B)+A)).((¬A+¬B)+(B.A)))', 21, True) == 9
-    assert graph.get_sub_exp_end(
-        '((((A+B)+B).((A+B)+A)).((¬A+¬B)+(B.A)))', 23, False) == 7
-
-
-def test_expand_xors():
-    """Check that expand_xors(...) runs correctly."""
+    [A, B, I1, I2, I3] = names.lookup(['A', 'B', 'I1', 'I2', 'I3'])
+    devices.make_device(A, devices.SWITCH, 0)
+    devices.make_device(B, devices.SWITCH, 0)
+
+    # Each stage Gi = NOR(Gi-1, ¬Gi-1, B) uses the previous stage twice
+    previous = A
+    for i in range(100):
+        [gate, inverter] = names.lookup(['G' + str(i), 'N' + str(i)])
+        devices.make_device(inverter, devices.NOT)
+        devices.make_device(gate, devices.NOR, 3)
+        network.make_connection(previous, None, inverter, I1)
+        network.make_connection(previous, None, gate, I1)
+        network.make_connection(inverter, None, gate, I2)
+        network.make_connection(B, None, gate, I3)
+        previous = gate
+
+    # ¬Gi is the OR of stage i, which is also the output of Ni+1
+    assert graph.create_boolean_from_monitor('G0') == '¬(A+¬A+B)'
+    assert graph.create_boolean_from_monitor('G1') == \
+        '¬(¬N1+N1+B) where N1 = (A+¬A+B)'
+    bool_exp = graph.create_boolean_from_monitor('G99')
+    assert bool_exp.startswith('¬(¬N99+N99+B) where N1 = (A+¬A+B), ')
+    assert len(bool_exp) < 100 * 30
+
+
+def test_create_boolean_after_edit():
+    """Check create_boolean_from_monitor(...) follows network edits."""
+    names, devices, network, monitors = init_modules()
+    graph = Graph(names, devices, network, monitors)
+    [A, B, G, X, N, H, I1, I2] = names.lookup(
+        ['A', 'B', 'G', 'X', 'N', 'H', 'I1', 'I2'])
+    devices.make_device(A, devices.SWITCH, 0)
+    devices.make_device(B, devices.SWITCH, 0)
+    devices.make_device(G, devices.XOR)
+    devices.make_device(N, devices.NOT)
+    devices.make_device(H, devices.AND, 2)
+    network.make_connection(A, None, G, I1)
+    network.make_connection(B, None, G, I2)
+    network.make_connection(G, None, N, I1)
+    network.make_connection(G, None, H, I1)
+    network.make_connection(N, None, H, I2)
+    assert graph.create_boolean_from_monitor('H') == \
+        '(G.¬G) where G = (A*B)'
+    node_number = len(graph.nodes)
+    assert graph.create_boolean_from_monitor('H') == \
+        '(G.¬G) where G = (A*B)'
+    assert len(graph.nodes) == node_number
+
+    # Replace G by X, with its inputs the other way round
+    network.delete_connection(N, I1)
+    network.delete_connection(H, I1)
+    devices.remove_device(G)
+    devices.make_device(X, devices.XOR)
+    network.make_connection(B, None, X, I1)
+    network.make_connection(A, None, X, I2)
+    network.make_connection(X, None, N, I1)
+    network.make_connection(X, None, H, I1)
+    assert graph.create_boolean_from_monitor('H') == \
+        '(X.¬X) where X = (B*A)'
+    assert len(graph.nodes) == node_number
+
+
+def test_get_node():
+    """Check that get_node(...) shares equal expressions."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
 
-    assert graph.expand_xors('(A*B)') == '((A+B).(¬A+¬B))'
-    assert graph.expand_xors('((A*B)+(C.A))') == '(((A+B).(¬A+¬B))+(C.A))'
+    a = graph.get_node('VAR', 'A')
+    b = graph.get_node('VAR', 'B')
+    assert graph.get_node('VAR', 'A') == a
+    assert graph.get_node('AND', (a, b)) == graph.get_node('AND', (b, a, b))
+    assert graph.get_node('OR', (a, a)) == a
+    assert graph.get_node('NOT', (graph.get_node('NOT', (a,)),)) == a
+    assert graph.get_node('XOR', (a, b)) != graph.get_node('OR', (a, b))
+    assert len(graph.nodes) == 6
 
 
-def test_demorgan_push():
-    """Check that demogan_push(...) runs correctly."""
+def test_build_expression():
+    """Check build_expression(...) builds the DAG of a signal."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
+    scanner = Scanner('gui_test_files/gui_test1.txt', names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    parser.parse_network()
 
-    assert graph.demorgan_push('(A+B)') == '(A+B)'
-    assert graph.demorgan_push('¬(A+¬B)') == '(¬A.B)'
-    assert graph.demorgan_push('¬(¬(A+¬B).¬C)') == '((A+¬B)+C)'
-
+    a0 = graph.get_node('VAR', 'A0')
+    a1 = graph.get_node('VAR', 'A1')
+    g1 = graph.get_node('XOR', (a0, a1))
+    g2 = graph.get_node('AND', (a0, a1))
+    assert graph.build_expression('G3') == graph.get_node('OR', (g1, g2))
+    assert graph.build_expression('G1') == g1
+    assert graph.build_expression('A0') == a0
 
-def test_distribute_ors():
-    """Check that distribute_ors(...) runs correctly."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
+    scanner = Scanner('gui_test_files/gui_test5.txt', names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    parser.parse_network()
+
+    # Circular definitions have no expression
+    assert graph.build_expression('G2') is None
+
 
-    assert graph.distribute_ors('((AA.BB)+B)') == '((AA+B).(BB+B))'
-    assert graph.distribute_ors('(ABCD+(AA.BB))') == '((ABCD+AA).(ABCD+BB))'
-    assert graph.distribute_ors('((A+(B.C))+D)') == '(((A+B)+D).((A+C)+D))'
+def satisfiable(clauses, variable_number, fixed):
+    """Return True if the clauses can be satisfied with fixed variables."""
+    free = [i for i in range(1, variable_number + 1) if i not in fixed]
+    for values in itertools.product([False, True], repeat=len(free)):
+        assignment = dict(fixed)
+        assignment.update(zip(free, values))
+        if all(any(assignment[abs(literal)] == (literal > 0)
+                   for literal in clause) for clause in clauses):
+            return True
+    return False
 
 
-def test_clean_up_to_cnf():
-    """Check that clean_up_to_cnf(...) runs correctly."""
+def test_get_cnf():
+    """Check that get_cnf(...) gives an equisatisfiable Tseitin encoding."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
 
-    assert graph.clean_up_to_cnf('(((()))))))') == '(())'
-    assert graph.clean_up_to_cnf('(((((A+B)+C)+D)+E))') == '((A+B+C+D+E))'
-    assert graph.clean_up_to_cnf('(A+B).(C+D)') == '(A+B).(C+D)'
+    [a, b, c] = [graph.get_node('VAR', name) for name in 'ABC']
+    nand = graph.get_node('NOT', (graph.get_node('AND', (a, b)),))
+    node = graph.get_node('XOR', (nand, graph.get_node('OR', (b, c))))
+    clauses, variable_names = graph.get_cnf(node)
 
+    assert variable_names == ['C', 'B', '_1', 'A', '_2', '_3']
+    assert len(clauses) == len(set(clauses)) == 11
+    for values in itertools.product([False, True], repeat=3):
+        value_a, value_b, value_c = values
+        expected = (not (value_a and value_b)) != (value_b or value_c)
+        fixed = {variable_names.index(name) + 1: value
+                 for name, value in zip('ABC', values)}
+        assert satisfiable(clauses, len(variable_names), fixed) == expected
 
-def test_get_clauses():
-    """Check that get_clauses(...) runs correctly."""
+    # A NOT needs no variable of its own
+    assert graph.get_cnf(graph.get_node('NOT', (a,))) == ([(-1,)], ['A'])
+
+
+def test_get_cnf_string():
+    """Check that get_cnf_string(...) prints clauses."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
 
-    assert graph.get_clauses('((clause1).(clause2))') == ['clause1', 'clause2']
-    assert graph.get_clauses('((A+B+C).(D+E+F).(G+H+I))') == ['A+B+C', 'D+E+F',
-                                                              'G+H+I']
-    assert graph.get_clauses('((A).(B).(C).(D).(E))') == ['A', 'B', 'C', 'D',
-                                                          'E']
+    assert graph.get_cnf_string([(1, -2), (2,)], ['A', 'B']) == \
+        '(A+¬B).(B)'
+    assert graph.get_cnf_string([], []) == ''
 
 
-def test_get_literal_adc():
-    """Check that get_literal_adc(...) runs correctly."""
+def test_get_dimacs():
+    """Check that get_dimacs(...) gives the DIMACS CNF format."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
 
-    assert graph.get_literals_adc('A+¬B') == (['A', 'B'], [0, 1])
-    assert graph.get_literals_adc('A+A+A') == (['A'], [0])
-    assert graph.get_literals_adc('A+A+¬A') == (['1'], [0])
+    assert graph.get_dimacs([(1, -2), (2,)], ['A', '_1']) == \
+        'c 1 A\nc 2 _1\np cnf 2 2\n1 -2 0\n2 0\n'
 
 
-def test_in_clause_clean_up():
-    """Check that in_clause_clean_up(...) works correctly."""
+def test_find_switch_settings():
+    """Check find_switch_settings(...) drives signals HIGH and LOW."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
+    scanner = Scanner('gui_test_files/gui_test1.txt', names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    parser.parse_network()
 
-    assert graph.in_clause_clean_up('((A+B+C).(D+E+F))') == '((A+B+C).' \
-                                                            '(D+E+F))'
-    assert graph.in_clause_clean_up('((A+A+A).(A+B+¬A))') == '((A).(1))'
-    assert graph.in_clause_clean_up('((B).(A).(B+¬A))') == '((B).(A).(B+¬A))'
-
+    # G3 = (A0*A1)+(A1.A0) is only LOW when both switches are LOW
+    assert graph.find_switch_settings('G3', devices.LOW) == {
+        'A0': devices.LOW, 'A1': devices.LOW}
+    settings = graph.find_switch_settings('G3', devices.HIGH)
+    assert devices.HIGH in settings.values()
 
-def test_out_clause_clean_up():
-    """Check that out_clause_clean_up(...) works correctly."""
     names, devices, network, monitors = init_modules()
     graph = Graph(names, devices, network, monitors)
-
-    assert graph.out_clause_clean_up('((A).(B).(C))') == '((A).(B).(C))'
-    assert graph.out_clause_clean_up('((A).(A).(C))') == '((A).(C))'
-    assert graph.out_clause_clean_up('((A).(¬A).(ABC))') == '((A).(¬A).(ABC))'
+    scanner = Scanner('gui_test_files/gui_test3.txt', names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    parser.parse_network()
+    assert graph.find_switch_settings('G3', devices.HIGH) is False
 
 
 def test_add_new_line_breaks():
@@ -168,13 +258,11 @@ def test_add_new_line_breaks():
 
 
 test_create_boolean_from_monitor()
-test_get_sub_exp_end()
-test_expand_xors()
-test_demorgan_push()
-test_distribute_ors()
-test_clean_up_to_cnf()
-test_get_clauses()
-test_get_literal_adc()
-test_in_clause_clean_up()
-test_out_clause_clean_up()
+test_create_boolean_from_deep_monitor()
+test_get_node()
+test_build_expression()
+test_get_cnf()
+test_get_cnf_string()
+test_get_dimacs()
+test_find_switch_settings()
 test_add_new_line_breaks()
@@ -89,3 +89,56 @@ def test4():
                   monitors)
         gui.Show(True)
         app.MainLoop()
+
+
+def make_gui(path, names, devices, network, monitors):
+    """Return a Gui for a parsed logic description file."""
+    import builtins
+
+    builtins._ = wx.GetTranslation
+    return Gui("Logic Simulator Test", path, names, devices, network,
+               monitors)
+
+
+def test_save_round_trip(tmp_path):
+    """TEST 5: save a logic description file and parse it again."""
+    names, devices, network, monitors = init_modules()
+    path = 'gui_test_files/gui_test2.txt'
+    scanner = Scanner(path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    app = wx.App()
+    gui = make_gui(path, names, devices, network, monitors)
+    logic_file = gui.canvas.build_logic_file()
+    gui.Destroy()
+
+    saved_path = str(tmp_path / "saved.txt")
+    with open(saved_path, 'w') as f:
+        f.write(logic_file)
+    saved_names, saved_devices, saved_network, saved_monitors = \
+        init_modules()
+    parser = Parser(saved_names, saved_devices, saved_network,
+                    saved_monitors, Scanner(saved_path, saved_names))
+    assert parser.parse_network()
+    assert sorted(saved_devices.signal_ids) == sorted(devices.signal_ids)
+    assert saved_monitors.get_signal_names() == monitors.get_signal_names()
+    assert saved_monitors.get_connection_ids_and_names()[1] == \
+        monitors.get_connection_ids_and_names()[1]
+
+
+def test_save_imported_devices(tmp_path):
+    """TEST 6: refuse to save devices from an imported file."""
+    (tmp_path / "switch.txt").write_text(
+        "DEVICES\nSWITCH, 0 = S;\nEND\nCONNECTIONS\nEND\nMONITOR\nEND\n"
+        "MAIN_END\n")
+    (tmp_path / "top.txt").write_text(
+        'IMPORT "switch.txt" = A;\nDEVICES\nNOT = N;\nEND\nCONNECTIONS\n'
+        'A.S - N.I1;\nEND\nMONITOR\nN;\nEND\nMAIN_END\n')
+    names, devices, network, monitors = init_modules()
+    path = str(tmp_path / "top.txt")
+    parser = Parser(names, devices, network, monitors, Scanner(path, names))
+    assert parser.parse_network()
+    app = wx.App()
+    gui = make_gui(path, names, devices, network, monitors)
+    assert gui.canvas.build_logic_file() is None
+    gui.Destroy()
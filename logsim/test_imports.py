@@ -0,0 +1,146 @@
+"""Test the imports module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from imports import ImportResolver
+
+
+HALF_ADDER = """DEVICES
+XOR = S;
+AND, 2 = C;
+END
+CONNECTIONS
+END
+MONITOR
+C;
+END
+MAIN_END
+"""
+
+TOP = """IMPORT "half_adder.txt" = H1;
+IMPORT "half_adder.txt" = H2;
+DEVICES
+SWITCH, 1 = A;
+SWITCH, 1 = B;
+END
+CONNECTIONS
+A - H1.S.I1;
+B - H1.S.I2;
+A - H1.C.I1;
+B - H1.C.I2;
+H1.S - H2.S.I1;
+H1.C - H2.S.I2;
+H1.S - H2.C.I1;
+H1.C - H2.C.I2;
+END
+MONITOR
+H2.S;
+END
+MAIN_END
+"""
+
+
+def new_parser(path, resolver=None):
+    """Return a parser of the definition file at path."""
+    names = Names() if resolver is None else resolver.names
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    return Parser(names, devices, network, monitors, Scanner(path, names),
+                  resolver=resolver)
+
+
+@pytest.fixture
+def definition_files(tmp_path):
+    """Return a directory holding a file which imports another."""
+    (tmp_path / "half_adder.txt").write_text(HALF_ADDER)
+    (tmp_path / "top.txt").write_text(TOP)
+    return tmp_path
+
+
+def test_import_namespaces(definition_files):
+    """Test if imported devices are built in their namespaces."""
+    parser = new_parser(str(definition_files / "top.txt"))
+    assert parser.parse_network()
+    names = parser.names
+    devices = parser.devices
+    network = parser.network
+
+    assert parser.netlist.devices[0][0].id == names.query("A")
+    assert len(parser.flat_netlist.devices) == 6
+    assert sorted(parser.monitors.get_signal_names()[0]) == \
+        ["H1.C", "H2.C", "H2.S"]
+    assert network.check_network()
+    network.execute_network()
+    [H2_S] = names.lookup(["H2.S"])
+    assert network.get_output_signal(H2_S, None) == devices.HIGH
+
+
+def test_import_errors(definition_files, capsys):
+    """Test if failed imports are reported at the IMPORT statement."""
+    (definition_files / "missing.txt").write_text(
+        'IMPORT "nowhere.txt" = N;\n' + HALF_ADDER)
+    parser = new_parser(str(definition_files / "missing.txt"))
+    assert not parser.parse_network()
+    assert parser.diagnostics[-1][:3] == (1, 8, "IMPORT_ABSENT")
+
+    (definition_files / "cycle.txt").write_text(
+        'IMPORT "cycle.txt" = C2;\n' + HALF_ADDER.replace("C", "D"))
+    parser = new_parser(str(definition_files / "cycle.txt"))
+    assert not parser.parse_network()
+    assert parser.diagnostics[-1][2] == "IMPORT_CYCLE"
+
+    (definition_files / "half_adder.txt").write_text(
+        HALF_ADDER.replace("XOR", "XNOR"))
+    parser = new_parser(str(definition_files / "top.txt"))
+    assert not parser.parse_network()
+    assert [code for (_, _, code, _) in parser.diagnostics] == \
+        ["IMPORT_ERRORS"]
+    assert "Errors in imported file" in capsys.readouterr().out
+
+
+def test_import_syntax_errors():
+    """Test if errors in IMPORT statements are found."""
+    definition = 'IMPORT adder = A;\nIMPORT "a" = B;\nIMPORT "b" = B;\n' + \
+        HALF_ADDER.replace("S;", "B;")
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner.from_string(definition, names), test=True)
+    assert not parser.parse_network()
+    assert [code for (_, _, code, _) in parser.diagnostics] == \
+        ["NO_PATH", "NAMESPACE_PRESENT", "INVALID_DEVICENAME"]
+
+
+def test_import_cache(definition_files, monkeypatch):
+    """Test if only edited files are parsed again."""
+    resolver = ImportResolver(Names())
+    parsed = []
+    parse = resolver._parse
+
+    def counting_parse(text, path):
+        parsed.append(path)
+        return parse(text, path)
+
+    monkeypatch.setattr(resolver, "_parse", counting_parse)
+    assert new_parser(str(definition_files / "top.txt"),
+                      resolver).parse_network()
+    assert len(parsed) == 1  # imported twice, parsed once
+
+    (definition_files / "top.txt").write_text(TOP.replace("H2.S;", "A;"))
+    assert new_parser(str(definition_files / "top.txt"),
+                      resolver).parse_network()
+    assert len(parsed) == 1
+
+    (definition_files / "half_adder.txt").write_text(
+        HALF_ADDER.replace("C;\nEND\nMAIN", "S;\nEND\nMAIN"))
+    assert new_parser(str(definition_files / "top.txt"),
+                      resolver).parse_network()
+    assert len(parsed) == 2
@@ -0,0 +1,50 @@
+"""Test the lint module."""
+import json
+
+import pytest
+
+from lint import lint_file, lint_files, main
+
+
+def test_lint_clean_file():
+    """Test if a definition file without errors gives no diagnostics."""
+    assert lint_file("demo_files/counter.txt") == []
+
+
+def test_lint_file_diagnostics():
+    """Test if errors are returned with their code and location."""
+    diagnostics = lint_file("parser_tests/parser_test_file8.txt")
+    assert [(diagnostic["line"], diagnostic["column"], diagnostic["code"])
+            for diagnostic in diagnostics] == [(4, 8, "NO_EQUALS"),
+                                               (14, 9, "NO_DOT")]
+    assert diagnostics[0]["file"] == "parser_tests/parser_test_file8.txt"
+    assert diagnostics[0]["message"] == "Expected an equals sign here"
+
+
+def test_lint_missing_file():
+    """Test if a missing file is reported instead of raising an error."""
+    [diagnostic] = lint_file("missing_file.txt")
+    assert diagnostic["code"] == "UNREADABLE_FILE"
+    assert diagnostic["line"] is None
+
+
+def test_lint_files_in_parallel():
+    """Test if files checked in parallel give results in the given order."""
+    paths = ["demo_files/counter.txt",
+             "parser_tests/parser_test_file8.txt",
+             "parser_semantic_error_tests/1.txt",
+             "demo_files/combinatorial.txt"]
+    assert lint_files(paths, workers=2) == [lint_file(path)
+                                            for path in paths]
+
+
+def test_lint_main(capsys):
+    """Test if diagnostics are printed as JSON lines with an exit status."""
+    main(["demo_files/counter.txt"])
+    assert capsys.readouterr().out == ""
+
+    with pytest.raises(SystemExit) as error:
+        main(["demo_files/counter.txt", "parser_semantic_error_tests/1.txt"])
+    assert error.value.code == 1
+    [line] = capsys.readouterr().out.splitlines()
+    assert json.loads(line)["code"] == "DEVICE_PRESENT"
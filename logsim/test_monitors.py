@@ -89,6 +89,24 @@ def test_get_signal_names(new_monitors):
                                                ["D1.Q", "D1.QBAR"]]
 
 
+def test_get_connection_ids_and_names(new_monitors):
+    """Test if connection lists are rebuilt when connections change."""
+    names = new_monitors.names
+    network = new_monitors.network
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(["Sw1", "Sw2", "Or1",
+                                                    "I1", "I2"])
+
+    assert new_monitors.get_input_ids_and_names() == (
+        [(OR1_ID, I1), (OR1_ID, I2)], ["Or1.I1", "Or1.I2"])
+    assert new_monitors.get_connection_ids_and_names() == (
+        [((SW1_ID, None), (OR1_ID, I1)), ((SW2_ID, None), (OR1_ID, I2))],
+        ["Sw1 - Or1.I1", "Sw2 - Or1.I2"])
+
+    network.delete_connection(OR1_ID, I1)
+    assert new_monitors.get_connection_ids_and_names() == (
+        [((SW2_ID, None), (OR1_ID, I2))], ["Sw2 - Or1.I2"])
+
+
 def test_record_signals(new_monitors):
     """Test if record_signals records the correct signals."""
     names = new_monitors.names
@@ -197,3 +215,32 @@ def test_display_signals(capsys, new_monitors):
             "Clock1: -__--__--__--__--__-" in traces)
 
     assert "" in traces  # additional empty line at the end
+
+
+def test_monitors_set_cone():
+    """Test if monitors restrict the network to the cone of their outputs."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network, cone_only=True)
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(["Sw1", "Sw2", "Or1",
+                                                    "I1", "I2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(SW2_ID, devices.SWITCH, 0)
+    devices.make_device(OR1_ID, devices.OR, 2)
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    network.make_connection(SW2_ID, None, OR1_ID, I2)
+    assert network.get_cone() == set()
+
+    monitors.make_monitor(SW2_ID, None)
+    assert network.get_cone() == {SW2_ID}
+    monitors.make_monitor(OR1_ID, None)
+    assert network.get_cone() == {SW1_ID, SW2_ID, OR1_ID}
+    monitors.remove_monitor(OR1_ID, None)
+    assert network.get_cone() == {SW2_ID}
+
+    # Every output is needed in probe-all mode
+    monitors.enable_probe_all()
+    assert network.get_cone() is None
+    monitors.disable_probe_all()
+    assert network.get_cone() == {SW2_ID}
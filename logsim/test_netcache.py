@@ -0,0 +1,159 @@
+"""Test the netcache module."""
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from netcache import NetlistCache
+
+
+def build(cache, path):
+    """Build the network in path with the cache and return its monitors."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    assert cache.build_network(path, names, devices, network, monitors)
+    return monitors
+
+
+def get_network_description(monitors):
+    """Return the devices, connections and monitors as strings."""
+    devices = monitors.devices
+    connections = []
+    for device in devices.devices_list:
+        for input_id, connection in device.inputs.items():
+            connections.append(
+                (devices.get_signal_name(device.device_id, input_id),
+                 devices.get_signal_name(*connection)))
+    return (sorted(monitors.get_signal_names()[1] +
+                   monitors.get_signal_names()[0]),
+            sorted(connections))
+
+
+def test_cache_round_trip(tmp_path):
+    """Test if a cached netlist builds the same network as parsing."""
+    cache = NetlistCache(str(tmp_path))
+    path = "demo_files/counter.txt"
+    parsed = build(cache, path)
+    assert len(os.listdir(str(tmp_path))) == 1
+
+    with open(path) as definition_file:
+        text = definition_file.read()
+    assert cache.load(text, Names()) is not None
+
+    cached = build(cache, path)
+    assert get_network_description(cached) == \
+        get_network_description(parsed)
+    assert cached.get_signal_names()[0] == parsed.get_signal_names()[0]
+
+
+def test_cache_key(tmp_path):
+    """Test if the cache key changes with the source text."""
+    cache = NetlistCache(str(tmp_path))
+    assert cache.get_key("DEVICES") == cache.get_key("DEVICES")
+    assert cache.get_key("DEVICES") != cache.get_key("DEVICES ")
+    assert cache.load("DEVICES", Names()) is None
+
+
+def test_corrupt_cache_file(tmp_path):
+    """Test if an unreadable cache file is ignored."""
+    cache = NetlistCache(str(tmp_path))
+    path = "demo_files/counter.txt"
+    build(cache, path)
+    [cache_file] = os.listdir(str(tmp_path))
+    with open(os.path.join(str(tmp_path), cache_file), "wb") as f:
+        f.write(b"not a pickle")
+    build(cache, path)
+
+
+def test_cache_imported_files(tmp_path):
+    """Test if each imported file is cached on its own."""
+    cache = NetlistCache(str(tmp_path / "cache"))
+    definition = "DEVICES\n{}\nEND\nCONNECTIONS\nEND\nMONITOR\nEND\nMAIN_END\n"
+    (tmp_path / "switch.txt").write_text(definition.format("SWITCH, 0 = S;"))
+    (tmp_path / "top.txt").write_text(
+        'IMPORT "switch.txt" = A;\n' +
+        definition.format("NOT = N;").replace("CONNECTIONS\n",
+                                              "CONNECTIONS\nA.S - N.I1;\n"))
+    path = str(tmp_path / "top.txt")
+    build(cache, path)
+    assert len(os.listdir(str(tmp_path / "cache"))) == 2
+
+    # Editing the imported file changes the network built from the cache
+    (tmp_path / "switch.txt").write_text(definition.format("CLOCK, 1 = S;"))
+    monitors = build(cache, path)
+    devices = monitors.devices
+    [A_S] = devices.names.lookup(["A.S"])
+    assert devices.get_device(A_S).device_kind == devices.CLOCK
+    assert len(os.listdir(str(tmp_path / "cache"))) == 3
+
+
+def test_cache_import_no_longer_links(tmp_path, capsys):
+    """Test if errors from an edited imported file are reported."""
+    cache = NetlistCache(str(tmp_path / "cache"))
+    definition = "DEVICES\n{}\nEND\nCONNECTIONS\nEND\nMONITOR\nEND\nMAIN_END\n"
+    (tmp_path / "switch.txt").write_text(definition.format("SWITCH, 0 = S;"))
+    (tmp_path / "top.txt").write_text(
+        'IMPORT "switch.txt" = A;\n' +
+        definition.format("NOT = N;").replace("CONNECTIONS\n",
+                                              "CONNECTIONS\nA.S - N.I1;\n"))
+    path = str(tmp_path / "top.txt")
+    build(cache, path)
+
+    # The imported file is still valid on its own
+    (tmp_path / "switch.txt").write_text(definition.format("SWITCH, 0 = T;"))
+    for _ in range(2):
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        capsys.readouterr()
+        assert not cache.build_network(path, names, devices, network,
+                                       monitors)
+        out = capsys.readouterr()[0]
+        assert "cache" not in out
+        assert "A.S" in out
+        assert [names.get_name_string(device.device_id)
+                for device in devices.devices_list] == ["A.T", "N"]
+
+
+def test_cache_import_leaves_inputs_unconnected(tmp_path, capsys):
+    """Test if an imported gate with unconnected inputs is reported."""
+    cache = NetlistCache(str(tmp_path / "cache"))
+    definition = "DEVICES\n{}\nEND\nCONNECTIONS\nEND\nMONITOR\nEND\nMAIN_END\n"
+    (tmp_path / "switch.txt").write_text(definition.format("SWITCH, 0 = S;"))
+    (tmp_path / "top.txt").write_text(
+        'IMPORT "switch.txt" = A;\n' +
+        definition.format("NOT = N;").replace("CONNECTIONS\n",
+                                              "CONNECTIONS\nA.S - N.I1;\n"))
+    path = str(tmp_path / "top.txt")
+    build(cache, path)
+
+    # The imported file is valid on its own, as its inputs may be connected
+    # by the importing file
+    (tmp_path / "switch.txt").write_text(
+        definition.format("SWITCH, 0 = S;\nAND, 2 = H;"))
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    capsys.readouterr()
+    assert not cache.build_network(path, names, devices, network, monitors)
+    assert "Not all inputs are connected" in capsys.readouterr()[0]
+
+
+def test_cache_directory_and_opt_out(tmp_path, monkeypatch):
+    """Test if the cache directory can be moved and the cache turned off."""
+    monkeypatch.setenv("LOGSIM_CACHE_DIR", str(tmp_path / "moved"))
+    cache = NetlistCache()
+    assert cache.cache_directory == str(tmp_path / "moved")
+    build(cache, "demo_files/counter.txt")
+    assert len(os.listdir(str(tmp_path / "moved"))) == 1
+
+    cache = NetlistCache(str(tmp_path / "off"), enabled=False)
+    build(cache, "demo_files/counter.txt")
+    assert not os.path.exists(str(tmp_path / "off"))
+    with open("demo_files/counter.txt") as definition_file:
+        assert cache.load(definition_file.read(), Names()) is None
@@ -0,0 +1,85 @@
+"""Test the netlist module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+DEFINITION = """DEVICES
+SWITCH, 1 = A;
+SWITCH, 0 = B;
+AND, 2 = G;
+END
+CONNECTIONS
+A - G.I1;
+B - G.I2;
+END
+MONITOR
+G;
+END
+MAIN_END
+"""
+
+
+def new_network(names=None):
+    """Return names and new devices, network and monitors instances."""
+    if names is None:
+        names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    return names, devices, network, monitors
+
+
+@pytest.fixture
+def parsed_netlist():
+    """Return the netlist and names of a parsed definition."""
+    names, devices, network, monitors = new_network()
+    parser = Parser(names, devices, network, monitors,
+                    Scanner.from_string(DEFINITION, names))
+    assert parser.parse_network()
+    return parser.netlist, names
+
+
+def test_netlist_tables(parsed_netlist):
+    """Test if every statement is recorded in the tables."""
+    netlist, names = parsed_netlist
+    [G_ID, I2_ID] = names.lookup(["G", "I2"])
+
+    assert [row[0].id for row in netlist.devices] == \
+        names.lookup(["A", "B", "G"])
+    assert netlist.devices[2][2].id == 2
+    assert netlist.devices[0][0].line == 1
+    assert [(row[2].id, row[3].id) for row in netlist.connections] == \
+        [(G_ID, names.query("I1")), (G_ID, I2_ID)]
+    assert [(row[0].id, row[1].id) for row in netlist.monitors] == \
+        [(G_ID, None)]
+    assert netlist.connections_complete
+
+
+def test_netlist_rebuild(parsed_netlist):
+    """Test if a netlist is built into another network without parsing."""
+    netlist, names = parsed_netlist
+    _, devices, network, monitors = new_network(names)
+    assert netlist.build_devices(devices) is None
+    assert netlist.build_connections(network) is None
+    assert netlist.build_monitors(monitors) is None
+    assert network.check_network()
+
+    network.execute_network()
+    [G_ID] = names.lookup(["G"])
+    assert network.get_output_signal(G_ID, None) == devices.LOW
+
+
+def test_netlist_build_stops_at_first_error(parsed_netlist):
+    """Test if building stops at the first failed statement."""
+    netlist, names = parsed_netlist
+    netlist.add_device(*netlist.devices[0])  # A is made twice
+    _, devices, network, monitors = new_network(names)
+    row, error_type = netlist.build_devices(devices)
+    assert error_type == devices.DEVICE_PRESENT
+    assert row == netlist.devices[3]
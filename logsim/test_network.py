@@ -348,3 +348,129 @@ def test_oscillating_network(new_network):
     network.make_connection(NOR1, None, NOR1, I1)
 
     assert not network.execute_network()
+
+
+def test_execute_cone_of_observed_outputs(new_network):
+    """Test if only the devices the observed outputs depend on are executed."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1, CLK, D1, AND1, NOT1, NOR1, I1, I2] = names.lookup(
+        ["Sw1", "Clk", "D1", "And1", "Not1", "Nor1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(CLK, devices.CLOCK, 1)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(AND1, devices.AND, 2)
+    devices.make_device(NOT1, devices.NOT)
+    devices.make_device(NOR1, devices.NOR, 1)
+    network.make_connection(CLK, None, D1, devices.CLK_ID)
+    network.make_connection(SW1, None, D1, devices.DATA_ID)
+    network.make_connection(NOT1, None, D1, devices.SET_ID)
+    network.make_connection(NOT1, None, D1, devices.CLEAR_ID)
+    network.make_connection(SW1, None, NOT1, I1)
+    network.make_connection(D1, devices.Q_ID, AND1, I1)
+    network.make_connection(SW1, None, AND1, I2)
+    network.make_connection(NOR1, None, NOR1, I1)  # oscillates
+
+    network.set_observed_outputs([(AND1, None)])
+    assert network.get_cone() == {SW1, CLK, D1, AND1, NOT1}
+    for _ in range(3):
+        assert network.execute_network()  # the oscillating gate is left out
+    assert network.get_output_signal(AND1, None) == devices.HIGH
+    assert network.get_output_signal(NOR1, None) == devices.LOW
+
+    # The cone is found again when a connection changes
+    network.delete_connection(AND1, I1)
+    network.make_connection(SW1, None, AND1, I1)
+    assert network.get_cone() == {SW1, AND1}
+
+    network.set_observed_outputs(None)
+    assert network.get_cone() is None
+    assert not network.execute_network()
+
+
+def test_specialise_on_switch_states(new_network):
+    """Test if gates decided by the switches are fixed for each vector."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1, SW2, CLK, AND1, OR1, NOT1, XOR1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Clk", "And1", "Or1", "Not1", "Xor1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(SW2, devices.SWITCH, 1)
+    devices.make_device(CLK, devices.CLOCK, 1)
+    devices.make_device(AND1, devices.AND, 2)
+    devices.make_device(OR1, devices.OR, 2)
+    devices.make_device(NOT1, devices.NOT)
+    devices.make_device(XOR1, devices.XOR)
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(CLK, None, AND1, I2)
+    network.make_connection(SW2, None, NOT1, I1)
+    network.make_connection(NOT1, None, OR1, I1)
+    network.make_connection(CLK, None, OR1, I2)
+    network.make_connection(AND1, None, XOR1, I1)
+    network.make_connection(SW2, None, XOR1, I2)
+
+    # And1 is decided by Sw1 being low, and Xor1 by And1 and Sw2
+    device_lists, fixed_outputs = network.specialise()
+    assert device_lists[devices.OR] == [OR1]
+    assert devices.AND not in device_lists
+    assert devices.XOR not in device_lists
+    assert len(fixed_outputs) == 3
+    assert network.specialise() is network.specialise()  # cached
+
+    for _ in range(4):
+        assert network.execute_network()
+        assert network.get_output_signal(AND1, None) == devices.LOW
+        assert network.get_output_signal(XOR1, None) == devices.HIGH
+        assert (network.get_output_signal(OR1, None)
+                == network.get_output_signal(CLK, None))
+
+    # With Sw1 high, And1 and Xor1 follow the clock
+    devices.set_switch(SW1, devices.HIGH)
+    device_lists, fixed_outputs = network.specialise()
+    assert device_lists[devices.AND] == [AND1]
+    assert device_lists[devices.XOR] == [XOR1]
+    assert len(fixed_outputs) == 1
+    assert network.execute_network()
+    assert (network.get_output_signal(AND1, None)
+            == network.get_output_signal(CLK, None))
+
+    # The specialisations are discarded when a connection changes
+    network.delete_connection(AND1, I1)
+    assert devices.AND in network.specialise()[0]
+    assert not network.execute_network()
+
+
+def test_specialise_keeps_timed_gates(new_network):
+    """Test if a gate fixed by switches still clocks a D-type at start-up."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1, SW2, NOT1, NAND1, D1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Not1", "Nand1", "D1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(SW2, devices.SWITCH, 1)
+    devices.make_device(NOT1, devices.NOT)
+    devices.make_device(NAND1, devices.NAND, 2)
+    devices.make_device(D1, devices.D_TYPE)
+    network.make_connection(SW1, None, NOT1, I1)
+    network.make_connection(NOT1, None, NAND1, I1)
+    network.make_connection(SW2, None, NAND1, I2)
+    network.make_connection(NAND1, None, D1, devices.CLK_ID)
+    network.make_connection(SW1, None, D1, devices.DATA_ID)
+    network.make_connection(SW1, None, D1, devices.SET_ID)
+    network.make_connection(SW1, None, D1, devices.CLEAR_ID)
+
+    # Nand1 settles LOW, but it rises while the switches start up, which
+    # clocks the LOW data into D1
+    device_lists, fixed_outputs = network.specialise()
+    assert device_lists[devices.NOT] == [NOT1]
+    assert device_lists[devices.NAND] == [NAND1]
+    assert fixed_outputs == []
+    devices.get_device(D1).dtype_memory = devices.HIGH
+    assert network.execute_network()
+    assert network.get_output_signal(D1, devices.Q_ID) == devices.LOW
@@ -0,0 +1,129 @@
+"""Test the optimise module."""
+import itertools
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from optimise import Optimiser
+
+REDUNDANT_CIRCUIT = """
+DEVICES
+SWITCH, 0 = A;
+SWITCH, 0 = B;
+AND, 2 = G1;
+AND, 2 = G2;
+AND, 2 = G3;
+NOT = N1;
+NOT = N2;
+NOT = N3;
+OR, 2 = G4;
+NAND, 2 = G5;
+XOR = X1;
+END
+CONNECTIONS
+A - G1.I1; B - G1.I2;
+B - G2.I1; A - G2.I2;
+A - G3.I1; A - G3.I2;
+G1 - N1.I1; N1 - N2.I1;
+N2 - G4.I1; G2 - G4.I2;
+G3 - X1.I1; B - X1.I2;
+A - N3.I1; N3 - G5.I1; B - G5.I2;
+END
+MONITOR
+G4; X1;
+END
+MAIN_END
+"""
+
+CLOCKED_CIRCUIT = """
+DEVICES
+CLOCK, 1 = CL;
+SWITCH, 1 = S;
+NOT = N1;
+NOT = N2;
+NOT = N3;
+NOT = N4;
+DTYPE = D1;
+DTYPE = D2;
+END
+CONNECTIONS
+CL - N1.I1; N1 - N2.I1; N2 - D1.CLK; S - D1.DATA;
+CL - D2.CLK; S - N3.I1; N3 - N4.I1; N4 - D2.DATA;
+S - D1.SET; S - D1.CLEAR; S - D2.SET; S - D2.CLEAR;
+END
+MONITOR
+D1.Q; D2.Q;
+END
+MAIN_END
+"""
+
+
+def build(text):
+    """Return the names, devices, network and monitors defined in text."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner.from_string(text, names))
+    assert parser.parse_network()
+    return names, devices, network, monitors
+
+
+def simulate(names, devices, network, monitors, switch_names):
+    """Return the monitored signals after each combination of switches."""
+    switch_ids = names.lookup(switch_names)
+    for levels in itertools.product([devices.LOW, devices.HIGH],
+                                    repeat=len(switch_ids)):
+        for switch_id, level in zip(switch_ids, levels):
+            devices.set_switch(switch_id, level)
+        assert network.execute_network()
+        monitors.record_signals()
+    return dict(monitors.monitors_dictionary)
+
+
+def test_optimise_removes_redundant_gates():
+    """Test if merged, bypassed and unused gates are reported and removed."""
+    names, devices, network, monitors = build(REDUNDANT_CIRCUIT)
+    changes = Optimiser(names, devices, network, monitors).optimise()
+
+    assert changes == ["Merged G2 into G1 (same inputs)",
+                       "Bypassed G3 (passes on A)",
+                       "Bypassed N2 (double inversion of G1)",
+                       "Removed G2 (drives no monitor or D-type)",
+                       "Removed G3 (drives no monitor or D-type)",
+                       "Removed N1 (drives no monitor or D-type)",
+                       "Removed N2 (drives no monitor or D-type)",
+                       "Removed N3 (drives no monitor or D-type)",
+                       "Removed G5 (drives no monitor or D-type)"]
+    assert devices.find_devices() == names.lookup(["A", "B", "G1", "G4",
+                                                   "X1"])
+    [G1, G4, X1, A] = names.lookup(["G1", "G4", "X1", "A"])
+    assert network.get_connected_output(G4, names.query("I1")) == (G1, None)
+    assert network.get_connected_output(G4, names.query("I2")) == (G1, None)
+    assert network.get_connected_output(X1, names.query("I1")) == (A, None)
+
+
+def test_optimise_keeps_monitored_signals():
+    """Test if monitored signals settle as they did before optimising."""
+    original = build(REDUNDANT_CIRCUIT)
+    optimised = build(REDUNDANT_CIRCUIT)
+    Optimiser(*optimised).optimise()
+    assert (simulate(*original, ["A", "B"])
+            == simulate(*optimised, ["A", "B"]))
+
+
+def test_optimise_keeps_timed_gates():
+    """Test if only gates leading to D-type data inputs are bypassed."""
+    names, devices, network, monitors = build(CLOCKED_CIRCUIT)
+    changes = Optimiser(names, devices, network, monitors).optimise()
+
+    assert changes == ["Bypassed N4 (double inversion of S)",
+                       "Removed N3 (drives no monitor or D-type)",
+                       "Removed N4 (drives no monitor or D-type)"]
+    [D1, D2, N2, S] = names.lookup(["D1", "D2", "N2", "S"])
+    assert network.get_connected_output(D1, devices.CLK_ID) == (N2, None)
+    assert network.get_connected_output(D2, devices.DATA_ID) == (S, None)
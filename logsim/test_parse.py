@@ -58,3 +58,167 @@ def test_parser(capsys):
             parser.parse_network()
             out, err = capsys.readouterr()
             assert error_output[i] in out
+
+
+def test_parse_from_string():
+    """Test if a definition held in memory is parsed without a file"""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = ("DEVICES SWITCH, 1 = A; NOT = N; END "
+                  "CONNECTIONS A - N.I1; END "
+                  "MONITOR N; END MAIN_END")
+    scanner = Scanner.from_string(definition, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    [N_ID] = names.lookup(["N"])
+    assert (N_ID, None) in monitors.monitors_dictionary
+
+
+def test_parser_error_recovery_stack(capsys):
+    """Test if files with many errors parse without deep recursion"""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = ("DEVICES\n" + "5 = A;\n" * 5000 + "END\n"
+                  "CONNECTIONS\nA - B.I1;;;\nX - Y.I1;\nEND\n"
+                  "MONITOR\n" + "A.;\n" * 5000 + "END\nMAIN_END\n")
+    scanner = Scanner.from_string(definition, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert not parser.parse_network()
+    out, err = capsys.readouterr()
+    assert out.count("ERROR : Not a valid supported device type") == 5000
+    assert out.count("ERROR: Extra semicolons added") == 1
+    assert out.count("ERROR : Not a valid type of output label") == 5000
+    # Statements after the stray semicolons are parsed as connections
+    assert "ERROR : Not a valid device name" not in out
+
+
+def test_parse_buses():
+    """Test if bus declarations and connections are expanded"""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = ("DEVICES SWITCH[3], 1 = A; CLOCK, 1 = C; DTYPE[3] = R; "
+                  "NOT[3] = N; END "
+                  "CONNECTIONS A[0:2] - R[2:0].DATA; C - R[0:2].CLK; "
+                  "A[0] - R[0:2].SET; A[0] - R[0:2].CLEAR; "
+                  "R[0:2].Q - N[0:2].I1; END "
+                  "MONITOR N[0:2]; R[1].QBAR; END MAIN_END")
+    scanner = Scanner.from_string(definition, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    R_IDS = names.lookup(["R[0]", "R[1]", "R[2]"])
+    assert R_IDS == list(range(R_IDS[0], R_IDS[0] + 3))
+    assert network.get_connected_output(R_IDS[0], devices.DATA_ID) == \
+        (names.query("A[2]"), None)
+    assert monitors.get_signal_names()[0] == \
+        ["N[0]", "N[1]", "N[2]", "R[1].QBAR"]
+
+
+def test_parse_bus_errors():
+    """Test if errors in bus syntax are found"""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = ("DEVICES\nNOT[0] = N;\nNOT[2 = M;\nNOT[2] = G;\nEND\n"
+                  "CONNECTIONS\nG[0:1] - G[0:2].I1;\nG[0:1 - G[0].I1;\nEND\n"
+                  "MONITOR\nG[0:1];\nEND\nMAIN_END\n")
+    scanner = Scanner.from_string(definition, names)
+    parser = Parser(names, devices, network, monitors, scanner, test=True)
+    assert not parser.parse_network()
+    assert [(line, code) for (line, _, code, _) in parser.diagnostics] == \
+        [(2, "BAD_WIDTH"), (3, "NO_BRACKET"), (7, "WIDTH_MISMATCH"),
+         (8, "NO_BRACKET")]
+
+
+FULL_ADDER = """CIRCUIT HALF(X.I1, X.I2, G.I1, G.I2, X, G)
+DEVICES
+XOR = X;
+AND, 2 = G;
+END
+END
+
+CIRCUIT FULL(H1.X.I1, H1.X.I2, H1.G.I1, H1.G.I2, H2.X.I2, H2.G.I2, H2.X, C)
+DEVICES
+HALF = H1;
+HALF = H2;
+OR, 2 = C;
+END
+CONNECTIONS
+H1.X - H2.X.I1;
+H1.X - H2.G.I1;
+H1.G - C.I1;
+H2.G - C.I2;
+END
+END
+
+DEVICES
+SWITCH[3], 1 = A;
+FULL[2] = F;
+END
+CONNECTIONS
+A[0] - F[0:1].H1.X.I1;
+A[0] - F[0:1].H1.G.I1;
+A[1] - F[0:1].H1.X.I2;
+A[1] - F[0:1].H1.G.I2;
+A[2] - F[0:1].H2.X.I2;
+A[2] - F[0:1].H2.G.I2;
+END
+MONITOR
+F[0].H2.X;
+F[1].C;
+END
+MAIN_END
+"""
+
+
+def test_parse_circuits():
+    """Test if circuit templates are instantiated with hierarchical names"""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner.from_string(FULL_ADDER, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    assert len(devices.devices_list) == 3 + 2 * 5
+    assert monitors.get_signal_names()[0] == ["F[0].H2.X", "F[1].C"]
+    network.execute_network()
+    assert network.get_output_signal(
+        *devices.get_signal_ids("F[0].H2.X")) == devices.HIGH
+    assert network.get_output_signal(
+        *devices.get_signal_ids("F[1].C")) == devices.HIGH
+
+
+def test_parse_circuit_errors():
+    """Test if errors in circuit templates and instances are found"""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = FULL_ADDER.replace(
+        "OR, 2 = C;", "OR, 2 = C;\nNOT = N;").replace(
+        "FULL[2] = F;", "FULL[2] = F;\nHALF, 1 = B;").replace(
+        "A[2] - F[0:1].H2.G.I2;", "A[2] - F[0].H2.G.I2;\nA[2] - F[1].N.I1;")
+    scanner = Scanner.from_string(definition, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert not parser.parse_network()
+    assert [(line, code) for (line, _, code, _) in parser.diagnostics] == \
+        [(26, "CIRCUIT_QUALIFIER"), (35, "NOT_A_PORT")]
+
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = FULL_ADDER.replace("H2.X, C)", "H2.X, C, N)").replace(
+        "AND, 2 = G;", "AND = G;")
+    scanner = Scanner.from_string(definition, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert not parser.parse_network()
+    assert [(line, code) for (line, _, code, _) in parser.diagnostics] == \
+        [(4, "NO_QUALIFIER")]
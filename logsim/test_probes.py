@@ -0,0 +1,116 @@
+"""Test the probes module."""
+import random
+
+import pytest
+
+from names import Names
+from network import Network
+from devices import Devices
+from monitors import Monitors
+from probes import ProbeStore
+
+
+@pytest.fixture
+def signal_lists():
+    """Return random signal lists for three nets."""
+    random.seed(3)
+    return [[random.choice([0, 1, 2, 3]) for _ in range(1000)]
+            for _ in range(3)]
+
+
+def fill_store(store, signal_lists):
+    """Record the signal lists in the store, one cycle at a time."""
+    for cycle in range(len(signal_lists[0])):
+        store.record([signal_list[cycle] for signal_list in signal_lists])
+
+
+def test_get_trace_in_memory(signal_lists):
+    """Test if traces are read back correctly from memory."""
+    store = ProbeStore([(1, None), (2, None), (2, 5)], chunk_size=64)
+    fill_store(store, signal_lists)
+
+    assert store.spill_file is None
+    assert store.get_trace(1, None) == signal_lists[0]
+    assert store.get_trace(2, 5) == signal_lists[2]
+    assert store.get_trace(2, None, 100, 300) == signal_lists[1][100:300]
+    assert store.get_trace(7, None) is None
+
+
+def test_get_trace_spilled(signal_lists):
+    """Test if traces are read back correctly once spilled to a file."""
+    store = ProbeStore([(1, None), (2, None), (2, 5)], chunk_size=50,
+                       memory_budget=200)
+    fill_store(store, signal_lists)
+
+    assert store.spill_file is not None
+    assert store.memory_used <= 200
+    assert store.get_trace(1, None) == signal_lists[0]
+    assert store.get_trace(2, None) == signal_lists[1]
+    assert store.get_trace(2, 5, 990, 2000) == signal_lists[2][990:]
+
+    store.reset()
+    assert store.spill_file is None
+    assert store.get_trace(1, None) == []
+
+
+def test_probe_all_mode():
+    """Test if probe-all mode records every output in the network."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [SW1_ID, D_ID, I1] = names.lookup(["Sw1", "D1", "I1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(D_ID, devices.D_TYPE)
+    monitors.enable_probe_all(memory_budget=0, chunk_size=2)
+
+    for _ in range(5):
+        network.execute_network()
+        monitors.record_signals()
+
+    LOW = devices.LOW
+    assert monitors.get_probe_trace(SW1_ID, None) == [LOW] * 5
+    assert len(monitors.get_probe_trace(D_ID, devices.QBAR_ID)) == 5
+    assert monitors.get_probe_trace(SW1_ID, I1) is None
+
+    monitors.reset_monitors()
+    assert monitors.get_probe_trace(SW1_ID, None) == []
+
+    monitors.disable_probe_all()
+    assert monitors.get_probe_trace(SW1_ID, None) is None
+
+
+def test_probe_all_removed_device():
+    """Test if an output removed while probing is recorded as BLANK."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [SW1_ID, SW2_ID] = names.lookup(["Sw1", "Sw2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(SW2_ID, devices.SWITCH, 1)
+    monitors.enable_probe_all()
+
+    network.execute_network()
+    monitors.record_signals()
+    devices.remove_device(SW2_ID)
+    network.execute_network()
+    monitors.record_signals()
+
+    assert monitors.get_probe_trace(SW1_ID, None) == [devices.LOW] * 2
+    assert monitors.get_probe_trace(SW2_ID, None) == [devices.HIGH,
+                                                      devices.BLANK]
+
+
+def test_spill_releases_map(signal_lists):
+    """Test if the old memory map is closed when the spill file grows."""
+    store = ProbeStore([(1, None)], chunk_size=10, memory_budget=0)
+    fill_store(store, [signal_lists[0][:20]])
+    assert store.get_trace(1, None) == signal_lists[0][:20]
+    old_map = store.spill_map
+    fill_store(store, [signal_lists[0][20:30]])
+
+    assert old_map.closed
+    assert store.get_trace(1, None) == signal_lists[0][:30]
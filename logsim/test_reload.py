@@ -0,0 +1,142 @@
+"""Test the reload module."""
+import os
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from reload import Reloader
+from netcache import NetlistCache
+
+
+DEFINITION = """DEVICES
+SWITCH, 1 = A;
+SWITCH, 0 = B;
+AND, 2 = G;
+DTYPE = D;
+CLOCK, 1 = C;
+END
+CONNECTIONS
+A - G.I1;
+B - G.I2;
+C - D.CLK;
+G - D.DATA;
+B - D.SET;
+B - D.CLEAR;
+END
+MONITOR
+G;
+D.Q;
+END
+MAIN_END
+"""
+
+
+@pytest.fixture
+def reloader(tmp_path):
+    """Return a Reloader for a network built from DEFINITION."""
+    path = tmp_path / "circuit.txt"
+    path.write_text(DEFINITION)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    cache = NetlistCache(str(tmp_path / "cache"))
+    assert cache.build_network(str(path), names, devices, network, monitors)
+    for _ in range(4):
+        network.execute_network()
+        monitors.record_signals()
+    return Reloader(str(path), names, devices, network, monitors)
+
+
+def test_reload_connection(reloader):
+    """Test if a changed connection is applied and other state is kept."""
+    devices = reloader.devices
+    network = reloader.network
+    [D_ID, G_ID] = reloader.names.lookup(["D", "G"])
+    d_type = devices.get_device(D_ID)
+    memory = d_type.dtype_memory
+    g_trace = list(reloader.monitors.monitors_dictionary[(G_ID, None)])
+
+    assert reloader.reload(DEFINITION.replace("B - G.I2", "A - G.I2"), 4)
+    assert network.get_connected_output(G_ID, devices.get_signal_ids(
+        "G.I2")[1]) == (reloader.names.query("A"), None)
+    assert devices.get_device(D_ID) is d_type
+    assert d_type.dtype_memory == memory
+    assert list(reloader.monitors.monitors_dictionary[(G_ID, None)]) == \
+        g_trace
+
+
+def test_reload_devices_and_monitors(reloader):
+    """Test if devices and monitors are added, removed and replaced."""
+    devices = reloader.devices
+    monitors = reloader.monitors
+    text = DEFINITION.replace("AND, 2 = G;", "OR, 2 = G;\nNOT = N;")
+    text = text.replace("B - D.CLEAR;", "B - D.CLEAR;\nA - N.I1;")
+    text = text.replace("D.Q;", "N;")
+
+    assert reloader.reload(text, cycles_completed=4)
+    [G_ID, N_ID, D_ID] = reloader.names.lookup(["G", "N", "D"])
+    assert devices.get_device(G_ID).device_kind == devices.OR
+    assert devices.get_device(N_ID) is not None
+    assert reloader.network.check_network()
+    assert sorted(monitors.get_signal_names()[0]) == ["G", "N"]
+    # The replaced gate's monitor starts again, aligned with the others
+    assert list(monitors.monitors_dictionary[(N_ID, None)]) == \
+        [devices.BLANK] * 4
+
+    text = text.replace("NOT = N;", "").replace("A - N.I1;", "")
+    assert reloader.reload(text.replace("N;", ""))
+    assert devices.get_device(N_ID) is None
+    assert "N" not in devices.signal_ids
+    assert reloader.network.execute_network()
+
+
+def test_reload_errors_and_polling(reloader, capsys):
+    """Test if files with errors are not applied and polling finds edits."""
+    assert not reloader.reload(DEFINITION.replace("A - G.I1;", ""))
+    out, _ = capsys.readouterr()
+    assert "network not reloaded" in out
+    assert not reloader.poll()
+
+    with open(reloader.path, "w") as definition_file:
+        definition_file.write(DEFINITION.replace("SWITCH, 1 = A",
+                                                 "SWITCH, 0 = A"))
+    reloader.file_state = None  # the edit may not change the timestamp
+    assert reloader.poll()
+    [A_ID] = reloader.names.lookup(["A"])
+    assert reloader.devices.get_switch_value(A_ID) == 0
+
+
+def test_reload_imported_file(tmp_path):
+    """Test if editing an imported file reloads the importing file."""
+    definition = "DEVICES\n{}\nEND\nCONNECTIONS\n{}\nEND\nMONITOR\n{}\n" \
+        "END\nMAIN_END\n"
+    switch_path = tmp_path / "switch.txt"
+    switch_path.write_text(definition.format("SWITCH, 0 = S;", "", ""))
+    path = tmp_path / "top.txt"
+    path.write_text('IMPORT "switch.txt" = A;\n' +
+                    definition.format("NOT = N;", "A.S - N.I1;", "N;"))
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    cache = NetlistCache(str(tmp_path / "cache"))
+    assert cache.build_network(str(path), names, devices, network, monitors)
+    assert cache.imported_paths == {str(switch_path)}
+
+    # The description is taken from the netlist the network was built from
+    reloader = Reloader(str(path), names, devices, network, monitors,
+                        cache.flat_netlist, cache.imported_paths)
+    assert reloader.description["devices"] == {"A.S": ("SWITCH", 0),
+                                               "N": ("NOT", None)}
+    assert reloader.description["connections"] == {"N.I1": "A.S"}
+    assert not reloader.poll()
+
+    switch_path.write_text(definition.format("SWITCH, 1 = S;", "", ""))
+    os.utime(str(switch_path), ns=(0, 0))  # the edit may keep the timestamp
+    assert reloader.poll()
+    [A_S] = names.lookup(["A.S"])
+    assert devices.get_switch_value(A_S) == 1
@@ -0,0 +1,89 @@
+"""Test the sat module."""
+import itertools
+import random
+
+import pytest
+
+from sat import SatSolver
+
+
+def satisfies(assignment, clauses):
+    """Return True if the assignment makes every clause true."""
+    return all(any(assignment[abs(literal)] == (literal > 0)
+                   for literal in clause) for clause in clauses)
+
+
+def brute_force(clauses, variable_number):
+    """Return True if any assignment satisfies the clauses."""
+    for values in itertools.product([False, True], repeat=variable_number):
+        if satisfies(dict(enumerate(values, 1)), clauses):
+            return True
+    return False
+
+
+def test_solve_small_problems():
+    """Test if solutions agree with an exhaustive search."""
+    random.seed(5)
+    for _ in range(500):
+        variable_number = random.randint(1, 8)
+        clauses = [[random.choice([-1, 1]) *
+                    random.randint(1, variable_number)
+                    for _ in range(random.randint(1, 3))]
+                   for _ in range(random.randint(1, 40))]
+        assignment = SatSolver(clauses, variable_number).solve()
+        assert (assignment is not None) == brute_force(clauses,
+                                                       variable_number)
+        if assignment is not None:
+            assert satisfies(assignment, clauses)
+
+
+def test_solve_with_learning():
+    """Test if problems needing many conflicts are solved."""
+    # Seven pigeons do not fit in six holes
+    pigeons, holes = 7, 6
+
+    def variable(pigeon, hole):
+        return pigeon * holes + hole + 1
+
+    clauses = [[variable(pigeon, hole) for hole in range(holes)]
+               for pigeon in range(pigeons)]
+    for hole in range(holes):
+        for first, second in itertools.combinations(range(pigeons), 2):
+            clauses.append([-variable(first, hole), -variable(second, hole)])
+    solver = SatSolver(clauses)
+    assert solver.solve() is None
+    assert solver.conflicts > 0
+    assert solver.learnt_clauses
+
+    # Six do
+    clauses = [clause for clause in clauses
+               if all(abs(literal) <= pigeons * holes - holes
+                      for literal in clause)]
+    assignment = SatSolver(clauses, pigeons * holes).solve()
+    assert satisfies(assignment, clauses)
+
+
+def test_trivial_problems():
+    """Test if empty clauses, units and tautologies are handled."""
+    assert SatSolver([]).solve() == {}
+    assert SatSolver([[]]).solve() is None
+    assert SatSolver([[1], [-1]]).solve() is None
+    assert SatSolver([[1, -1]], 2).solve() is not None
+    assert SatSolver([[-2], [1, 2]]).solve() == {1: True, 2: False}
+    with pytest.raises(ValueError):
+        SatSolver([[3]], 2)
+
+
+def test_from_dimacs():
+    """Test if problems are read in DIMACS CNF format."""
+    text = ("c a comment\n"
+            "p cnf 3 3\n"
+            "1 -2 0\n"
+            "2 3\n"
+            "0 -1 0\n")
+    solver = SatSolver.from_dimacs(text)
+    assert solver.variable_number == 3
+    assert solver.solve() == {1: False, 2: False, 3: True}
+
+    with pytest.raises(ValueError):
+        SatSolver.from_dimacs("p dnf 1 1\n1 0\n")
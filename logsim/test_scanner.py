@@ -1,3 +1,7 @@
+import io
+
+import pytest
+
 from scanner import Scanner
 from scanner import Symbol
 from names import Names
@@ -16,3 +20,76 @@ def test_scanner():
         assert a.type == types[counter]
         assert a.id == ids[counter]
         counter += 1
+
+
+def test_print_location(capsys):
+    '''Check the line of a symbol is printed with a caret under it.'''
+    names = Names()
+    scanner = Scanner(r"scanner_test_file.txt", names)
+    a = Symbol()
+    while a.type != 4:
+        a = scanner.get_symbol()
+    scanner.print_location(a)
+    out, _ = capsys.readouterr()
+    lines = out.split("\n")
+    assert lines[0] == "Error on line 2"
+    assert lines[1] == "five ## barter-five#sdkfhsd#   #skjfh#DEVICES#akfa###."
+    assert lines[2] == " " * 38 + "^"
+    assert scanner.line_starts == [0, 34]
+
+
+def test_tokens():
+    '''Check the token stream matches the symbols and supports lookahead.'''
+    names = Names()
+    scanner = Scanner(r"scanner_test_file.txt", names)
+    symbols = []
+    a = Symbol()
+    while a.type != 9:
+        a = scanner.get_symbol()
+        symbols.append((a.type, a.id, a.line, a.position_in_line))
+
+    scanner = Scanner(r"scanner_test_file.txt", Names())
+    assert scanner.peek_token(2) == symbols[2]
+    assert scanner.peek_token() == symbols[0]
+    assert list(scanner.tokens()) == symbols
+    assert scanner.get_token().type == 9
+
+    scanner = Scanner(r"scanner_test_file.txt", Names())
+    scanner.peek_token(3)
+    batches = list(scanner.tokens(batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 4, 3]
+    assert sum(batches, []) == symbols
+
+
+def test_in_memory_sources():
+    '''Check definitions can be scanned from strings, bytes and streams.'''
+    with open("scanner_test_file.txt") as f:
+        text = f.read()
+    expected = list(Scanner("scanner_test_file.txt", Names()).tokens())
+    scanners = [
+        Scanner.from_string(text, Names()),
+        Scanner(text.encode(), Names()),
+        Scanner(io.StringIO(text.replace("\n", "\r\n")), Names()),
+    ]
+    for scanner in scanners:
+        assert list(scanner.tokens()) == expected
+
+
+def test_missing_file():
+    '''Check a missing definition file raises an exception.'''
+    with pytest.raises(FileNotFoundError):
+        Scanner("no_such_file.txt", Names())
+
+
+def test_strings():
+    '''Check strings in double quotes are returned with their text.'''
+    names = Names()
+    scanner = Scanner.from_string('IMPORT "adder.txt" = A; "no end\n',
+                                  names)
+    tokens = list(scanner.tokens())
+    assert [token.type for token in tokens] == \
+        [scanner.KEYWORD, scanner.STRING, scanner.EQUALS, scanner.NAME,
+         scanner.SEMICOLON, None, scanner.NAME, scanner.NAME, scanner.EOF]
+    assert tokens[0].id == names.query("IMPORT")
+    assert tokens[1].id == "adder.txt"
+    assert scanner.path is None
@@ -0,0 +1,98 @@
+"""Test the traces module."""
+import random
+
+import pytest
+
+from names import Names
+from network import Network
+from devices import Devices
+from monitors import Monitors
+from traces import TransitionTrace
+
+
+@pytest.fixture
+def clock_trace():
+    """Return a TransitionTrace holding a square wave with half period 3."""
+    signal_list = [0] + [1, 1, 1, 0, 0, 0] * 10
+    return TransitionTrace(signal_list), signal_list
+
+
+def test_trace_matches_list():
+    """Test if a trace reproduces the signal levels it was given."""
+    random.seed(1)
+    signal_list = [random.choice([0, 0, 0, 1]) for _ in range(500)]
+    trace = TransitionTrace(signal_list)
+
+    assert len(trace) == 500
+    assert trace.to_list() == signal_list
+    assert trace == signal_list
+    assert list(trace) == signal_list
+    for cycle in range(500):
+        assert trace.value_at(cycle) == signal_list[cycle]
+
+
+def test_trace_stores_transitions_only():
+    """Test if only the cycles at which the signal changes are stored."""
+    trace = TransitionTrace([4, 4, 0, 0, 0, 1, 1, 1, 1, 1])
+    assert trace.get_transitions() == [(0, 4), (2, 0), (5, 1)]
+    assert trace.cycles == [0, 2, 5]
+
+
+def test_trace_range_queries(clock_trace):
+    """Test if range queries and slices return the correct levels."""
+    trace, signal_list = clock_trace
+    assert trace.get_range(5, 23) == signal_list[5:23]
+    assert trace.get_range(0, 1000) == signal_list
+    assert trace.get_range(30, 10) == []
+    assert trace[7:40] == signal_list[7:40]
+    assert trace[::4] == signal_list[::4]
+    assert trace[-1] == signal_list[-1]
+    with pytest.raises(IndexError):
+        trace.value_at(len(signal_list))
+
+
+def test_trace_periodic_section(clock_trace):
+    """Test if a square wave is held as a periodic section."""
+    trace, signal_list = clock_trace
+    assert trace.period_start is not None
+    assert trace.half_period == 3
+    assert len(trace.cycles) <= 2
+
+    # Breaking the pattern writes the periodic section out again
+    trace.extend([0, 0, 0, 0, 1])
+    signal_list = signal_list + [0, 0, 0, 0, 1]
+    assert trace.period_start is None
+    assert trace == signal_list
+    assert trace.get_transitions()[-1] == (len(signal_list) - 1, 1)
+
+
+def test_compact_monitors():
+    """Test if compact monitors record the same signals as ordinary ones."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network, compact=True)
+
+    [SW1_ID, CL_ID] = names.lookup(["Sw1", "Clock1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(CL_ID, devices.CLOCK, 2)
+    monitors.make_monitor(SW1_ID, None)
+
+    for _ in range(5):
+        network.execute_network()
+        monitors.record_signals()
+    monitors.make_monitor(CL_ID, None, cycles_completed=5)
+    devices.set_switch(SW1_ID, devices.HIGH)
+    for _ in range(20):
+        network.execute_network()
+        monitors.record_signals()
+
+    switch_trace = monitors.monitors_dictionary[(SW1_ID, None)]
+    clock_trace = monitors.monitors_dictionary[(CL_ID, None)]
+    assert isinstance(switch_trace, TransitionTrace)
+    assert switch_trace == [devices.LOW] * 5 + [devices.HIGH] * 20
+    assert clock_trace[:5] == [devices.BLANK] * 5
+    assert clock_trace.period_start is not None
+
+    monitors.reset_monitors()
+    assert monitors.monitors_dictionary[(SW1_ID, None)] == []
@@ -0,0 +1,208 @@
+"""Store signal traces as a list of transitions.
+
+Used in the Logic Simulator project as a compact alternative to storing every
+recorded signal level. Only the cycles at which a signal changes value are
+kept, so memory scales with signal activity instead of run length.
+
+Classes
+-------
+TransitionTrace - stores a signal trace as (cycle, value) transitions.
+"""
+import bisect
+
+
+class TransitionTrace:
+    """Store a signal trace as (cycle, value) transitions.
+
+    The trace behaves like the list of signal levels it replaces: it can be
+    appended to, indexed, sliced, iterated over and compared with a list. The
+    value at any cycle is found by bisecting the transition cycles.
+
+    Square waves, such as clock outputs, are detected as they are recorded.
+    Once two consecutive runs of equal length have been seen, further samples
+    which continue the pattern are not stored at all; the value at those
+    cycles is calculated from the period instead. If the pattern is broken,
+    the periodic section is written out as ordinary transitions.
+
+    Parameters
+    ----------
+    signal_list: optional list of signal levels to initialise the trace with.
+
+    Public methods
+    --------------
+    append(self, signal): Records the signal level for the next cycle.
+
+    extend(self, signal_list): Records a list of signal levels.
+
+    value_at(self, cycle): Returns the signal level at the given cycle.
+
+    get_range(self, start, stop): Returns the signal levels for cycles in the
+                                  range start to stop as a list.
+
+    get_transitions(self): Returns the list of (cycle, value) transitions.
+
+    to_list(self): Returns the full list of signal levels.
+
+    clear(self): Removes all recorded signal levels.
+    """
+
+    def __init__(self, signal_list=None):
+        """Initialise the transition lists and the periodic section."""
+        self.cycles = []  # cycles at which the signal changes value
+        self.values = []  # signal value from that cycle onwards
+        self.length = 0  # number of cycles recorded
+
+        # Periodic section: from period_start onwards, the signal alternates
+        # between period_values[0] and period_values[1] every half_period
+        # cycles. period_start is None if there is no periodic section.
+        self.period_start = None
+        self.half_period = None
+        self.period_values = None
+
+        if signal_list is not None:
+            self.extend(signal_list)
+
+    def _periodic_value(self, cycle):
+        """Return the value at a cycle inside the periodic section."""
+        half_periods = (cycle - self.period_start) // self.half_period
+        return self.period_values[half_periods % 2]
+
+    def _expand_periodic(self):
+        """Write the periodic section out as ordinary transitions."""
+        for cycle in range(self.period_start, self.length, self.half_period):
+            self.cycles.append(cycle)
+            self.values.append(self._periodic_value(cycle))
+        self.period_start = None
+
+    def _detect_periodic(self):
+        """Start a periodic section if the last two runs form a square wave.
+
+        The last two transitions are removed from the transition lists and
+        described by the periodic section instead.
+        """
+        if len(self.cycles) < 3:
+            return
+        half_period = self.cycles[-1] - self.cycles[-2]
+        if (self.cycles[-2] - self.cycles[-3] == half_period
+                and self.values[-1] == self.values[-3]):
+            self.period_start = self.cycles[-2]
+            self.half_period = half_period
+            self.period_values = (self.values[-2], self.values[-1])
+            del self.cycles[-2:]
+            del self.values[-2:]
+
+    def append(self, signal):
+        """Record the signal level for the next cycle."""
+        if self.period_start is not None:
+            if signal == self._periodic_value(self.length):
+                self.length += 1
+                return
+            self._expand_periodic()
+
+        if not self.values or self.values[-1] != signal:
+            self.cycles.append(self.length)
+            self.values.append(signal)
+            self.length += 1
+            self._detect_periodic()
+        else:
+            self.length += 1
+
+    def extend(self, signal_list):
+        """Record a list of signal levels."""
+        for signal in signal_list:
+            self.append(signal)
+
+    def value_at(self, cycle):
+        """Return the signal level at the given cycle.
+
+        Negative cycles count back from the end of the trace, as with lists.
+        Raise IndexError if the cycle has not been recorded.
+        """
+        if cycle < 0:
+            cycle += self.length
+        if cycle < 0 or cycle >= self.length:
+            raise IndexError('trace index out of range')
+        if self.period_start is not None and cycle >= self.period_start:
+            return self._periodic_value(cycle)
+        return self.values[bisect.bisect_right(self.cycles, cycle) - 1]
+
+    def get_range(self, start, stop):
+        """Return the signal levels for cycles start to stop - 1 as a list."""
+        start = max(start, 0)
+        stop = min(stop, self.length)
+        signal_list = []
+        if start >= stop:
+            return signal_list
+
+        # Walk the transitions from the one in force at start
+        i = bisect.bisect_right(self.cycles, start) - 1
+        cycle = start
+        explicit_stop = stop
+        if self.period_start is not None:
+            explicit_stop = min(stop, self.period_start)
+        while cycle < explicit_stop:
+            if i + 1 < len(self.cycles):
+                run_end = min(self.cycles[i + 1], explicit_stop)
+            else:
+                run_end = explicit_stop
+            signal_list.extend([self.values[i]] * (run_end - cycle))
+            cycle = run_end
+            i += 1
+
+        while cycle < stop:  # periodic section
+            run_end = cycle - (cycle - self.period_start) % self.half_period \
+                + self.half_period
+            run_end = min(run_end, stop)
+            signal_list.extend([self._periodic_value(cycle)] *
+                               (run_end - cycle))
+            cycle = run_end
+        return signal_list
+
+    def get_transitions(self):
+        """Return the list of (cycle, value) transitions in the trace."""
+        transitions = list(zip(self.cycles, self.values))
+        if self.period_start is not None:
+            for cycle in range(self.period_start, self.length,
+                               self.half_period):
+                transitions.append((cycle, self._periodic_value(cycle)))
+        return transitions
+
+    def to_list(self):
+        """Return the full list of signal levels."""
+        return self.get_range(0, self.length)
+
+    def clear(self):
+        """Remove all recorded signal levels."""
+        self.cycles = []
+        self.values = []
+        self.length = 0
+        self.period_start = None
+
+    def __len__(self):
+        """Return the number of cycles recorded."""
+        return self.length
+
+    def __getitem__(self, index):
+        """Return the signal level at a cycle, or a list for a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step == 1:
+                return self.get_range(start, stop)
+            return [self.value_at(i) for i in range(start, stop, step)]
+        return self.value_at(index)
+
+    def __iter__(self):
+        """Iterate over the signal levels in the trace."""
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        """Compare the signal levels with another trace or list."""
+        if isinstance(other, TransitionTrace):
+            other = other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self):
+        """Return the trace in the form TransitionTrace([...])."""
+        return "TransitionTrace(" + repr(self.to_list()) + ")"
@@ -7,6 +7,7 @@ Classes:
 --------
 UserInterface - reads and parses user commands.
 """
+from graph import Graph
 
 
 class UserInterface:
@@ -39,7 +40,7 @@ class UserInterface:
     skip_spaces(self): Skips whitespace characters until a non-whitespace
                        character is reached.
 
-    read_string(self): Returns the next alphanumeric string.
+    read_string(self): Returns the next name string.
 
     read_name(self): Returns the name ID of the current string.
 
@@ -57,6 +58,18 @@ class UserInterface:
 
     zap_command(self): Removes the specified monitor.
 
+    activity_command(self): Displays the switching activity statistics of
+                            every signal.
+
+    probe_command(self): Displays the trace recorded for the specified signal
+                         in probe-all mode.
+
+    find_command(self): Displays switch settings which drive the specified
+                        signal to the specified level.
+
+    dimacs_command(self): Writes the CNF of the specified signal to a file
+                          in DIMACS format.
+
     run_network(self, cycles): Runs the network for the specified number of
                                simulation cycles.
 
@@ -93,6 +106,14 @@ class UserInterface:
                 self.monitor_command()
             elif command == "z":
                 self.zap_command()
+            elif command == "p":
+                self.probe_command()
+            elif command == "a":
+                self.activity_command()
+            elif command == "f":
+                self.find_command()
+            elif command == "d":
+                self.dimacs_command()
             elif command == "r":
                 self.run_command()
             elif command == "c":
@@ -129,13 +150,18 @@ class UserInterface:
             self.get_character()
 
     def read_string(self):
-        """Return the next alphanumeric string."""
+        """Return the next name string.
+
+        Names of devices in circuit instances and buses, such as alu3.g7 or
+        R[0], may contain dots and square brackets.
+        """
         self.skip_spaces()
         name_string = ""
         if not self.character.isalpha():  # the string must start with a letter
             print("Error! Expected a name.")
             return None
-        while self.character.isalnum():
+        while self.character.isalnum() or (self.character and
+                                           self.character in "_.[]"):
             name_string = "".join([name_string, self.character])
             self.get_character()
         return name_string
@@ -159,16 +185,13 @@ class UserInterface:
 
         Return None if either is invalid.
         """
-        device_id = self.read_name()
-        if device_id is None:
+        signal_name = self.read_string()
+        if signal_name is None:
             return None
-        elif self.character == ".":
-            port_id = self.read_name()
-            if port_id is None:
-                return None
-        else:
-            port_id = None
-        return [device_id, port_id]
+        elif signal_name not in self.devices.signal_ids:
+            print("Error! Unknown name.")
+            return None
+        return self.devices.get_signal_ids(signal_name)
 
     def read_number(self, lower_bound, upper_bound):
         """Return the current number.
@@ -206,6 +229,10 @@ class UserInterface:
         print("s X N     - set switch X to N (0 or 1)")
         print("m X       - set a monitor on signal X")
         print("z X       - zap the monitor on signal X")
+        print("p X       - show the probed trace of signal X (needs -p)")
+        print("a         - show switching activity of every signal")
+        print("f X N     - find switch settings driving signal X to N")
+        print("d X F     - write the CNF of signal X to DIMACS file F")
         print("h         - help (this command)")
         print("q         - quit the program")
 
@@ -242,6 +269,91 @@ class UserInterface:
             else:
                 print("Error! Could not zap monitor.")
 
+    def activity_command(self):
+        """Display the switching activity statistics of every signal.
+
+        Statistics are only collected once this command has been used, so
+        the first use turns collection on.
+        """
+        if self.monitors.activity is None:
+            self.monitors.enable_activity()
+            print("Collecting switching activity. Run to gather statistics.")
+        else:
+            print("Switching activity over", self.monitors.activity.cycles,
+                  "cycles:")
+            self.monitors.display_activity()
+
+    def probe_command(self):
+        """Display the trace recorded for the specified signal.
+
+        Only available in probe-all mode, where every output is recorded.
+        """
+        signal = self.read_signal_name()
+        if signal is not None:
+            [device, port] = signal
+            signal_list = self.monitors.get_probe_trace(device, port)
+            if signal_list is None:
+                print("Error! Signal not probed. Start logsim.py with -p.")
+            else:
+                signal_name = self.devices.get_signal_name(device, port)
+                print(signal_name + ": " +
+                      self.monitors.get_trace_string(signal_list))
+
+    def find_command(self):
+        """Display switch settings which drive the signal to a level.
+
+        The settings are found by a SAT solver, so only signals which depend
+        on switches through gates alone can be driven.
+        """
+        signal = self.read_signal_name()
+        if signal is not None:
+            level = self.read_number(0, 1)
+            if level is not None:
+                signal_name = self.devices.get_signal_name(*signal)
+                graph = Graph(self.names, self.devices, self.network,
+                              self.monitors)
+                settings = graph.find_switch_settings(signal_name, level)
+                if settings is False:
+                    print("Error! Signal depends on a clock, flip-flop or "
+                          "loop.")
+                elif settings is None:
+                    print("No switch settings drive " + signal_name +
+                          " to " + str(level) + ".")
+                else:
+                    print("Switch settings: " +
+                          " ".join([name + "=" + str(setting) for
+                                    name, setting in settings.items()]))
+
+    def dimacs_command(self):
+        """Write the CNF of the signal being HIGH to a DIMACS file.
+
+        The file path is the rest of the line. The comment lines of the file
+        name the switch each variable stands for.
+        """
+        signal = self.read_signal_name()
+        if signal is not None:
+            path = (self.character + self.line[self.cursor:]).strip()
+            if not path:
+                print("Error! Expected a file path.")
+                return
+            signal_name = self.devices.get_signal_name(*signal)
+            graph = Graph(self.names, self.devices, self.network,
+                          self.monitors)
+            node = graph.build_expression(signal_name)
+            if node is None:
+                print("Error! Signal depends on a clock, flip-flop or loop.")
+                return
+            clauses, variable_names = graph.get_cnf(node)
+            try:
+                with open(path, "w") as dimacs_file:
+                    dimacs_file.write(graph.get_dimacs(clauses,
+                                                       variable_names))
+            except OSError:
+                print("Error! Could not write " + path + ".")
+                return
+            print("Wrote " + str(len(clauses)) + " clauses over " +
+                  str(len(variable_names)) + " variables to " + path + ".")
+
     def run_network(self, cycles):
         """Run the network for the specified number of simulation cycles.
 